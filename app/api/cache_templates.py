@@ -0,0 +1,120 @@
+"""
+Cache em memória de templates HTML com ETag e variantes comprimidas
+"""
+import gzip
+import hashlib
+import os
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Tuple
+
+from fastapi import Response
+
+try:
+    import brotli
+except ImportError:  # brotli é opcional; sem ele servimos apenas gzip/identity
+    brotli = None
+
+
+class TemplateEmCache:
+    """
+    Template estático mantido em memória
+
+    O arquivo é lido uma vez e as variantes gzip e brotli são pré-computadas.
+    As respostas trazem ETag e são revalidadas via If-None-Match (304). O
+    ETag é próprio de cada variante (hash do conteúdo + codificação), e o
+    304 só sai quando o cliente tem a mesma variante que seria enviada. Em
+    modo de recarga (debug), o arquivo é relido quando o mtime muda.
+    """
+
+    def __init__(self, caminho: Path, recarregar: bool = False):
+        self.caminho = caminho
+        self.recarregar = recarregar
+        self._mtime: Optional[float] = None
+        self._etag_base = ""
+        self._variantes: Dict[str, bytes] = {}
+
+    def carregar(self) -> None:
+        """Lê o arquivo e pré-computa ETag e variantes comprimidas"""
+        mtime = os.stat(self.caminho).st_mtime
+        conteudo = self.caminho.read_bytes()
+
+        variantes = {"identity": conteudo, "gzip": gzip.compress(conteudo, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            variantes["br"] = brotli.compress(conteudo, quality=11)
+
+        self._etag_base = hashlib.sha256(conteudo).hexdigest()[:32]
+        self._variantes = variantes
+        self._mtime = mtime
+
+    def _atualizar(self) -> None:
+        if self._mtime is None:
+            self.carregar()
+        elif self.recarregar and os.stat(self.caminho).st_mtime != self._mtime:
+            self.carregar()
+
+    def _etag(self, codificacao: str) -> str:
+        return f'"{self._etag_base}-{codificacao}"'
+
+    def _escolher_codificacao(self, accept_encoding: str) -> str:
+        """Escolhe a melhor variante disponível aceita pelo cliente (br > gzip > identity)"""
+        aceitas: Dict[str, float] = {}
+        for item in accept_encoding.split(","):
+            partes = item.strip().split(";")
+            nome = partes[0].strip().lower()
+            if not nome:
+                continue
+            qualidade = 1.0
+            for parametro in partes[1:]:
+                chave, _, valor = parametro.strip().partition("=")
+                if chave.strip() == "q":
+                    try:
+                        qualidade = float(valor)
+                    except ValueError:
+                        qualidade = 0.0
+            aceitas[nome] = qualidade
+
+        curinga = aceitas.get("*", 0.0)
+        for codificacao in ("br", "gzip"):
+            if codificacao in self._variantes and aceitas.get(codificacao, curinga) > 0:
+                return codificacao
+        return "identity"
+
+    def _etag_corresponde(self, if_none_match: str, codificacao: str) -> bool:
+        """If-None-Match contém o ETag da variante que seria enviada (outra codificação não vale)"""
+        if if_none_match.strip() == "*":
+            return True
+        atual = self._etag(codificacao)
+        for etag in if_none_match.split(","):
+            etag = etag.strip()
+            if etag.startswith("W/"):
+                etag = etag[2:]
+            if etag == atual:
+                return True
+        return False
+
+    def variante(self, accept_encoding: str = "") -> Tuple[str, bytes]:
+        """Retorna (codificação, conteúdo) da variante escolhida"""
+        self._atualizar()
+        codificacao = self._escolher_codificacao(accept_encoding)
+        return codificacao, self._variantes[codificacao]
+
+    def resposta(self, cabecalhos: Mapping[str, str], media_type: str = "text/html") -> Response:
+        """Monta a resposta HTTP (200 com a variante adequada ou 304)"""
+        codificacao, conteudo = self.variante(cabecalhos.get("accept-encoding", ""))
+        headers = {
+            "ETag": self._etag(codificacao),
+            "Vary": "Accept-Encoding",
+            "Cache-Control": "no-cache"
+        }
+
+        if_none_match = cabecalhos.get("if-none-match")
+        if if_none_match and self._etag_corresponde(if_none_match, codificacao):
+            return Response(status_code=304, headers=headers)
+
+        if codificacao != "identity":
+            headers["Content-Encoding"] = codificacao
+        return Response(content=conteudo, media_type=media_type, headers=headers)
+
+
+# Template do dashboard (carregado no startup; recarregado por mtime em modo debug)
+dashboard_template = TemplateEmCache(Path(__file__).resolve().parent.parent / "templates" / "index.html")
@@ -1,15 +1,25 @@
 """
 API Routes for Mock ERP Application
 """
+import asyncio
+import json
 import os
-import requests
-from datetime import datetime
-from fastapi import APIRouter, HTTPException
-from fastapi.responses import HTMLResponse
+import httpx
+from contextlib import aclosing
+from fastapi import APIRouter, HTTPException, Query, Request
+from fastapi.responses import HTMLResponse, JSONResponse, StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, List, Optional, Any
 from app.models.schemas import HealthResponse, AppInfoResponse, ExternalAPIResponse
-from app.application.solicitacoes import enviar_para_assistente_ia, verificar_status_assistente_ia, enviar_feedback_assistente_ia
+from app.api.cache_templates import dashboard_template
+from app.application.concorrencia import FilaCheia
+from app.application.disjuntor import disjuntor_assistente
+from app.application.eventos import eventos_solicitacoes
+from app.application.integracoes_externas import buscar_externo
+from app.application.lote_assistente import max_itens_lote, processar_lote_assistente, processar_lote_ordenado
+from app.application.solicitacoes import GerenciadorSolicitacoes, enviar_para_assistente_ia, verificar_status_assistente_ia, enviar_feedback_assistente_ia, gerar_resposta_simulada
+from app.application.tarefas_assistente import STATUS_FINAIS, executor_tarefas_assistente
+from app.application.transmissao_assistente import transmitir_para_assistente_ia
 
 # Create router
 router = APIRouter()
@@ -22,6 +32,7 @@ class AssistantRequest(BaseModel):
     module: Optional[Dict[str, Any]] = None   # Nova estrutura para módulos
     userQuestion: str
     requestId: Optional[str] = None
+    asyncMode: Optional[bool] = False  # True: responde 202 e processa em segundo plano
 
 
 class AssistantResponse(BaseModel):
@@ -51,6 +62,35 @@ class FeedbackResponse(BaseModel):
     error: Optional[str] = None
 
 
+class AssistantBatchRequest(BaseModel):
+    items: List[AssistantRequest]
+    stream: Optional[bool] = False  # True: NDJSON, uma linha por item assim que terminar
+
+
+class AssistantBatchResponse(BaseModel):
+    success: bool
+    total: int
+    succeeded: int
+    failed: int
+    results: List[AssistantResponse]
+
+
+def _resposta_assistente(response: Dict[str, Any]) -> AssistantResponse:
+    """Converte o retorno de enviar_para_assistente_ia no modelo da API"""
+    return AssistantResponse(
+        success=response.get("success", False),
+        request_id=response.get("request_id", ""),
+        local_id=response.get("local_id"),
+        response=response.get("response"),
+        tokens_used=response.get("tokens_used"),
+        response_time=response.get("response_time"),
+        error=response.get("error"),
+        fallback_response=response.get("fallback_response"),
+        categoria=response.get("categoria"),
+        subcategoria=response.get("subcategoria")
+    )
+
+
 @router.post("/api/assistant", response_model=AssistantResponse)
 async def process_assistant_request(request: AssistantRequest):
     """
@@ -73,6 +113,36 @@ async def process_assistant_request(request: AssistantRequest):
                 fallback_response="Por favor, preencha os dados do formulário antes de usar o assistente."
             )
         
+        # Modo assíncrono: enfileirar e responder 202 com o ID local
+        if request.asyncMode:
+            try:
+                tarefa = executor_tarefas_assistente.enfileirar(
+                    user_data=request.user,
+                    product_data=data_structure,
+                    user_question=request.userQuestion,
+                    request_id=request.requestId
+                )
+            except FilaCheia:
+                return JSONResponse(
+                    status_code=503,
+                    headers={"Retry-After": "5"},
+                    content={
+                        "success": False,
+                        "request_id": request.requestId or "",
+                        "error": "Fila de processamento cheia. Tente novamente em instantes.",
+                        "fallback_response": gerar_resposta_simulada(request.userQuestion, {"modulo": data_structure})
+                    }
+                )
+            return JSONResponse(
+                status_code=202,
+                content={
+                    "success": True,
+                    **tarefa,
+                    "status_url": f"/api/assistant/status/{tarefa['local_id']}",
+                    "events_url": f"/api/assistant/status/{tarefa['local_id']}/eventos"
+                }
+            )
+        
         # Enviar para o assistente IA
         response = await enviar_para_assistente_ia(
             user_data=request.user,
@@ -82,18 +152,7 @@ async def process_assistant_request(request: AssistantRequest):
         )
         
         # Construir resposta
-        return AssistantResponse(
-            success=response.get("success", False),
-            request_id=response.get("request_id", ""),
-            local_id=response.get("local_id"),
-            response=response.get("response"),
-            tokens_used=response.get("tokens_used"),
-            response_time=response.get("response_time"),
-            error=response.get("error"),
-            fallback_response=response.get("fallback_response"),
-            categoria=response.get("categoria"),
-            subcategoria=response.get("subcategoria")
-        )
+        return _resposta_assistente(response)
         
     except Exception as e:
         print(f"Error processing assistant request: {e}")
@@ -105,18 +164,230 @@ async def process_assistant_request(request: AssistantRequest):
         )
 
 
+@router.post("/api/assistant/stream")
+async def stream_assistant_request(request: AssistantRequest):
+    """
+    Processa uma solicitação do assistente virtual transmitindo a resposta
+    
+    Server-Sent Events: "inicio" (request_id e local_id), um "token" por
+    trecho recebido do assistente e, ao final, "fim" ou "erro" com o mesmo
+    corpo retornado por /api/assistant.
+    """
+    data_structure = request.module if request.module else request.product
+    if not data_structure:
+        return JSONResponse(
+            status_code=400,
+            content={
+                "success": False,
+                "request_id": "",
+                "error": "Dados insuficientes: module ou product são obrigatórios",
+                "fallback_response": "Por favor, preencha os dados do formulário antes de usar o assistente."
+            }
+        )
+    
+    async def eventos():
+        # aclosing: se o navegador desconectar, o stream do assistente é fechado na hora
+        async with aclosing(transmitir_para_assistente_ia(
+            user_data=request.user,
+            product_data=data_structure,
+            user_question=request.userQuestion,
+            request_id=request.requestId
+        )) as stream:
+            async for evento, dados in stream:
+                yield _evento_sse(evento, dados)
+    
+    return StreamingResponse(
+        eventos(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.post("/api/assistant/batch", response_model=AssistantBatchResponse)
+async def process_assistant_batch(batch: AssistantBatchRequest):
+    """
+    Processa uma lista de solicitações do assistente virtual
+    
+    Cada item tem seu próprio registro local e status. O enriquecimento é
+    feito para o lote inteiro de uma vez e no máximo
+    ASSISTENTE_IA_LOTE_PARALELISMO itens seguem juntos para o assistente.
+    Retorna os resultados na ordem dos itens ou, com "stream": true, em
+    NDJSON (application/x-ndjson), uma linha {"index": ..., ...} por item
+    assim que ele termina.
+    """
+    if len(batch.items) > max_itens_lote():
+        return JSONResponse(
+            status_code=413,
+            content={
+                "success": False,
+                "error": f"Lote com {len(batch.items)} itens; o máximo é {max_itens_lote()}"
+            }
+        )
+    
+    itens = [
+        {
+            "user_data": item.user,
+            "product_data": item.module if item.module else item.product,
+            "user_question": item.userQuestion,
+            "request_id": item.requestId
+        }
+        for item in batch.items
+    ]
+    print(f"📦 Lote do assistente recebido: {len(itens)} itens")
+    
+    if batch.stream:
+        async def linhas():
+            async with aclosing(processar_lote_assistente(itens)) as resultados:
+                async for indice, resultado in resultados:
+                    linha = {"index": indice, **_resposta_assistente(resultado).model_dump()}
+                    yield json.dumps(linha, default=str) + "\n"
+        
+        return StreamingResponse(
+            linhas(),
+            media_type="application/x-ndjson",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+        )
+    
+    resultados = [_resposta_assistente(resultado) for resultado in await processar_lote_ordenado(itens)]
+    sucessos = sum(1 for resultado in resultados if resultado.success)
+    return AssistantBatchResponse(
+        success=sucessos == len(resultados),
+        total=len(resultados),
+        succeeded=sucessos,
+        failed=len(resultados) - sucessos,
+        results=resultados
+    )
+
+
 @router.get("/api/assistant/status/{request_id}")
 async def check_assistant_status(request_id: str):
     """
-    Verifica o status de uma solicitação ao assistente
+    Verifica o status do assistente e o progresso de uma solicitação
+    
+    Aceita o ID local ou o request_id de uma solicitação em modo assíncrono;
+    inclui o resultado quando ela já terminou.
     """
     try:
-        status = await verificar_status_assistente_ia(request_id)
+        status = verificar_status_assistente_ia(request_id)
+        progresso = executor_tarefas_assistente.progresso(request_id)
+        if progresso:
+            status.update(progresso)
         return status
     except Exception as e:
         return {"error": f"Erro ao verificar status: {str(e)}"}
 
 
+def _evento_sse(evento: str, dados: Dict[str, Any]) -> str:
+    return f"event: {evento}\ndata: {json.dumps(dados, default=str)}\n\n"
+
+
+@router.get("/api/assistant/status/{request_id}/eventos")
+async def stream_assistant_status(request_id: str, request: Request):
+    """
+    Stream (Server-Sent Events) das transições de status de uma solicitação
+    
+    Emite o status atual e cada transição (pendente, processando, concluida,
+    erro). Para solicitações em modo assíncrono, termina com o evento
+    "resultado"; para as demais, termina no status final. Se a solicitação
+    deixar de existir (retenção ou remoção) antes disso, termina com o
+    evento "removida".
+    """
+    local_id = executor_tarefas_assistente.localizar(request_id) or request_id
+    if GerenciadorSolicitacoes.buscar_solicitacao(local_id) is None:
+        raise HTTPException(status_code=404, detail="Solicitação não encontrada")
+    
+    async def eventos():
+        # Assinar antes de ler o estado atual para não perder transições
+        fila = eventos_solicitacoes.assinar(local_id)
+        try:
+            progresso = executor_tarefas_assistente.progresso(local_id)
+            if progresso is None:
+                # Removida entre a verificação acima e o início do stream
+                yield _evento_sse("removida", {"id": local_id})
+                return
+            yield _evento_sse("status", progresso["solicitacao"])
+            if "resultado" in progresso:
+                yield _evento_sse("resultado", progresso["resultado"])
+                return
+            eh_tarefa = executor_tarefas_assistente.eh_tarefa(local_id)
+            if not eh_tarefa and progresso["solicitacao"]["status"] in STATUS_FINAIS:
+                return
+            
+            while True:
+                try:
+                    evento = await asyncio.wait_for(fila.get(), timeout=15)
+                except asyncio.TimeoutError:
+                    if await request.is_disconnected():
+                        return
+                    if GerenciadorSolicitacoes.buscar_solicitacao(local_id) is None:
+                        # Removida sem chegar ao status final: nenhuma transição virá mais
+                        yield _evento_sse("removida", {"id": local_id})
+                        return
+                    yield ": ping\n\n"
+                    continue
+                
+                if evento.get("evento") == "resultado":
+                    yield _evento_sse("resultado", evento["resultado"])
+                    return
+                yield _evento_sse("status", evento)
+                if not eh_tarefa and evento["status"] in STATUS_FINAIS:
+                    return
+        finally:
+            eventos_solicitacoes.cancelar(local_id, fila)
+    
+    return StreamingResponse(
+        eventos(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/api/assistant/circuito")
+async def assistant_circuit_state():
+    """
+    Estado do disjuntor (circuit breaker) da integração com o assistente
+    """
+    return disjuntor_assistente.estado_atual()
+
+
+@router.get("/api/solicitacoes")
+async def list_solicitacoes(
+    user_id: Optional[int] = None,
+    tipo: Optional[str] = None,
+    status: Optional[str] = None,
+    limit: int = Query(50, ge=1, le=500),
+    before: Optional[str] = None,
+    after: Optional[str] = None
+):
+    """
+    Lista o histórico de solicitações (mais recentes primeiro) com paginação por cursor
+    """
+    solicitacoes = GerenciadorSolicitacoes.listar_solicitacoes(
+        user_id=user_id,
+        tipo=tipo,
+        status=status,
+        limit=limit,
+        before=before,
+        after=after
+    )
+    return {
+        "solicitacoes": solicitacoes,
+        # Cursores para a página mais antiga (before) e mais recente (after)
+        "before": solicitacoes[-1]["id"] if solicitacoes else None,
+        "after": solicitacoes[0]["id"] if solicitacoes else None
+    }
+
+
+@router.get("/api/solicitacoes/estatisticas")
+async def solicitacoes_estatisticas():
+    """
+    Estatísticas das solicitações e dos caches do assistente
+    """
+    estatisticas = GerenciadorSolicitacoes.obter_estatisticas()
+    estatisticas["tarefas_assistente"] = executor_tarefas_assistente.estatisticas()
+    return estatisticas
+
+
 @router.get("/", response_model=AppInfoResponse)
 async def home():
     """Home page route"""
@@ -134,51 +405,18 @@ async def health_check():
         environment=os.getenv('FASTAPI_ENV', 'production')
     )
 
-@router.get("/api/users/")
-async def get_users():
-    """Get list of mock users"""
-    mock_users = [
-        {
-            "id": 1,
-            "name": "João Silva",
-            "email": "joao@example.com", 
-            "active": True
-        },
-        {
-            "id": 2,
-            "name": "Maria Santos",
-            "email": "maria@example.com",
-            "active": True
-        },
-        {
-            "id": 3,
-            "name": "Pedro Oliveira", 
-            "email": "pedro@example.com",
-            "active": False
-        },
-        {
-            "id": 4,
-            "name": "Ana Costa",
-            "email": "ana@example.com",
-            "active": True
-        }
-    ]
-    return mock_users
-
 @router.get("/api/test-external", response_model=ExternalAPIResponse)
 async def test_external_api():
     """Test endpoint for consuming external APIs"""
     try:
-        # Example: consuming a test API
-        response = requests.get('https://jsonplaceholder.typicode.com/posts/1')
-        response.raise_for_status()
-        data = response.json()
+        # Example: consuming a test API (pooled async client, cached and coalesced)
+        data = await buscar_externo('https://jsonplaceholder.typicode.com/posts/1')
         
         return ExternalAPIResponse(
             status="success",
             external_data=data
         )
-    except requests.RequestException as e:
+    except httpx.HTTPError as e:
         raise HTTPException(
             status_code=500,
             detail=f"External API error: {str(e)}"
@@ -190,11 +428,10 @@ async def test_external_api():
         )
 
 @router.get("/dashboard", response_class=HTMLResponse)
-async def dashboard():
-    """Serve the dashboard HTML page"""
+async def dashboard(request: Request):
+    """Serve the dashboard HTML page (cached in memory, with ETag and gzip/brotli variants)"""
     try:
-        with open("app/templates/index.html", "r", encoding="utf-8") as file:
-            return HTMLResponse(content=file.read())
+        return dashboard_template.resposta(request.headers)
     except FileNotFoundError:
         raise HTTPException(status_code=404, detail="Dashboard template not found")
 
@@ -214,11 +451,12 @@ async def submit_feedback(solicitacao_id: str, feedback_request: FeedbackRequest
             dados_resposta=feedback_request.response_data
         )
         
+        # Feedback gravado na fila local; o envio ao assistente é feito em segundo plano
         return FeedbackResponse(
-            success=True,
-            message="Feedback enviado com sucesso",
+            success=resultado.get("success", False),
+            message=resultado.get("message", "Erro ao registrar feedback"),
             feedback_id=resultado.get("feedback_id"),
-            error=None
+            error=resultado.get("error")
         )
         
     except Exception as e:
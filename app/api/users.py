@@ -1,10 +1,19 @@
 """
 Exemplo de rotas para módulo de Usuários
 """
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import List, Optional
 
+from app.application.importacao_usuarios import (
+    MEDIA_TYPES,
+    exportar_usuarios,
+    formato_por_content_type,
+    importar_usuarios
+)
+from app.application.usuarios import CAMPOS_LISTAGEM, EmailDuplicado, GerenciadorUsuarios
+
 # Create router with prefix and tags
 router = APIRouter(
     prefix="/api/users",
@@ -25,21 +34,95 @@ class UserResponse(BaseModel):
     email: str
     active: bool
 
-# Simulação de dados
-fake_users_db = [
-    {"id": 1, "name": "João Silva", "email": "joao@example.com", "active": True},
-    {"id": 2, "name": "Maria Santos", "email": "maria@example.com", "active": True},
-]
+def _campos(fields: Optional[str]) -> Optional[List[str]]:
+    """Campos pedidos em fields= (400 se algum não existir)"""
+    if not fields:
+        return None
+    campos = [campo.strip() for campo in fields.split(",") if campo.strip()]
+    invalidos = [campo for campo in campos if campo not in CAMPOS_LISTAGEM]
+    if invalidos:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Campos inválidos: {', '.join(invalidos)} (disponíveis: {', '.join(CAMPOS_LISTAGEM)})"
+        )
+    return campos
+
+@router.get("/")
+async def list_users(
+    response: Response,
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[int] = None,
+    active: Optional[bool] = None,
+    email_prefix: Optional[str] = None,
+    name_prefix: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    """
+    Lista usuários em ordem de ID, paginados por cursor
+
+    - cursor: ID do último usuário da página anterior (cabeçalho X-Next-Cursor,
+      ausente na última página)
+    - active, email_prefix, name_prefix: filtros (prefixos sem diferenciar maiúsculas)
+    - fields: campos retornados, separados por vírgula (ex.: id,name)
+    """
+    campos = _campos(fields)
+    users, next_cursor = GerenciadorUsuarios.listar_usuarios(
+        limit=limit,
+        cursor=cursor,
+        active=active,
+        email_prefix=email_prefix,
+        name_prefix=name_prefix,
+        campos=campos
+    )
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = str(next_cursor)
+    return users
+
+@router.get("/export")
+async def export_users(
+    formato: Optional[str] = Query(None, alias="format", pattern="^(ndjson|csv)$"),
+    active: Optional[bool] = None,
+    email_prefix: Optional[str] = None,
+    name_prefix: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    """
+    Exporta usuários em streaming (NDJSON por padrão, ou format=csv)
+
+    Aceita os mesmos filtros e fields= da listagem; o repositório é
+    percorrido página a página, sem montar a lista inteira.
+    """
+    formato = formato or "ndjson"
+    campos = _campos(fields)
+    return StreamingResponse(
+        exportar_usuarios(formato, active=active, email_prefix=email_prefix, name_prefix=name_prefix, campos=campos),
+        media_type=MEDIA_TYPES[formato],
+        headers={"Content-Disposition": f'attachment; filename="usuarios.{formato}"'}
+    )
+
+@router.post("/bulk")
+async def bulk_create_users(
+    request: Request,
+    formato: Optional[str] = Query(None, alias="format", pattern="^(ndjson|csv)$")
+):
+    """
+    Importa usuários em massa a partir de um corpo NDJSON ou CSV enviado em streaming
 
-@router.get("/", response_model=List[UserResponse])
-async def list_users():
-    """Lista todos os usuários"""
-    return fake_users_db
+    O formato vem de format= ou do Content-Type (text/csv para CSV, NDJSON
+    nos demais casos); CSV começa com o cabeçalho name,email[,active].
+    Linhas inválidas ou com e-mail já cadastrado são relatadas em "errors"
+    (com o número da linha) sem interromper a importação.
+    """
+    formato = formato or formato_por_content_type(request.headers.get("content-type"))
+    try:
+        return await importar_usuarios(request.stream(), formato)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(user_id: int):
     """Busca um usuário por ID"""
-    user = next((user for user in fake_users_db if user["id"] == user_id), None)
+    user = GerenciadorUsuarios.buscar_usuario(user_id)
     if user is None:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
     return user
@@ -47,38 +130,31 @@ async def get_user(user_id: int):
 @router.post("/", response_model=UserResponse)
 async def create_user(user: User):
     """Cria um novo usuário"""
-    new_id = max([u["id"] for u in fake_users_db]) + 1 if fake_users_db else 1
-    new_user = {
-        "id": new_id,
-        "name": user.name,
-        "email": user.email,
-        "active": user.active
-    }
-    fake_users_db.append(new_user)
-    return new_user
+    try:
+        return GerenciadorUsuarios.criar_usuario(user.name, user.email, user.active)
+    except EmailDuplicado as e:
+        raise HTTPException(status_code=409, detail=str(e))
 
 @router.put("/{user_id}", response_model=UserResponse)
 async def update_user(user_id: int, user: User):
     """Atualiza um usuário existente"""
-    user_index = next((i for i, u in enumerate(fake_users_db) if u["id"] == user_id), None)
-    if user_index is None:
+    try:
+        updated_user = GerenciadorUsuarios.atualizar_usuario(
+            user_id,
+            name=user.name,
+            email=user.email,
+            active=user.active
+        )
+    except EmailDuplicado as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if updated_user is None:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
-    
-    updated_user = {
-        "id": user_id,
-        "name": user.name,
-        "email": user.email,
-        "active": user.active
-    }
-    fake_users_db[user_index] = updated_user
     return updated_user
 
 @router.delete("/{user_id}")
 async def delete_user(user_id: int):
     """Remove um usuário"""
-    user_index = next((i for i, u in enumerate(fake_users_db) if u["id"] == user_id), None)
-    if user_index is None:
+    deleted_user = GerenciadorUsuarios.remover_usuario(user_id)
+    if deleted_user is None:
         raise HTTPException(status_code=404, detail="Usuário não encontrado")
-    
-    deleted_user = fake_users_db.pop(user_index)
     return {"message": f"Usuário {deleted_user['name']} removido com sucesso"}
@@ -3,6 +3,11 @@ Módulo Application - Mock ERP
 Contém a lógica de negócio da aplicação
 """
 
+from .analise_pergunta import AnalisePergunta, analisar_pergunta
+from .armazenamento import ArmazenamentoSolicitacoes, RepositorioSolicitacoes, criar_armazenamento
+from .escrita_adiada import RepositorioEscritaAdiada
+from .registro import RegistroSolicitacao
+from .usuarios import EmailDuplicado, GerenciadorUsuarios, RepositorioUsuarios, criar_repositorio_usuarios
 from .solicitacoes import (
     GerenciadorSolicitacoes,
     SolicitacaoBase,
@@ -27,6 +32,17 @@ from .solicitacoes import (
 )
 
 __all__ = [
+    "AnalisePergunta",
+    "analisar_pergunta",
+    "ArmazenamentoSolicitacoes",
+    "RepositorioSolicitacoes",
+    "criar_armazenamento",
+    "RepositorioEscritaAdiada",
+    "RegistroSolicitacao",
+    "EmailDuplicado",
+    "GerenciadorUsuarios",
+    "RepositorioUsuarios",
+    "criar_repositorio_usuarios",
     "GerenciadorSolicitacoes",
     "SolicitacaoBase", 
     "SolicitacaoAssistenteVirtual",
@@ -0,0 +1,619 @@
+"""
+Módulo de Análise de Perguntas - Mock ERP Application
+Pipeline de passada única que normaliza a pergunta e gera todos os campos de enriquecimento
+"""
+import os
+import re
+from typing import Any, Dict, FrozenSet, Hashable, Iterable, List, Optional, Tuple
+
+from .cache import CacheLRU
+from .classificador import ClassificadorPalavras
+
+
+# Categorias por palavras-chave, em ordem de prioridade (mais específica primeiro)
+CATEGORIAS_SOLICITACAO = {
+    "user_interface": [
+        "onde", "como encontrar", "como acessar", "onde fica", "onde está",
+        "botão", "campo", "formulário", "aba", "tela", "menu", "interface"
+    ],
+    "data_entry": [
+        "como inserir", "como adicionar", "como preencher", "cadastrar",
+        "criar", "novo", "inserir", "adicionar", "registrar", "incluir"
+    ],
+    "data_edit": [
+        "como alterar", "como editar", "como modificar", "atualizar",
+        "mudar", "corrigir", "editar", "modificar", "alterar"
+    ],
+    "data_search": [
+        "como buscar", "como encontrar", "como localizar", "procurar",
+        "pesquisar", "consultar", "visualizar", "listar", "ver"
+    ],
+    "data_delete": [
+        "como excluir", "como apagar", "como remover", "deletar",
+        "excluir", "apagar", "remover", "eliminar"
+    ],
+    "business_process": [
+        "processo", "fluxo", "workflow", "etapa", "procedimento",
+        "como fazer", "passos", "sequência", "operação"
+    ],
+    "reporting": [
+        "relatório", "relatórios", "dados", "informações", "análise",
+        "dashboard", "gráfico", "exportar", "imprimir"
+    ],
+    "fiscal_tax": [
+        "nota fiscal", "nfe", "nfce", "nfse", "imposto", "tributo",
+        "fiscal", "sefaz", "xml", "chave", "cancelar", "inutilizar"
+    ],
+    "financial": [
+        "preço", "valor", "custo", "dinheiro", "pagamento", "cobrança",
+        "faturamento", "financeiro", "total", "cálculo", "desconto"
+    ],
+    "inventory": [
+        "estoque", "quantidade", "produto", "item", "inventário",
+        "disponível", "saldo", "movimentação", "entrada", "saída"
+    ],
+    "customer_management": [
+        "cliente", "clientes", "contato", "relacionamento", "crm",
+        "pessoa", "empresa", "cnpj", "cpf", "endereço"
+    ],
+    "sales": [
+        "venda", "vendas", "pedido", "orçamento", "proposta",
+        "vendedor", "comissão", "meta", "pipeline"
+    ],
+    "user_access": [
+        "usuário", "login", "senha", "acesso", "permissão", "perfil",
+        "bloqueado", "ativo", "administrador", "segurança"
+    ],
+    "system_config": [
+        "configuração", "parâmetro", "setting", "empresa", "dados",
+        "sistema", "backup", "integração", "api"
+    ],
+    "error_troubleshooting": [
+        "erro", "problema", "bug", "falha", "não funciona", "quebrado",
+        "travou", "lento", "não carrega", "deu pau"
+    ],
+    "tutorial_help": [
+        "como", "tutorial", "ajuda", "explicar", "ensinar", "mostrar",
+        "exemplo", "dica", "orientação", "instrução"
+    ]
+}
+
+# Tópicos por palavra-chave da pergunta
+TOPICOS_POR_PALAVRA = {
+    "preço": ["pricing", "cost_analysis"],
+    "custo": ["pricing", "cost_analysis"],
+    "estoque": ["inventory_management", "stock_control"],
+    "venda": ["sales_strategy", "customer_engagement"],
+    "marketing": ["marketing_strategy", "promotion"],
+    "fornecedor": ["supplier_management", "procurement"],
+    "cadastro": ["data_entry", "product_registration"],
+    "categoria": ["categorization", "product_classification"]
+}
+
+# Palavras irrelevantes (stop words) para extração de palavras-chave
+STOP_WORDS = {
+    "o", "a", "os", "as", "um", "uma", "de", "da", "do", "das", "dos", 
+    "em", "na", "no", "nas", "nos", "para", "por", "com", "como", 
+    "que", "qual", "quando", "onde", "porque", "este", "esta", "isso",
+    "é", "são", "foi", "será", "tem", "ter", "posso", "pode", "deve"
+}
+
+# Tags específicas por módulo/tela
+TAGS_POR_MODULO = {
+    "clientes": [
+        "clientes", "customers", "crm", "cadastro_cliente", "pessoa_fisica", "pessoa_juridica",
+        "cnpj", "cpf", "endereco", "contato", "relacionamento", "base_clientes"
+    ],
+    "produtos": [
+        "produtos", "products", "inventory", "catalogo", "estoque", "ean", "codigo_produto",
+        "categoria", "preco", "descricao", "imagem", "referencia", "gestao_produtos"
+    ],
+    "vendas": [
+        "vendas", "sales", "revenue", "faturamento", "pedidos", "orcamento", "proposta",
+        "comissao", "meta", "pipeline", "funil", "conversao", "vendedor", "gestao_vendas"
+    ],
+    "transportadoras": [
+        "transportadoras", "shipping", "logistics", "frete", "entrega", "transporte",
+        "logistica", "prazo", "rastreamento", "correios", "transportadora", "distribuicao"
+    ],
+    "notas_fiscais": [
+        "notas_fiscais", "fiscal", "nfe", "nfce", "nfse", "sefaz", "autorizacao",
+        "cancelamento", "inutilizacao", "tributacao", "impostos", "chave_acesso", "xml"
+    ],
+    "usuarios": [
+        "usuarios", "users", "acesso", "permissoes", "perfil", "login", "senha",
+        "administrador", "vendedor", "operador", "seguranca", "autenticacao", "roles"
+    ],
+    "empresa": [
+        "empresa", "company", "dados_empresa", "cnpj", "razao_social", "inscricao_estadual",
+        "configuracao", "parametros", "sede", "filial", "empresa_dados", "corporativo"
+    ]
+}
+
+# Tags baseadas em palavras-chave da pergunta (mais específicas)
+TAGS_POR_PALAVRA = {
+    # Operações CRUD
+    "como": ["tutorial", "howto", "instrucoes"],
+    "criar": ["create", "novo", "adicionar", "cadastrar"],
+    "editar": ["edit", "alterar", "modificar", "atualizar"],
+    "excluir": ["delete", "remover", "apagar"],
+    "buscar": ["search", "localizar", "encontrar", "consultar"],
+    "listar": ["list", "visualizar", "exibir", "mostrar"],
+    
+    # Problemas e dúvidas
+    "erro": ["error", "problema", "bug", "falha"],
+    "duvida": ["question", "help", "ajuda", "suporte"],
+    "nao": ["not_working", "problema", "dificuldade"],
+    "funciona": ["funcionamento", "operacao", "uso"],
+    
+    # Campos específicos por contexto
+    "cnpj": ["documento", "fiscal", "empresa"],
+    "cpf": ["documento", "pessoa_fisica", "individual"],
+    "email": ["contato", "comunicacao", "endereco_eletronico"],
+    "telefone": ["contato", "comunicacao", "fone"],
+    "endereco": ["localizacao", "address", "cep"],
+    "senha": ["password", "acesso", "login", "seguranca"],
+    "preco": ["valor", "custo", "money", "financeiro"],
+    "quantidade": ["qtd", "estoque", "inventory"],
+    "data": ["date", "periodo", "tempo"],
+    "status": ["situacao", "estado", "condicao"],
+    
+    # Ações específicas do ERP
+    "vender": ["comercial", "negocio", "revenue"],
+    "comprar": ["aquisicao", "fornecedor", "procurement"],
+    "entregar": ["delivery", "shipping", "logistica"],
+    "faturar": ["billing", "invoice", "cobranca"],
+    "pagar": ["payment", "financeiro", "contas"],
+    "receber": ["receivables", "cobranca", "entrada"],
+    
+    # Relatórios e consultas
+    "relatorio": ["report", "dashboard", "analytics"],
+    "consulta": ["query", "search", "lookup"],
+    "historico": ["history", "log", "tracking"],
+    "backup": ["backup", "copia", "seguranca"],
+    
+    # Integrações
+    "api": ["integration", "webservice", "endpoint"],
+    "xml": ["arquivo", "dados", "export"],
+    "excel": ["planilha", "import", "export"],
+    "pdf": ["documento", "impressao", "relatorio"],
+    
+    # Urgência e prioridade
+    "urgente": ["priority", "critico", "importante"],
+    "rapido": ["fast", "agil", "quick"],
+    "lento": ["slow", "performance", "otimizacao"]
+}
+
+# Tags por tipo de módulo: cada grupo é uma cadeia if/elif de (palavras, tags)
+TAGS_POR_TIPO_MODULO = {
+    "Clientes": [
+        [
+            (("cnpj", "empresa", "juridica"), ["pessoa_juridica", "corporativo", "b2b"]),
+            (("cpf", "fisica", "individual"), ["pessoa_fisica", "individual", "b2c"])
+        ]
+    ],
+    "Produtos": [
+        [(("categoria", "tipo"), ["classificacao", "taxonomia"])],
+        [(("estoque", "quantidade"), ["inventory_management", "stock_control"])]
+    ],
+    "Vendas": [
+        [(("produto", "item"), ["produtos_venda", "carrinho", "itens"])],
+        [(("total", "valor"), ["calculo", "pricing", "financeiro"])]
+    ],
+    "Notas Fiscais": [
+        [(("nfe", "eletronica"), ["nfe", "sefaz", "digital"])],
+        [(("cancelar", "inutilizar"), ["cancelamento", "fiscal_operations"])]
+    ],
+    "Usuários": [
+        [(("admin", "administrador"), ["admin_rights", "super_user"])],
+        [(("perfil", "permissao"), ["access_control", "authorization"])]
+    ]
+}
+
+# Campos procurados em perguntas de localização de interface (ordem de prioridade)
+CAMPOS_INTERFACE = [
+    (("cnpj", "documento"), "documento"),
+    (("email", "e-mail"), "email"),
+    (("telefone", "fone"), "telefone"),
+    (("endereco", "endereço"), "endereco")
+]
+
+# Grupos de palavras usados nas demais regras
+PALAVRAS_ONDE_CAMPO = ("onde", "qual campo", "que campo")
+PALAVRAS_COMO = ("como fazer", "como")
+COMPLEXIDADE_ALTA = (
+    "como integrar", "análise detalhada", "estratégia", "implementar",
+    "otimizar", "automatizar", "processo completo", "workflow"
+)
+COMPLEXIDADE_BAIXA = ("o que é", "como faço", "onde encontro", "qual valor", "quanto custa")
+SENTIMENTO_POSITIVO = ("ótimo", "excelente", "bom", "gosto", "adorei", "perfeito")
+SENTIMENTO_NEGATIVO = ("problema", "erro", "ruim", "não funciona", "difícil", "complicado")
+PALAVRAS_EXPLICATIVAS = ("como", "onde", "quando", "porque", "qual")
+PALAVRAS_ACAO = ("preciso", "quero", "gostaria")
+
+_PONTUACAO = re.compile(r'[^\w\s]')
+
+
+def _montar_classificador() -> ClassificadorPalavras:
+    """
+    Compila todas as tabelas de palavras em um único classificador
+
+    Rótulos: ("categoria", nome), ("topico", palavra), ("tag", palavra) e
+    ("grupo", palavras) para os grupos testados com any(...).
+    """
+    rotulos: Dict[Hashable, List[str]] = {}
+    for categoria, palavras in CATEGORIAS_SOLICITACAO.items():
+        rotulos[("categoria", categoria)] = palavras
+    for palavra in TOPICOS_POR_PALAVRA:
+        rotulos[("topico", palavra)] = [palavra]
+    for palavra in TAGS_POR_PALAVRA:
+        rotulos[("tag", palavra)] = [palavra]
+
+    grupos = [
+        PALAVRAS_ONDE_CAMPO, PALAVRAS_COMO, COMPLEXIDADE_ALTA, COMPLEXIDADE_BAIXA,
+        SENTIMENTO_POSITIVO, SENTIMENTO_NEGATIVO, PALAVRAS_EXPLICATIVAS, PALAVRAS_ACAO
+    ]
+    grupos += [palavras for palavras, _ in CAMPOS_INTERFACE]
+    for cadeias in TAGS_POR_TIPO_MODULO.values():
+        for cadeia in cadeias:
+            grupos += [palavras for palavras, _ in cadeia]
+    for grupo in grupos:
+        rotulos[("grupo", grupo)] = list(grupo)
+
+    return ClassificadorPalavras(rotulos)
+
+
+# Classificador compartilhado: uma passada sobre a pergunta atende todas as regras
+_classificador = _montar_classificador()
+
+
+def determinar_tela_atual(product_data: Dict[str, Any]) -> str:
+    """
+    Determina a tela/módulo atual baseado nos dados do produto/módulo
+    
+    Args:
+        product_data: Dados do produto ou módulo atual
+        
+    Returns:
+        String identificando a tela atual
+    """
+    # Verificar se é um módulo específico
+    if isinstance(product_data, dict):
+        module_type = product_data.get("type", "")
+        
+        if module_type == "Clientes":
+            return "clientes"
+        elif module_type == "Vendas":
+            return "vendas"
+        elif module_type == "Transportadoras":
+            return "transportadoras"
+        elif module_type == "Notas Fiscais":
+            return "notas_fiscais"
+        elif module_type == "Usuários":
+            return "usuarios"
+        elif module_type == "Empresa":
+            return "empresa"
+        elif module_type == "Produtos":
+            return "produtos"
+        
+        # Se tem categoria de produto, é tela de produtos
+        if product_data.get("category"):
+            return "produtos"
+            
+        # Se tem dados de cliente
+        if any(key in product_data for key in ["clienteNome", "clienteTipo", "clienteDocumento"]):
+            return "clientes"
+            
+        # Se tem dados de venda
+        if any(key in product_data for key in ["vendaNumero", "vendaCliente", "vendaTotal"]):
+            return "vendas"
+            
+        # Se tem dados de transportadora
+        if any(key in product_data for key in ["transpNome", "transpCnpj", "transpRegiao"]):
+            return "transportadoras"
+            
+        # Se tem dados de nota fiscal
+        if any(key in product_data for key in ["nfNumero", "nfSerie", "nfTipo"]):
+            return "notas_fiscais"
+            
+        # Se tem dados de usuário
+        if any(key in product_data for key in ["usuarioNome", "usuarioLogin", "usuarioPerfil"]):
+            return "usuarios"
+            
+        # Se tem dados de empresa
+        if any(key in product_data for key in ["empresaNome", "empresaCnpj", "empresaFantasia"]):
+            return "empresa"
+    
+    # Default para produtos se não conseguir determinar
+    return "produtos"
+
+
+def _categoria_contextual(pergunta: str, contem) -> str:
+    """Categoria quando nenhuma palavra-chave de categoria está presente"""
+    if "?" in pergunta:
+        if contem(PALAVRAS_ONDE_CAMPO):
+            return "user_interface"
+        elif contem(PALAVRAS_COMO):
+            return "tutorial_help"
+        else:
+            return "general_inquiry"
+
+    # Fallback para categorias gerais
+    return "general_inquiry"
+
+
+def detectar_categoria(pergunta: str) -> str:
+    """
+    Detecta só a categoria, sem montar a análise completa
+
+    As categorias vêm primeiro na ordem do classificador, então a varredura
+    com parada antecipada restrita a elas basta.
+    """
+    pergunta_lower = pergunta.lower()
+    rotulo = _classificador.primeiro_rotulo(pergunta_lower, entre=len(CATEGORIAS_SOLICITACAO))
+    if rotulo is not None:
+        return rotulo[1]
+    return _categoria_contextual(pergunta, lambda grupo: any(palavra in pergunta_lower for palavra in grupo))
+
+
+class AnalisePergunta:
+    """
+    Análise de uma pergunta em passada única
+
+    A pergunta é normalizada e varrida uma única vez pelo classificador
+    compartilhado, e a tela atual é determinada uma única vez. Todos os
+    campos de enriquecimento são derivados do mesmo conjunto de
+    correspondências.
+    """
+
+    def __init__(self, pergunta: str, product_data: Optional[Dict[str, Any]] = None):
+        self.pergunta = pergunta
+        self.product_data = product_data if product_data is not None else {}
+        self.pergunta_lower = pergunta.lower()
+        self.total_palavras = len(pergunta.split())
+        self.rotulos: FrozenSet[Hashable] = frozenset(_classificador.rotulos_presentes(self.pergunta_lower))
+        # Rótulos presentes na ordem de definição das tabelas
+        self.presentes: List[Hashable] = _classificador.ordenar(self.rotulos)
+        self.tela_atual = determinar_tela_atual(self.product_data)
+        self._categoria: Optional[str] = None
+
+    def _tem(self, grupo: tuple) -> bool:
+        return ("grupo", grupo) in self.rotulos
+
+    def categoria(self) -> str:
+        """Categoria da solicitação (primeira categoria presente vence)"""
+        if self._categoria is None:
+            for tipo, categoria in self.presentes:
+                if tipo == "categoria":
+                    self._categoria = categoria
+                    break
+            else:
+                self._categoria = _categoria_contextual(self.pergunta, self._tem)
+        return self._categoria
+
+    def subcategoria(self, categoria: Optional[str] = None) -> str:
+        """Subcategoria baseada na categoria, no módulo e na tela atual"""
+        if categoria is None:
+            categoria = self.categoria()
+        module_type = self.product_data.get("type", "") if isinstance(self.product_data, dict) else ""
+
+        # Subcategorias específicas por módulo
+        if module_type:
+            module_suffix = module_type.lower().replace(" ", "_")
+
+            if categoria == "user_interface":
+                for palavras, campo in CAMPOS_INTERFACE:
+                    if self._tem(palavras):
+                        return f"field_location_{module_suffix}_{campo}"
+                return f"interface_navigation_{module_suffix}"
+
+            elif categoria == "data_entry":
+                return f"create_new_{module_suffix}"
+
+            elif categoria == "data_edit":
+                return f"edit_existing_{module_suffix}"
+
+            elif categoria == "business_process":
+                if "venda" in module_suffix:
+                    return "sales_process_flow"
+                elif "fiscal" in module_suffix:
+                    return "fiscal_process_flow"
+                elif "cliente" in module_suffix:
+                    return "customer_process_flow"
+                else:
+                    return f"process_{module_suffix}"
+
+        # Subcategorias baseadas na tela atual
+        if self.tela_atual:
+            return f"{categoria}_{self.tela_atual}"
+
+        # Fallback
+        return f"{categoria}_general"
+
+    def palavras_chave(self) -> List[str]:
+        """Palavras-chave relevantes (máximo 10 únicas)"""
+        palavras = _PONTUACAO.sub('', self.pergunta_lower).split()
+        palavras_relevantes = [palavra for palavra in palavras
+                               if len(palavra) > 2 and palavra not in STOP_WORDS]
+        return list(set(palavras_relevantes))[:10]
+
+    def topicos_abordados(self) -> List[str]:
+        topicos = []
+        for tipo, palavra in self.presentes:
+            if tipo == "topico":
+                topicos.extend(TOPICOS_POR_PALAVRA[palavra])
+
+        # Adicionar tópico da categoria do produto
+        if self.product_data.get("category"):
+            topicos.append(f"product_{self.product_data['category']}")
+
+        return list(set(topicos))
+
+    def complexidade(self) -> str:
+        if self._tem(COMPLEXIDADE_ALTA):
+            return "alta"
+        elif self._tem(COMPLEXIDADE_BAIXA):
+            return "baixa"
+        elif self.total_palavras > 15:
+            return "media"
+        else:
+            return "baixa"
+
+    def sentimento(self) -> str:
+        if self._tem(SENTIMENTO_POSITIVO):
+            return "positivo"
+        elif self._tem(SENTIMENTO_NEGATIVO):
+            return "negativo"
+        else:
+            return "neutro"
+
+    def tags(self) -> List[str]:
+        """Tags baseadas na tela atual e no contexto (máximo 15 únicas)"""
+        tags = []
+
+        # Adicionar tags do módulo atual
+        if self.tela_atual in TAGS_POR_MODULO:
+            tags.extend(TAGS_POR_MODULO[self.tela_atual])
+
+        # Tags baseadas em palavras-chave contextuais
+        for tipo, palavra in self.presentes:
+            if tipo == "tag":
+                tags.extend(TAGS_POR_PALAVRA[palavra])
+
+        # Tags específicas por tipo de módulo
+        for cadeia in TAGS_POR_TIPO_MODULO.get(self.product_data.get("type") or "", []):
+            for palavras, tag_list in cadeia:
+                if self._tem(palavras):
+                    tags.extend(tag_list)
+                    break
+
+        # Tags do contexto de dados específicos
+        if self.product_data.get("data"):
+            data = self.product_data.get("data", {})
+
+            # Se há dados preenchidos, adicionar tags de "edicao"
+            if any(str(value).strip() for value in data.values() if value):
+                tags.extend(["edicao", "dados_preenchidos", "formulario_ativo"])
+            else:
+                tags.extend(["novo_registro", "formulario_vazio", "criacao"])
+
+        # Adicionar tags do sistema e ambiente
+        tags.extend(["mock_erp", "sistema_gestao", "erp", "web_interface"])
+
+        # Tags de complexidade baseadas no tamanho da pergunta
+        if self.total_palavras <= 3:
+            tags.append("pergunta_simples")
+        elif self.total_palavras <= 8:
+            tags.append("pergunta_media")
+        else:
+            tags.append("pergunta_complexa")
+
+        # Tags de categoria de pergunta
+        if "?" in self.pergunta:
+            tags.append("duvida_direta")
+        if self._tem(PALAVRAS_EXPLICATIVAS):
+            tags.append("pergunta_explicativa")
+        if self._tem(PALAVRAS_ACAO):
+            tags.append("solicitacao_acao")
+
+        return list(set(tags))[:15]
+
+    def enriquecimento(self) -> Dict[str, Any]:
+        """Retorna todos os campos de enriquecimento da pergunta"""
+        categoria = self.categoria()
+        return {
+            "tela_atual": self.tela_atual,
+            "categoria": categoria,
+            "subcategoria": self.subcategoria(categoria),
+            "palavras_chave": self.palavras_chave(),
+            "topicos_abordados": self.topicos_abordados(),
+            "tags": self.tags(),
+            "complexidade": self.complexidade(),
+            "sentimento": self.sentimento()
+        }
+
+
+def analisar_pergunta(pergunta: str, product_data: Optional[Dict[str, Any]] = None) -> AnalisePergunta:
+    """Analisa a pergunta uma única vez para todos os campos de enriquecimento"""
+    return AnalisePergunta(pergunta, product_data)
+
+
+# Enriquecimentos memorizados (configurados no lifespan via ENRIQUECIMENTO_CACHE_*)
+cache_enriquecimento = CacheLRU(max_itens=4096)
+
+
+def configurar_cache_enriquecimento() -> None:
+    """Aplica tamanho e TTL do cache de enriquecimento definidos no ambiente"""
+    ttl = os.getenv("ENRIQUECIMENTO_CACHE_TTL")
+    cache_enriquecimento.max_itens = int(os.getenv("ENRIQUECIMENTO_CACHE_MAX", cache_enriquecimento.max_itens))
+    cache_enriquecimento.ttl = float(ttl) if ttl else None
+    cache_enriquecimento.limpar()
+
+
+def chave_enriquecimento(pergunta: str, product_data: Dict[str, Any], tela_atual: str) -> Tuple:
+    """
+    Chave com tudo de que o enriquecimento depende
+
+    Pergunta normalizada, tela atual, tipo e categoria do módulo e o estado
+    do formulário (sem dados, vazio ou preenchido).
+    """
+    data = product_data.get("data")
+    formulario = any(str(value).strip() for value in data.values() if value) if data else None
+    categoria = product_data.get("category")
+    return (
+        pergunta.lower().strip(),
+        tela_atual,
+        product_data.get("type") or "",
+        str(categoria) if categoria else None,
+        formulario
+    )
+
+
+def enriquecer_pergunta(pergunta: str, product_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Retorna todos os campos de enriquecimento, memorizados por pergunta e módulo
+
+    O enriquecimento é determinístico para a mesma pergunta normalizada e o
+    mesmo contexto de módulo, então perguntas repetidas não são reanalisadas.
+    As listas retornadas são cópias e podem ser modificadas pelo chamador.
+    """
+    product_data = product_data if product_data is not None else {}
+    chave = chave_enriquecimento(pergunta, product_data, determinar_tela_atual(product_data))
+
+    enriquecimento = cache_enriquecimento.obter(chave)
+    if enriquecimento is None:
+        enriquecimento = analisar_pergunta(pergunta, product_data).enriquecimento()
+        cache_enriquecimento.definir(chave, enriquecimento)
+
+    return {campo: list(valor) if isinstance(valor, list) else valor for campo, valor in enriquecimento.items()}
+
+
+def enriquecer_perguntas(perguntas: Iterable[Tuple[str, Optional[Dict[str, Any]]]]) -> List[Dict[str, Any]]:
+    """
+    Enriquecimento de um lote de perguntas (pergunta, product_data), na ordem
+
+    Cada chave de enriquecimento distinta do lote é consultada no cache e,
+    se preciso, analisada uma única vez, mesmo com o cache desativado:
+    perguntas repetidas no lote (ex.: FAQ de vários usuários) custam uma
+    consulta a dict. As listas retornadas são cópias independentes por item.
+    """
+    chaves = []
+    for pergunta, product_data in perguntas:
+        product_data = product_data if product_data is not None else {}
+        chave = chave_enriquecimento(pergunta, product_data, determinar_tela_atual(product_data))
+        chaves.append((chave, pergunta, product_data))
+
+    por_chave: Dict[Tuple, Dict[str, Any]] = {}
+    for chave, pergunta, product_data in chaves:
+        if chave in por_chave:
+            continue
+        enriquecimento = cache_enriquecimento.obter(chave)
+        if enriquecimento is None:
+            enriquecimento = analisar_pergunta(pergunta, product_data).enriquecimento()
+            cache_enriquecimento.definir(chave, enriquecimento)
+        por_chave[chave] = enriquecimento
+
+    return [
+        {campo: list(valor) if isinstance(valor, list) else valor for campo, valor in por_chave[chave].items()}
+        for chave, _, _ in chaves
+    ]
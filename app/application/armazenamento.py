@@ -0,0 +1,403 @@
+"""
+Módulo de Armazenamento - Mock ERP Application
+Repositório de solicitações: interface comum e implementação em memória com índices
+"""
+from bisect import bisect_left, bisect_right
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+from .registro import RegistroSolicitacao
+
+
+# Campos com índice secundário (valor -> conjunto ordenado de IDs)
+CAMPOS_INDEXADOS = ("user_id", "tipo", "status")
+
+# Campos imutáveis com lista de sequências em ordem de criação (para paginação)
+CAMPOS_ORDENADOS = ("user_id", "tipo")
+
+# Mínimo de posições removidas antes de compactar a ordem de criação
+MIN_REMOVIDOS_COMPACTACAO = 1024
+
+# Campos agregados em contadores incrementais (campo -> valor padrão)
+CAMPOS_CONTADOS = {"status": "pendente", "tipo": "indefinido", "prioridade": "normal"}
+
+
+class RepositorioSolicitacoes:
+    """
+    Interface dos repositórios de solicitações usados pelo GerenciadorSolicitacoes
+
+    Registros são dicts com ao menos "id", "tipo", "status" e "created_at".
+    Implementações: ArmazenamentoSolicitacoes (memória) e
+    ArmazenamentoSolicitacoesSQLite (arquivo SQLite), escolhidas por
+    criar_armazenamento a partir de DATABASE_URL, e
+    RepositorioEscritaAdiada, que acumula as escritas em memória sobre
+    outro repositório.
+
+    `registros_em_memoria` indica se os registros ficam em memória (a
+    retenção percorre, compacta e mede cada um) ou em disco, onde a
+    retenção usa remover_criadas_antes / remover_mais_antigas.
+    """
+
+    registros_em_memoria = True
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        raise NotImplementedError
+
+    def __contains__(self, solicitacao_id: object) -> bool:
+        return self.buscar(solicitacao_id) is not None
+
+    def inserir(self, solicitacao: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Insere uma nova solicitação (ValueError se o ID já existir)
+
+        Retorna o registro guardado, que pode ser outro objeto com acesso de
+        dict (ex.: RegistroSolicitacao); atualizações seguintes valem para ele.
+        """
+        raise NotImplementedError
+
+    def buscar(self, solicitacao_id: str) -> Optional[Dict[str, Any]]:
+        """Busca uma solicitação pelo ID"""
+        raise NotImplementedError
+
+    def atualizar(self, solicitacao_id: str, **campos: Any) -> Optional[Dict[str, Any]]:
+        """Atualiza campos de uma solicitação; None se o ID não existir"""
+        raise NotImplementedError
+
+    def remover(self, solicitacao_id: str) -> Optional[Dict[str, Any]]:
+        """Remove uma solicitação; None se o ID não existir"""
+        raise NotImplementedError
+
+    def contagens(self, campo: str) -> Dict[Any, int]:
+        """Contadores agregados por valor de status, tipo ou prioridade"""
+        raise NotImplementedError
+
+    def ids_por(self, campo: str, valor: Any) -> Dict[str, None]:
+        """Conjunto (dict ordenado) dos IDs com campo == valor, para user_id, tipo ou status"""
+        raise NotImplementedError
+
+    def listar(
+        self,
+        user_id: Optional[int] = None,
+        tipo: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+        before: Optional[str] = None,
+        after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """Lista das mais recentes para as mais antigas, com filtros e cursor before/after"""
+        raise NotImplementedError
+
+    def sequencias(self, ids: Sequence[str]) -> Dict[str, int]:
+        """Posição na ordem de criação de cada ID existente (os ausentes ficam de fora)"""
+        raise NotImplementedError
+
+    def remover_criadas_antes(self, limite: datetime, quantidade: int) -> List[Dict[str, Any]]:
+        """
+        Remove até `quantidade` solicitações criadas antes de `limite` (retenção
+        em repositórios fora da memória)
+
+        Returns:
+            ID e valores contados (status, tipo, prioridade) de cada removida
+        """
+        raise NotImplementedError
+
+    def remover_mais_antigas(self, quantidade: int, status: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Remove as `quantidade` solicitações mais antigas (só as com esses status, se informados)"""
+        raise NotImplementedError
+
+    def gravar_lote(self, registros: Sequence[Dict[str, Any]], removidos: Sequence[str] = ()) -> None:
+        """
+        Grava registros completos (inserindo ou substituindo pelo ID) e remove
+        os IDs indicados, efetivando tudo ao final
+
+        Implementação genérica sobre inserir/atualizar/remover; backends com
+        transações podem aplicar o lote inteiro de uma vez.
+        """
+        for solicitacao in registros:
+            if solicitacao["id"] in self:
+                self.atualizar(solicitacao["id"], **solicitacao)
+            else:
+                self.inserir(solicitacao)
+        for solicitacao_id in removidos:
+            self.remover(solicitacao_id)
+        self.confirmar()
+
+    def abrir_leitor(self) -> Optional["RepositorioSolicitacoes"]:
+        """
+        Repositório só de leitura sobre os mesmos dados, que pode ser lido
+        enquanto outra thread grava neste (None se o backend não oferece)
+        """
+        return None
+
+    def confirmar(self) -> None:
+        """Efetiva escritas pendentes (repositórios com commit em lote)"""
+
+    def fechar(self) -> None:
+        """Efetiva escritas pendentes e libera recursos"""
+
+    def descricao(self) -> Dict[str, Any]:
+        """Backend em uso e seus parâmetros (para as estatísticas)"""
+        return {"backend": type(self).__name__}
+
+
+class ArmazenamentoSolicitacoes(RepositorioSolicitacoes):
+    """
+    Armazenamento em memória das solicitações
+
+    Mantém um índice hash ID -> registro e índices secundários por user_id,
+    tipo e status, de modo que buscas e atualizações custem O(1) em vez de
+    percorrer todo o histórico. Os índices usam dicts como conjuntos
+    ordenados, preservando a ordem de inserção.
+
+    Contadores por status, tipo e prioridade são mantidos a cada inserção,
+    atualização e remoção, então ler as estatísticas também custa O(1).
+
+    Cada registro recebe um número de sequência na inserção (ordem de
+    criação). A listagem percorre essa ordem a partir de um cursor
+    (before/after) e para ao atingir o limite, custando O(limit) em vez de
+    copiar e ordenar todo o histórico.
+
+    Com registros_compactos (padrão), cada solicitação é guardada como
+    RegistroSolicitacao (slots, valores internados e datas em epoch) em vez
+    do dict recebido.
+    """
+
+    def __init__(self, registros_compactos: bool = True):
+        self.registros_compactos = registros_compactos
+        self._registros: Dict[str, Dict[str, Any]] = {}
+        self._indices: Dict[str, Dict[Any, Dict[str, None]]] = {
+            campo: {} for campo in CAMPOS_INDEXADOS
+        }
+        self._contadores: Dict[str, Dict[Any, int]] = {campo: {} for campo in CAMPOS_CONTADOS}
+        # Ordem de criação: posição -> ID (None quando removido)
+        self._ordem: List[Optional[str]] = []
+        self._sequencia: Dict[str, int] = {}
+        self._sequencias_por: Dict[str, Dict[Any, List[int]]] = {
+            campo: {} for campo in CAMPOS_ORDENADOS
+        }
+        self._removidos = 0
+
+    def __len__(self) -> int:
+        return len(self._registros)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        return iter(self._registros.values())
+
+    def __contains__(self, solicitacao_id: object) -> bool:
+        return solicitacao_id in self._registros
+
+    def _indexar(self, campo: str, valor: Any, solicitacao_id: str) -> None:
+        self._indices[campo].setdefault(valor, {})[solicitacao_id] = None
+
+    def _desindexar(self, campo: str, valor: Any, solicitacao_id: str) -> None:
+        ids = self._indices[campo].get(valor)
+        if ids is None:
+            return
+        ids.pop(solicitacao_id, None)
+        if not ids:
+            del self._indices[campo][valor]
+
+    def _contar(self, campo: str, valor: Any, delta: int) -> None:
+        contagem = self._contadores[campo]
+        total = contagem.get(valor, 0) + delta
+        if total > 0:
+            contagem[valor] = total
+        else:
+            contagem.pop(valor, None)
+
+    def _sequenciar(self, solicitacao: Dict[str, Any], solicitacao_id: str) -> None:
+        sequencia = len(self._ordem)
+        self._ordem.append(solicitacao_id)
+        self._sequencia[solicitacao_id] = sequencia
+        for campo in CAMPOS_ORDENADOS:
+            self._sequencias_por[campo].setdefault(solicitacao.get(campo), []).append(sequencia)
+
+    def _compactar_ordem(self) -> None:
+        """Renumera as sequências descartando posições removidas"""
+        self._ordem = []
+        self._sequencia = {}
+        self._sequencias_por = {campo: {} for campo in CAMPOS_ORDENADOS}
+        self._removidos = 0
+        for solicitacao_id, solicitacao in self._registros.items():
+            self._sequenciar(solicitacao, solicitacao_id)
+
+    def _valor_contado(self, solicitacao: Dict[str, Any], campo: str) -> Any:
+        return solicitacao.get(campo, CAMPOS_CONTADOS[campo])
+
+    def inserir(self, solicitacao: Dict[str, Any]) -> Dict[str, Any]:
+        """Insere uma nova solicitação e atualiza os índices"""
+        solicitacao_id = solicitacao["id"]
+        if solicitacao_id in self._registros:
+            raise ValueError(f"Solicitação {solicitacao_id} já existe")
+
+        if self.registros_compactos and not isinstance(solicitacao, RegistroSolicitacao):
+            solicitacao = RegistroSolicitacao(solicitacao)
+        self._registros[solicitacao_id] = solicitacao
+        self._sequenciar(solicitacao, solicitacao_id)
+        for campo in CAMPOS_INDEXADOS:
+            self._indexar(campo, solicitacao.get(campo), solicitacao_id)
+        for campo in CAMPOS_CONTADOS:
+            self._contar(campo, self._valor_contado(solicitacao, campo), 1)
+        return solicitacao
+
+    def buscar(self, solicitacao_id: str) -> Optional[Dict[str, Any]]:
+        """Busca uma solicitação pelo ID em O(1)"""
+        return self._registros.get(solicitacao_id)
+
+    def atualizar(self, solicitacao_id: str, **campos: Any) -> Optional[Dict[str, Any]]:
+        """
+        Atualiza campos de uma solicitação mantendo os índices consistentes
+
+        Returns:
+            A solicitação atualizada ou None se o ID não existir
+        """
+        solicitacao = self._registros.get(solicitacao_id)
+        if solicitacao is None:
+            return None
+
+        for campo, valor in campos.items():
+            if campo in self._indices:
+                anterior = solicitacao.get(campo)
+                if anterior != valor:
+                    self._desindexar(campo, anterior, solicitacao_id)
+                    self._indexar(campo, valor, solicitacao_id)
+            if campo in self._contadores:
+                anterior = self._valor_contado(solicitacao, campo)
+                if anterior != valor:
+                    self._contar(campo, anterior, -1)
+                    self._contar(campo, valor, 1)
+            solicitacao[campo] = valor
+        return solicitacao
+
+    def remover(self, solicitacao_id: str) -> Optional[Dict[str, Any]]:
+        """Remove uma solicitação e suas entradas nos índices"""
+        solicitacao = self._registros.pop(solicitacao_id, None)
+        if solicitacao is None:
+            return None
+
+        for campo in CAMPOS_INDEXADOS:
+            self._desindexar(campo, solicitacao.get(campo), solicitacao_id)
+        for campo in CAMPOS_CONTADOS:
+            self._contar(campo, self._valor_contado(solicitacao, campo), -1)
+
+        # Posições removidas viram lacunas, ignoradas na listagem até a compactação
+        self._ordem[self._sequencia.pop(solicitacao_id)] = None
+        self._removidos += 1
+        if self._removidos >= MIN_REMOVIDOS_COMPACTACAO and self._removidos * 2 >= len(self._ordem):
+            self._compactar_ordem()
+        return solicitacao
+
+    def contagens(self, campo: str) -> Dict[Any, int]:
+        """Retorna uma cópia dos contadores agregados de um campo"""
+        return dict(self._contadores[campo])
+
+    def ids_por(self, campo: str, valor: Any) -> Dict[str, None]:
+        """Retorna o conjunto (ordenado por inserção) de IDs com campo == valor"""
+        return self._indices[campo].get(valor, {})
+
+    def sequencias(self, ids: Sequence[str]) -> Dict[str, int]:
+        return {solicitacao_id: self._sequencia[solicitacao_id] for solicitacao_id in ids if solicitacao_id in self._sequencia}
+
+    def _sequencias_candidatas(self, filtros: Dict[str, Any], limit: int) -> Sequence[int]:
+        """
+        Escolhe a fonte de sequências (crescentes) mais barata para os filtros
+
+        Campos imutáveis (user_id, tipo) têm listas já em ordem de criação.
+        Para status, que muda ao longo da vida do registro, ordena o conjunto
+        do índice apenas quando ele é pequeno o bastante para sair mais barato
+        do que percorrer a ordem global descartando os demais status.
+        """
+        ordenados = [campo for campo in CAMPOS_ORDENADOS if campo in filtros]
+        if ordenados:
+            campo = min(ordenados, key=lambda c: len(self._sequencias_por[c].get(filtros[c], ())))
+            return self._sequencias_por[campo].get(filtros[campo], [])
+
+        if "status" in filtros:
+            # Ordenar custa ~len(ids); a varredura global ~limit * total / len(ids)
+            ids = self.ids_por("status", filtros["status"])
+            if len(ids) * len(ids) <= limit * len(self._registros):
+                return sorted(self._sequencia[solicitacao_id] for solicitacao_id in ids)
+
+        return range(len(self._ordem))
+
+    def listar(
+        self,
+        user_id: Optional[int] = None,
+        tipo: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+        before: Optional[str] = None,
+        after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Lista solicitações das mais recentes para as mais antigas
+
+        Args:
+            user_id, tipo, status: Filtros opcionais (ignorados quando vazios)
+            limit: Quantidade máxima de registros retornados
+            before: Retorna apenas solicitações criadas antes deste ID
+            after: Retorna apenas solicitações criadas depois deste ID
+                (as mais próximas do cursor)
+
+        Returns:
+            Lista ordenada por criação, mais recentes primeiro. Vazia se o
+            cursor informado não existir.
+        """
+        if limit <= 0:
+            return []
+
+        filtros = {
+            campo: valor
+            for campo, valor in (("user_id", user_id), ("tipo", tipo), ("status", status))
+            if valor
+        }
+        sequencias = self._sequencias_candidatas(filtros, limit)
+
+        cursor = after if after is not None else before
+        if cursor is not None:
+            posicao = self._sequencia.get(cursor)
+            if posicao is None:
+                return []
+        if after is not None:
+            posicoes = range(bisect_right(sequencias, posicao), len(sequencias))
+        elif before is not None:
+            posicoes = range(bisect_left(sequencias, posicao) - 1, -1, -1)
+        else:
+            posicoes = range(len(sequencias) - 1, -1, -1)
+
+        resultado = []
+        for indice in posicoes:
+            solicitacao_id = self._ordem[sequencias[indice]]
+            if solicitacao_id is None:
+                continue
+            solicitacao = self._registros[solicitacao_id]
+            if all(solicitacao.get(campo) == valor for campo, valor in filtros.items()):
+                resultado.append(solicitacao)
+                if len(resultado) >= limit:
+                    break
+
+        if after is not None:
+            resultado.reverse()
+        return resultado
+
+
+def criar_armazenamento(url: Optional[str]) -> RepositorioSolicitacoes:
+    """
+    Cria o repositório de solicitações a partir de uma URL no formato de DATABASE_URL
+
+    - vazio ou "memory://": em memória (histórico perdido ao reiniciar)
+    - "sqlite:///caminho.db" (relativo) ou "sqlite:////caminho/absoluto.db":
+      arquivo SQLite em modo WAL; "sqlite://" ou "sqlite:///:memory:" usa
+      um banco SQLite em memória
+    """
+    if not url or url == "memory://":
+        return ArmazenamentoSolicitacoes()
+    if url.startswith("sqlite://"):
+        from .armazenamento_sqlite import ArmazenamentoSolicitacoesSQLite
+        caminho = url[len("sqlite://"):]
+        caminho = caminho[1:] if caminho.startswith("/") else caminho
+        return ArmazenamentoSolicitacoesSQLite(caminho or ":memory:")
+    raise ValueError(f"DATABASE_URL não suportada: {url}")
@@ -0,0 +1,418 @@
+"""
+Módulo de Armazenamento SQLite - Mock ERP Application
+Repositório de solicitações persistido em SQLite (WAL, commits em lote)
+"""
+import json
+import os
+import sqlite3
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .armazenamento import CAMPOS_CONTADOS, RepositorioSolicitacoes
+
+
+# Campos com coluna própria (filtros, índices e contadores); o registro completo vai em "dados"
+COLUNAS = ("id", "user_id", "tipo", "status", "prioridade", "created_at", "updated_at")
+
+# Campos datetime do registro (gravados em ISO 8601 e reconvertidos na leitura)
+CAMPOS_DATA = ("created_at", "updated_at")
+
+ESQUEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS solicitacoes (
+        seq INTEGER PRIMARY KEY AUTOINCREMENT,
+        id TEXT NOT NULL UNIQUE,
+        user_id TEXT,
+        tipo TEXT,
+        status TEXT,
+        prioridade TEXT,
+        created_at TEXT,
+        updated_at TEXT,
+        dados TEXT NOT NULL
+    )
+    """,
+    "CREATE INDEX IF NOT EXISTS idx_solicitacoes_user_id ON solicitacoes (user_id, seq)",
+    "CREATE INDEX IF NOT EXISTS idx_solicitacoes_tipo ON solicitacoes (tipo, seq)",
+    "CREATE INDEX IF NOT EXISTS idx_solicitacoes_status ON solicitacoes (status, seq)",
+    "CREATE INDEX IF NOT EXISTS idx_solicitacoes_created_at ON solicitacoes (created_at)",
+)
+
+# SQL fixo e parametrizado: o sqlite3 guarda cada comando já compilado no cache de statements
+SQL_INSERIR = (
+    "INSERT INTO solicitacoes (id, user_id, tipo, status, prioridade, created_at, updated_at, dados) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?)"
+)
+SQL_ATUALIZAR = (
+    "UPDATE solicitacoes SET user_id = ?, tipo = ?, status = ?, prioridade = ?, "
+    "created_at = ?, updated_at = ?, dados = ? WHERE id = ?"
+)
+SQL_BUSCAR = "SELECT dados FROM solicitacoes WHERE id = ?"
+SQL_SEQUENCIA = "SELECT seq FROM solicitacoes WHERE id = ?"
+SQL_REMOVER = "DELETE FROM solicitacoes WHERE id = ?"
+# Upsert: linha existente mantém seq (ordem de criação) e recebe os valores novos
+SQL_GRAVAR = (
+    SQL_INSERIR + " ON CONFLICT (id) DO UPDATE SET user_id = excluded.user_id, tipo = excluded.tipo, "
+    "status = excluded.status, prioridade = excluded.prioridade, created_at = excluded.created_at, "
+    "updated_at = excluded.updated_at, dados = excluded.dados"
+)
+
+# IDs por comando IN (...) ao ler os valores contados de um lote (abaixo do limite de parâmetros do SQLite)
+TAMANHO_BLOCO_IDS = 500
+
+
+def _serializar_valor(valor: Any) -> Any:
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    return str(valor)
+
+
+def _coluna(valor: Any) -> Any:
+    """Valor gravado nas colunas indexadas (user_id como texto, datas em ISO)"""
+    if valor is None:
+        return None
+    if isinstance(valor, datetime):
+        return valor.isoformat()
+    return str(valor)
+
+
+class ArmazenamentoSolicitacoesSQLite(RepositorioSolicitacoes):
+    """
+    Repositório de solicitações em um arquivo SQLite
+
+    - WAL (journal_mode=WAL, synchronous=NORMAL): leitores não bloqueiam a
+      escrita e cada commit custa um append no log em vez de reescrever páginas.
+    - Comandos fixos e parametrizados, reaproveitados pelo cache de
+      statements compilados do sqlite3.
+    - Índices em id (único), user_id, tipo, status e created_at; a coluna
+      seq (autoincremento) dá a ordem de criação usada pela paginação.
+    - Commits em lote: as escritas ficam na transação aberta até somar
+      lote_commit escritas ou passar intervalo_commit segundos desde a
+      primeira pendente (verificado a cada escrita), ou até confirmar() /
+      fechar(). A mesma conexão enxerga as escritas ainda não efetivadas;
+      uma queda do processo perde no máximo esse lote.
+    - Contadores por status, tipo e prioridade carregados na abertura e
+      mantidos a cada escrita, como no repositório em memória.
+
+    O registro completo é guardado como JSON na coluna dados; as colunas
+    próprias existem para filtros, índices e contadores. A retenção roda
+    em SQL (remover_criadas_antes / remover_mais_antigas, pelos índices de
+    created_at e seq), sem carregar os registros.
+    """
+
+    registros_em_memoria = False
+
+    def __init__(
+        self,
+        caminho: str,
+        lote_commit: int = 100,
+        intervalo_commit: float = 1.0,
+        somente_leitura: bool = False
+    ):
+        self.caminho = caminho
+        self.lote_commit = lote_commit
+        self.intervalo_commit = intervalo_commit
+        if caminho != ":memory:":
+            diretorio = os.path.dirname(caminho)
+            if diretorio:
+                os.makedirs(diretorio, exist_ok=True)
+        # isolation_level=None: transações controladas aqui (BEGIN/COMMIT explícitos)
+        self._conexao = sqlite3.connect(
+            caminho,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=256
+        )
+        self._escritas_pendentes = 0
+        self._primeira_pendente = 0.0
+        self.commits = 0
+        self._contadores: Dict[str, Dict[Any, int]] = {campo: {} for campo in CAMPOS_CONTADOS}
+        self._total = 0
+        if somente_leitura:
+            # Leitor aberto por abrir_leitor(): esquema já criado, contadores ficam com quem escreve
+            self._conexao.execute("PRAGMA query_only=ON")
+            self._conexao.execute("PRAGMA temp_store=MEMORY")
+            return
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        self._conexao.execute("PRAGMA temp_store=MEMORY")
+        for comando in ESQUEMA:
+            self._conexao.execute(comando)
+        for campo, padrao in CAMPOS_CONTADOS.items():
+            for valor, total in self._conexao.execute(
+                f"SELECT COALESCE({campo}, ?), COUNT(*) FROM solicitacoes GROUP BY 1", (padrao,)
+            ):
+                self._contadores[campo][valor] = total
+        self._total = sum(self._contadores["status"].values())
+
+    # Transação em lote
+
+    def _escrever(self, sql: str, parametros: tuple) -> sqlite3.Cursor:
+        if not self._conexao.in_transaction:
+            self._conexao.execute("BEGIN")
+            self._primeira_pendente = time.monotonic()
+        cursor = self._conexao.execute(sql, parametros)
+        self._escritas_pendentes += 1
+        if (
+            self._escritas_pendentes >= self.lote_commit
+            or time.monotonic() - self._primeira_pendente >= self.intervalo_commit
+        ):
+            self.confirmar()
+        return cursor
+
+    def confirmar(self) -> None:
+        """Efetiva a transação em andamento"""
+        if self._conexao.in_transaction:
+            self._conexao.execute("COMMIT")
+            self.commits += 1
+        self._escritas_pendentes = 0
+
+    def fechar(self) -> None:
+        self.confirmar()
+        self._conexao.close()
+
+    def abrir_leitor(self) -> Optional["ArmazenamentoSolicitacoesSQLite"]:
+        """
+        Segunda conexão ao mesmo arquivo, só para leituras: com WAL ela lê o
+        último commit sem esperar uma transação em andamento nesta conexão
+        (ex.: gravar_lote numa thread). Vê apenas o que já foi efetivado.
+        Bancos em memória não são compartilháveis entre conexões (None).
+        """
+        if self.caminho == ":memory:":
+            return None
+        return ArmazenamentoSolicitacoesSQLite(self.caminho, somente_leitura=True)
+
+    # Serialização
+
+    @staticmethod
+    def _parametros(solicitacao: Dict[str, Any]) -> tuple:
+        if not isinstance(solicitacao, dict):
+            # Registro compacto (RegistroSolicitacao) vindo do repositório em memória
+            solicitacao = dict(solicitacao)
+        dados = json.dumps(solicitacao, ensure_ascii=False, default=_serializar_valor)
+        return tuple(_coluna(solicitacao.get(campo)) for campo in COLUNAS[1:]) + (dados,)
+
+    @staticmethod
+    def _carregar(dados: str) -> Dict[str, Any]:
+        solicitacao = json.loads(dados)
+        for campo in CAMPOS_DATA:
+            valor = solicitacao.get(campo)
+            if isinstance(valor, str):
+                solicitacao[campo] = datetime.fromisoformat(valor)
+        return solicitacao
+
+    def _contar(self, campo: str, valor: Any, delta: int) -> None:
+        contagem = self._contadores[campo]
+        total = contagem.get(valor, 0) + delta
+        if total > 0:
+            contagem[valor] = total
+        else:
+            contagem.pop(valor, None)
+
+    def _valor_contado(self, solicitacao: Dict[str, Any], campo: str) -> Any:
+        valor = solicitacao.get(campo)
+        return CAMPOS_CONTADOS[campo] if valor is None else valor
+
+    # Interface do repositório
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # Lê em páginas por seq, sem manter um cursor aberto entre escritas
+        ultimo = 0
+        while True:
+            linhas = self._conexao.execute(
+                "SELECT seq, dados FROM solicitacoes WHERE seq > ? ORDER BY seq LIMIT 500", (ultimo,)
+            ).fetchall()
+            if not linhas:
+                return
+            for ultimo, dados in linhas:
+                yield self._carregar(dados)
+
+    def __contains__(self, solicitacao_id: object) -> bool:
+        return self._conexao.execute(SQL_SEQUENCIA, (solicitacao_id,)).fetchone() is not None
+
+    def inserir(self, solicitacao: Dict[str, Any]) -> Dict[str, Any]:
+        parametros = (solicitacao["id"],) + self._parametros(solicitacao)
+        try:
+            self._escrever(SQL_INSERIR, parametros)
+        except sqlite3.IntegrityError:
+            raise ValueError(f"Solicitação {solicitacao['id']} já existe")
+        for campo in CAMPOS_CONTADOS:
+            self._contar(campo, self._valor_contado(solicitacao, campo), 1)
+        self._total += 1
+        return solicitacao
+
+    def buscar(self, solicitacao_id: str) -> Optional[Dict[str, Any]]:
+        linha = self._conexao.execute(SQL_BUSCAR, (solicitacao_id,)).fetchone()
+        return self._carregar(linha[0]) if linha is not None else None
+
+    def atualizar(self, solicitacao_id: str, **campos: Any) -> Optional[Dict[str, Any]]:
+        solicitacao = self.buscar(solicitacao_id)
+        if solicitacao is None:
+            return None
+
+        for campo, valor in campos.items():
+            if campo in self._contadores:
+                anterior = self._valor_contado(solicitacao, campo)
+                if anterior != valor:
+                    self._contar(campo, anterior, -1)
+                    self._contar(campo, valor, 1)
+            solicitacao[campo] = valor
+        self._escrever(SQL_ATUALIZAR, self._parametros(solicitacao) + (solicitacao_id,))
+        return solicitacao
+
+    def remover(self, solicitacao_id: str) -> Optional[Dict[str, Any]]:
+        solicitacao = self.buscar(solicitacao_id)
+        if solicitacao is None:
+            return None
+
+        self._escrever(SQL_REMOVER, (solicitacao_id,))
+        for campo in CAMPOS_CONTADOS:
+            self._contar(campo, self._valor_contado(solicitacao, campo), -1)
+        self._total -= 1
+        return solicitacao
+
+    def _valores_contados(self, ids: List[str]) -> Dict[str, Tuple]:
+        """ID -> (status, tipo, prioridade) gravados, para os IDs que existem"""
+        campos = list(CAMPOS_CONTADOS)
+        colunas = ", ".join(f"COALESCE({campo}, ?)" for campo in campos)
+        padroes = tuple(CAMPOS_CONTADOS.values())
+        valores: Dict[str, Tuple] = {}
+        for inicio in range(0, len(ids), TAMANHO_BLOCO_IDS):
+            bloco = ids[inicio:inicio + TAMANHO_BLOCO_IDS]
+            marcadores = ", ".join("?" * len(bloco))
+            for linha in self._conexao.execute(
+                f"SELECT id, {colunas} FROM solicitacoes WHERE id IN ({marcadores})", (*padroes, *bloco)
+            ):
+                valores[linha[0]] = linha[1:]
+        return valores
+
+    def gravar_lote(self, registros: Sequence[Dict[str, Any]], removidos: Sequence[str] = ()) -> None:
+        """Aplica o lote numa única transação (upsert por ID + remoções), tudo ou nada"""
+        self.confirmar()
+        anteriores = self._valores_contados([solicitacao["id"] for solicitacao in registros] + list(removidos))
+        self._conexao.execute("BEGIN")
+        try:
+            self._conexao.executemany(
+                SQL_GRAVAR, [(solicitacao["id"],) + self._parametros(solicitacao) for solicitacao in registros]
+            )
+            self._conexao.executemany(SQL_REMOVER, [(solicitacao_id,) for solicitacao_id in removidos])
+            self._conexao.execute("COMMIT")
+        except BaseException:
+            self._conexao.execute("ROLLBACK")
+            raise
+        self.commits += 1
+
+        campos = list(CAMPOS_CONTADOS)
+        for solicitacao in registros:
+            anterior = anteriores.pop(solicitacao["id"], None)
+            if anterior is None:
+                self._total += 1
+            for posicao, campo in enumerate(campos):
+                if anterior is not None:
+                    self._contar(campo, anterior[posicao], -1)
+                self._contar(campo, self._valor_contado(solicitacao, campo), 1)
+        for solicitacao_id in removidos:
+            anterior = anteriores.pop(solicitacao_id, None)
+            if anterior is None:
+                continue
+            self._total -= 1
+            for posicao, campo in enumerate(campos):
+                self._contar(campo, anterior[posicao], -1)
+
+    def contagens(self, campo: str) -> Dict[Any, int]:
+        return dict(self._contadores[campo])
+
+    def ids_por(self, campo: str, valor: Any) -> Dict[str, None]:
+        if campo not in ("user_id", "tipo", "status"):
+            raise KeyError(campo)
+        linhas = self._conexao.execute(
+            f"SELECT id FROM solicitacoes WHERE {campo} IS ? ORDER BY seq", (_coluna(valor),)
+        )
+        return {solicitacao_id: None for (solicitacao_id,) in linhas}
+
+    def sequencias(self, ids: Sequence[str]) -> Dict[str, int]:
+        ids = list(ids)
+        resultado: Dict[str, int] = {}
+        for inicio in range(0, len(ids), TAMANHO_BLOCO_IDS):
+            bloco = ids[inicio:inicio + TAMANHO_BLOCO_IDS]
+            marcadores = ", ".join("?" * len(bloco))
+            for solicitacao_id, seq in self._conexao.execute(
+                f"SELECT id, seq FROM solicitacoes WHERE id IN ({marcadores})", bloco
+            ):
+                resultado[solicitacao_id] = seq
+        return resultado
+
+    def _remover_ids(self, ids: List[str]) -> List[Dict[str, Any]]:
+        valores = self._valores_contados(ids)
+        self.gravar_lote([], ids)
+        campos = list(CAMPOS_CONTADOS)
+        return [
+            {"id": solicitacao_id, **dict(zip(campos, valores[solicitacao_id]))}
+            for solicitacao_id in ids if solicitacao_id in valores
+        ]
+
+    def remover_criadas_antes(self, limite: datetime, quantidade: int) -> List[Dict[str, Any]]:
+        linhas = self._conexao.execute(
+            "SELECT id FROM solicitacoes WHERE created_at < ? LIMIT ?", (_coluna(limite), quantidade)
+        )
+        return self._remover_ids([solicitacao_id for (solicitacao_id,) in linhas])
+
+    def remover_mais_antigas(self, quantidade: int, status: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        where = f"WHERE status IN ({', '.join('?' * len(status))}) " if status else ""
+        linhas = self._conexao.execute(
+            f"SELECT id FROM solicitacoes {where}ORDER BY seq LIMIT ?", (*(status or ()), quantidade)
+        )
+        return self._remover_ids([solicitacao_id for (solicitacao_id,) in linhas])
+
+    def listar(
+        self,
+        user_id: Optional[int] = None,
+        tipo: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+        before: Optional[str] = None,
+        after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        if limit <= 0:
+            return []
+
+        condicoes = []
+        parametros: List[Any] = []
+        for campo, valor in (("user_id", user_id), ("tipo", tipo), ("status", status)):
+            if valor:
+                condicoes.append(f"{campo} = ?")
+                parametros.append(_coluna(valor))
+
+        cursor = after if after is not None else before
+        if cursor is not None:
+            linha = self._conexao.execute(SQL_SEQUENCIA, (cursor,)).fetchone()
+            if linha is None:
+                return []
+            condicoes.append("seq > ?" if after is not None else "seq < ?")
+            parametros.append(linha[0])
+
+        # after: as mais próximas do cursor (ordem crescente), devolvidas das mais recentes para as mais antigas
+        ordem = "ASC" if after is not None else "DESC"
+        where = f"WHERE {' AND '.join(condicoes)} " if condicoes else ""
+        linhas = self._conexao.execute(
+            f"SELECT dados FROM solicitacoes {where}ORDER BY seq {ordem} LIMIT ?",
+            (*parametros, limit)
+        ).fetchall()
+
+        resultado = [self._carregar(dados) for (dados,) in linhas]
+        if after is not None:
+            resultado.reverse()
+        return resultado
+
+    def descricao(self) -> Dict[str, Any]:
+        return {
+            "backend": "sqlite",
+            "caminho": self.caminho,
+            "lote_commit": self.lote_commit,
+            "intervalo_commit": self.intervalo_commit,
+            "escritas_pendentes": self._escritas_pendentes,
+            "commits": self.commits
+        }
@@ -0,0 +1,109 @@
+"""
+Módulo de Cache - Mock ERP Application
+Cache em memória com limite de tamanho (LRU) e expiração por tempo (TTL)
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class CacheLRU:
+    """
+    Cache LRU com TTL opcional
+
+    Os itens mais antigos em uso são descartados quando o limite de itens é
+    atingido, e itens expirados são tratados como ausentes. Mantém contadores
+    de acertos, falhas, descartes e expirações.
+
+    `ao_descartar(chave, valor)`, se informado, é chamado sempre que um item
+    sai do cache por descarte LRU, expiração ou remover() (não em limpar()).
+    """
+
+    def __init__(
+        self,
+        max_itens: int = 1024,
+        ttl: Optional[float] = None,
+        ao_descartar: Optional[Callable[[Hashable, Any], None]] = None
+    ):
+        self.max_itens = max_itens
+        self.ttl = ttl
+        self.ao_descartar = ao_descartar
+        self._itens: "OrderedDict[Hashable, Tuple[Optional[float], Any]]" = OrderedDict()
+        self.acertos = 0
+        self.falhas = 0
+        self.descartes = 0
+        self.expiracoes = 0
+
+    def __len__(self) -> int:
+        return len(self._itens)
+
+    def __contains__(self, chave: Hashable) -> bool:
+        item = self._itens.get(chave)
+        return item is not None and not self._expirado(item[0])
+
+    @staticmethod
+    def _expirado(expira_em: Optional[float]) -> bool:
+        return expira_em is not None and expira_em <= time.monotonic()
+
+    def obter(self, chave: Hashable, padrao: Any = None) -> Any:
+        """Retorna o valor em cache (renovando sua posição LRU) ou o padrão"""
+        item = self._itens.get(chave)
+        if item is None:
+            self.falhas += 1
+            return padrao
+        if self._expirado(item[0]):
+            del self._itens[chave]
+            self.expiracoes += 1
+            self.falhas += 1
+            if self.ao_descartar is not None:
+                self.ao_descartar(chave, item[1])
+            return padrao
+
+        self._itens.move_to_end(chave)
+        self.acertos += 1
+        return item[1]
+
+    def espiar(self, chave: Hashable, padrao: Any = None) -> Any:
+        """Retorna o valor sem renovar a posição LRU nem afetar os contadores"""
+        item = self._itens.get(chave)
+        if item is None or self._expirado(item[0]):
+            return padrao
+        return item[1]
+
+    def definir(self, chave: Hashable, valor: Any, ttl: Optional[float] = None) -> None:
+        """Armazena um valor; ttl sobrescreve o TTL padrão do cache"""
+        ttl = self.ttl if ttl is None else ttl
+        expira_em = time.monotonic() + ttl if ttl is not None else None
+        self._itens[chave] = (expira_em, valor)
+        self._itens.move_to_end(chave)
+        while len(self._itens) > self.max_itens:
+            descartada, (_, descartado) = self._itens.popitem(last=False)
+            self.descartes += 1
+            if self.ao_descartar is not None:
+                self.ao_descartar(descartada, descartado)
+
+    def remover(self, chave: Hashable) -> bool:
+        """Remove uma chave do cache; retorna True se ela existia"""
+        item = self._itens.pop(chave, None)
+        if item is None:
+            return False
+        if self.ao_descartar is not None:
+            self.ao_descartar(chave, item[1])
+        return True
+
+    def limpar(self) -> None:
+        self._itens.clear()
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Retorna tamanho e contadores do cache"""
+        consultas = self.acertos + self.falhas
+        return {
+            "itens": len(self._itens),
+            "max_itens": self.max_itens,
+            "ttl": self.ttl,
+            "acertos": self.acertos,
+            "falhas": self.falhas,
+            "descartes": self.descartes,
+            "expiracoes": self.expiracoes,
+            "taxa_acerto": self.acertos / consultas if consultas else 0.0
+        }
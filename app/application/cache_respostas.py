@@ -0,0 +1,146 @@
+"""
+Módulo de Cache de Respostas - Mock ERP Application
+Cache das respostas do assistente de IA por chave semântica da pergunta
+"""
+import os
+import re
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from .cache import CacheLRU
+
+
+_PONTUACAO_FINAL = re.compile(r'[\s?!.,;:]+$')
+
+
+def normalizar_pergunta(pergunta: str) -> str:
+    """
+    Normaliza a pergunta para a chave do cache
+
+    Minúsculas, espaços colapsados e sem pontuação final, de modo que
+    "Onde fica o campo CNPJ?" e "onde fica  o campo cnpj" caiam na mesma chave.
+    """
+    return _PONTUACAO_FINAL.sub("", " ".join(pergunta.lower().split()))
+
+
+class CacheRespostasAssistente:
+    """
+    Cache das respostas bem-sucedidas do assistente de IA
+
+    A chave combina a pergunta normalizada com tudo o que vai no payload além
+    dela: usuário, descrição do contexto (que já traz o campo relevante do
+    formulário, ex.: nome do cliente), tipo de módulo e tela atual. Uma
+    avaliação baixa no feedback remove a resposta avaliada do cache, para que
+    a próxima pergunta igual volte ao assistente.
+
+    Todo ID que recebeu a resposta (o da IA, o da solicitação local de quem
+    a gerou, de quem compartilhou a chamada e de cada acerto do cache) fica
+    associado à chave, então a avaliação de qualquer um deles invalida a
+    resposta. As associações de uma chave somem quando ela sai do cache.
+    """
+
+    def __init__(self, ttl: float = 300.0, max_itens: int = 1024, avaliacao_minima: int = 3):
+        self.cache = CacheLRU(max_itens=max_itens, ttl=ttl, ao_descartar=self._esquecer)
+        self.avaliacao_minima = avaliacao_minima
+        # ID de solicitação (IA ou local) -> chave do cache, e o inverso (para invalidar pelo feedback)
+        self._chaves_por_solicitacao: Dict[str, Hashable] = {}
+        self._solicitacoes_por_chave: Dict[Hashable, Dict[str, None]] = {}
+        self.tokens_economizados = 0
+        self.invalidacoes = 0
+
+    def configurar(self) -> None:
+        """Aplica TTL, tamanho e avaliação mínima definidos no ambiente"""
+        self.cache.ttl = float(os.getenv("RESPOSTA_CACHE_TTL", self.cache.ttl))
+        self.cache.max_itens = int(os.getenv("RESPOSTA_CACHE_MAX", self.cache.max_itens))
+        self.avaliacao_minima = int(os.getenv("RESPOSTA_CACHE_AVALIACAO_MINIMA", self.avaliacao_minima))
+        self.limpar()
+
+    @property
+    def ativo(self) -> bool:
+        return self.cache.max_itens > 0 and self.cache.ttl != 0
+
+    @staticmethod
+    def chave(
+        pergunta: str,
+        usuario_id: Optional[str],
+        contexto_descricao: str,
+        module_type: str,
+        tela_atual: str
+    ) -> Tuple:
+        return (normalizar_pergunta(pergunta), usuario_id, contexto_descricao, module_type, tela_atual)
+
+    def obter(self, chave: Hashable) -> Optional[Dict[str, Any]]:
+        """Retorna a resposta em cache (contabilizando os tokens economizados) ou None"""
+        if not self.ativo:
+            return None
+        resposta = self.cache.obter(chave)
+        if resposta is not None:
+            self.tokens_economizados += resposta.get("tokens_used") or 0
+        return resposta
+
+    def armazenar(self, chave: Hashable, resposta: Dict[str, Any], *solicitacao_ids: Optional[str]) -> None:
+        """
+        Guarda uma resposta bem-sucedida; ela não deve ser modificada depois
+
+        O local_id da resposta e os `solicitacao_ids` informados (ex.: a
+        solicitação local) passam a invalidar a resposta pelo feedback.
+        """
+        if not self.ativo:
+            return
+        if chave not in self.cache:
+            # Associações de uma resposta anterior já expirada, ainda não descartada
+            self._esquecer(chave)
+        self.cache.definir(chave, resposta)
+        self.associar(chave, resposta.get("local_id"), *solicitacao_ids)
+
+    def associar(self, chave: Hashable, *solicitacao_ids: Optional[str]) -> None:
+        """Associa solicitações que receberam a resposta em cache da chave (ex.: acertos do cache)"""
+        if chave not in self.cache:
+            return
+        associadas = self._solicitacoes_por_chave.setdefault(chave, {})
+        for solicitacao_id in solicitacao_ids:
+            if not solicitacao_id:
+                continue
+            anterior = self._chaves_por_solicitacao.get(solicitacao_id)
+            if anterior is not None and anterior != chave:
+                self._solicitacoes_por_chave.get(anterior, {}).pop(solicitacao_id, None)
+            self._chaves_por_solicitacao[solicitacao_id] = chave
+            associadas[solicitacao_id] = None
+
+    def _esquecer(self, chave: Hashable, resposta: Any = None) -> None:
+        """Desfaz as associações de uma chave que saiu do cache"""
+        for solicitacao_id in self._solicitacoes_por_chave.pop(chave, ()):
+            self._chaves_por_solicitacao.pop(solicitacao_id, None)
+
+    def registrar_avaliacao(self, solicitacao_id: str, avaliacao: int) -> bool:
+        """
+        Invalida a resposta da solicitação se a avaliação for baixa
+
+        Returns:
+            True se uma resposta foi removida do cache
+        """
+        if avaliacao >= self.avaliacao_minima:
+            return False
+        chave = self._chaves_por_solicitacao.get(solicitacao_id)
+        if chave is None:
+            return False
+        if not self.cache.remover(chave):
+            self._esquecer(chave)
+            return False
+        self.invalidacoes += 1
+        return True
+
+    def limpar(self) -> None:
+        self.cache.limpar()
+        self._chaves_por_solicitacao.clear()
+        self._solicitacoes_por_chave.clear()
+
+    def estatisticas(self) -> Dict[str, Any]:
+        estatisticas = self.cache.estatisticas()
+        estatisticas["tokens_economizados"] = self.tokens_economizados
+        estatisticas["invalidacoes"] = self.invalidacoes
+        estatisticas["avaliacao_minima"] = self.avaliacao_minima
+        return estatisticas
+
+
+# Cache compartilhado de respostas (configurado no lifespan via RESPOSTA_CACHE_*)
+cache_respostas = CacheRespostasAssistente()
@@ -0,0 +1,139 @@
+"""
+Módulo Classificador - Mock ERP Application
+Classificação por palavras-chave compilada uma única vez
+"""
+import re
+from typing import Dict, FrozenSet, Hashable, Iterable, List, Optional, Set, Tuple
+
+
+# Limite de tokens distintos memorizados antes de reiniciar a memória
+MAX_TOKENS_MEMORIZADOS = 65536
+
+
+def _regex_trie(frases: Iterable[str]) -> str:
+    """
+    Monta uma regex em forma de trie para as frases informadas
+
+    Prefixos comuns são fatorados e os ramos partem sempre de caracteres
+    distintos, então em cada posição a regex casa a frase mais longa possível.
+    """
+    trie: Dict[str, dict] = {}
+    for frase in frases:
+        no = trie
+        for caractere in frase:
+            no = no.setdefault(caractere, {})
+        no[""] = {}
+
+    def emitir(no: Dict[str, dict]) -> str:
+        ramos = [re.escape(caractere) + emitir(filho) for caractere, filho in sorted(no.items()) if caractere]
+        if not ramos:
+            return ""
+        corpo = ramos[0] if len(ramos) == 1 else "(?:" + "|".join(ramos) + ")"
+        if "" in no:
+            return f"(?:{corpo})?"
+        return corpo
+
+    return emitir(trie)
+
+
+class ClassificadorPalavras:
+    """
+    Classificador de texto por frases-chave
+
+    Equivale a testar `frase in texto` para cada frase de cada rótulo, mas as
+    frases são compiladas uma única vez:
+
+    - Frases sem espaço viram uma regex em trie aplicada em lookahead, que
+      acha a frase mais longa começando em cada posição. Cada frase carrega
+      também os rótulos das frases contidas nela, então sobreposições não se
+      perdem. Como uma frase sem espaço só pode ocorrer dentro de um token,
+      o texto é quebrado por espaços uma vez e o resultado de cada token
+      distinto é memorizado: tokens repetidos ("onde", "campo", "cnpj")
+      custam uma consulta a dict.
+    - Frases com espaço ("nota fiscal", "como fazer") são testadas
+      diretamente no texto.
+    """
+
+    def __init__(self, rotulos: Dict[Hashable, Iterable[str]]):
+        self.ordem: List[Hashable] = list(rotulos)
+        self._prioridade = {rotulo: indice for indice, rotulo in enumerate(self.ordem)}
+
+        rotulos_por_frase: Dict[str, Set[Hashable]] = {}
+        for rotulo, frases in rotulos.items():
+            for frase in frases:
+                rotulos_por_frase.setdefault(frase, set()).add(rotulo)
+
+        # split() == [frase] vale apenas para frases sem nenhum espaço em branco
+        simples = {frase: rotulos for frase, rotulos in rotulos_por_frase.items() if frase.split() == [frase]}
+        self._frases_compostas: List[Tuple[str, FrozenSet[Hashable], int]] = sorted(
+            (
+                (frase, frozenset(rotulos), min(self._prioridade[r] for r in rotulos))
+                for frase, rotulos in rotulos_por_frase.items() if frase not in simples
+            ),
+            key=lambda item: item[2]
+        )
+
+        # Fecho por substring: quem casa "relatórios" também contém "relatório"
+        self._rotulos_por_frase: Dict[str, FrozenSet[Hashable]] = {}
+        for frase in simples:
+            contidos: Set[Hashable] = set()
+            for outra, rotulos_outra in simples.items():
+                if outra in frase:
+                    contidos |= rotulos_outra
+            self._rotulos_por_frase[frase] = frozenset(contidos)
+
+        self._regex = re.compile("(?=(" + _regex_trie(simples) + "))") if simples else None
+        # token -> (rótulos presentes, prioridade do melhor rótulo)
+        self._memoria: Dict[str, Tuple[FrozenSet[Hashable], int]] = {}
+
+    def _analisar_token(self, token: str) -> Tuple[FrozenSet[Hashable], int]:
+        resultado = self._memoria.get(token)
+        if resultado is None:
+            encontrados: Set[Hashable] = set()
+            if self._regex is not None:
+                for frase in self._regex.findall(token):
+                    encontrados |= self._rotulos_por_frase[frase]
+            prioridade = min((self._prioridade[r] for r in encontrados), default=len(self.ordem))
+            resultado = (frozenset(encontrados), prioridade)
+            if len(self._memoria) >= MAX_TOKENS_MEMORIZADOS:
+                self._memoria.clear()
+            self._memoria[token] = resultado
+        return resultado
+
+    def rotulos_presentes(self, texto: str) -> Set[Hashable]:
+        """Retorna todos os rótulos com ao menos uma frase contida no texto"""
+        presentes: Set[Hashable] = set()
+        for token in set(texto.split()):
+            presentes |= self._analisar_token(token)[0]
+        for frase, rotulos, _ in self._frases_compostas:
+            if frase in texto:
+                presentes |= rotulos
+        return presentes
+
+    def ordenar(self, rotulos: Iterable[Hashable]) -> List[Hashable]:
+        """Ordena rótulos na ordem de definição"""
+        return sorted(rotulos, key=self._prioridade.__getitem__)
+
+    def primeiro_rotulo(self, texto: str, entre: Optional[int] = None) -> Optional[Hashable]:
+        """
+        Retorna o primeiro rótulo (na ordem de definição) presente no texto
+
+        Interrompe a análise assim que encontra o rótulo de maior prioridade
+        e só testa frases compostas que ainda poderiam superar o melhor atual.
+        `entre` restringe a busca aos N primeiros rótulos.
+        """
+        limite = len(self.ordem) if entre is None else min(entre, len(self.ordem))
+        melhor = limite
+        for token in texto.split():
+            prioridade = self._analisar_token(token)[1]
+            if prioridade < melhor:
+                melhor = prioridade
+                if melhor == 0:
+                    break
+        for frase, _, prioridade in self._frases_compostas:
+            if prioridade >= melhor:
+                break
+            if frase in texto:
+                melhor = prioridade
+                break
+        return self.ordem[melhor] if melhor < limite else None
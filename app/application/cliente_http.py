@@ -0,0 +1,141 @@
+"""
+Módulo de Cliente HTTP - Mock ERP Application
+Cliente httpx compartilhado, com pool de conexões, para o assistente de IA
+"""
+import asyncio
+import os
+from typing import Optional
+
+import httpx
+
+
+def _env_int(nome: str, padrao: int) -> int:
+    valor = os.getenv(nome)
+    return int(valor) if valor else padrao
+
+
+def _env_float(nome: str, padrao: float) -> float:
+    valor = os.getenv(nome)
+    return float(valor) if valor else padrao
+
+
+def _http2_disponivel() -> bool:
+    """HTTP/2 no httpx depende do pacote opcional h2"""
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+def criar_cliente_http(prefixo: str = "ASSISTENTE_IA") -> httpx.AsyncClient:
+    """
+    Cria um AsyncClient com pool, keep-alive e timeouts configuráveis
+
+    As configurações são lidas do ambiente no momento da criação, usando o
+    prefixo informado (ex.: ASSISTENTE_IA_MAX_CONEXOES, ASSISTENTE_IA_READ_TIMEOUT).
+    """
+    limites = httpx.Limits(
+        max_connections=_env_int(f"{prefixo}_MAX_CONEXOES", 100),
+        max_keepalive_connections=_env_int(f"{prefixo}_MAX_KEEPALIVE", 20),
+        keepalive_expiry=_env_float(f"{prefixo}_KEEPALIVE_EXPIRY", 30.0)
+    )
+    timeout = httpx.Timeout(
+        connect=_env_float(f"{prefixo}_CONNECT_TIMEOUT", 5.0),
+        read=_env_float(f"{prefixo}_READ_TIMEOUT", 60.0),
+        write=_env_float(f"{prefixo}_WRITE_TIMEOUT", 10.0),
+        pool=_env_float(f"{prefixo}_POOL_TIMEOUT", 10.0)
+    )
+
+    http2 = os.getenv(f"{prefixo}_HTTP2", "False").lower() == "true"
+    if http2 and not _http2_disponivel():
+        print(f"⚠️ {prefixo}_HTTP2 ativo, mas o pacote 'h2' não está instalado. Usando HTTP/1.1.")
+        http2 = False
+
+    return httpx.AsyncClient(
+        limits=limites,
+        timeout=timeout,
+        http2=http2,
+        headers={"User-Agent": "MockERP/1.0"}
+    )
+
+
+class ClienteHttpCompartilhado:
+    """
+    Mantém um AsyncClient compartilhado por event loop
+
+    O cliente é criado/fechado no lifespan da aplicação. Se a aplicação não
+    passou pelo lifespan (scripts, versão síncrona), obter() cria um cliente
+    para o loop atual, que deve ser fechado com fechar() antes de o loop
+    terminar. Um cliente aberto pertence ao seu loop: obter() em outro loop
+    levanta RuntimeError enquanto o loop dono ainda existe, em vez de trocar
+    o cliente e deixar as conexões do anterior abertas.
+    """
+
+    def __init__(self, prefixo: str):
+        self.prefixo = prefixo
+        self._cliente: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def iniciar(self) -> httpx.AsyncClient:
+        """Cria o cliente compartilhado no loop atual"""
+        await self.fechar()
+        self._cliente = criar_cliente_http(self.prefixo)
+        self._loop = asyncio.get_running_loop()
+        return self._cliente
+
+    async def fechar(self) -> None:
+        """Fecha o cliente compartilhado, liberando as conexões do pool"""
+        if self._cliente is not None and not self._cliente.is_closed:
+            self._verificar_loop(asyncio.get_running_loop())
+            await self._cliente.aclose()
+        self._cliente = None
+        self._loop = None
+
+    def obter(self) -> httpx.AsyncClient:
+        """Retorna o cliente compartilhado, criando-o para o loop atual se preciso"""
+        loop = asyncio.get_running_loop()
+        if self._cliente is not None and not self._cliente.is_closed:
+            self._verificar_loop(loop)
+        if self._cliente is None or self._cliente.is_closed:
+            self._cliente = criar_cliente_http(self.prefixo)
+            self._loop = loop
+        return self._cliente
+
+    def _verificar_loop(self, loop: asyncio.AbstractEventLoop) -> None:
+        """
+        Levanta RuntimeError se o cliente aberto é de outro loop ainda existente
+
+        As conexões do pool só podem ser fechadas (aclose) no loop dono. Se ele
+        já foi encerrado sem fechar(), não há mais como fechá-las: o cliente é
+        descartado com um aviso.
+        """
+        if self._loop is loop:
+            return
+        if self._loop is not None and not self._loop.is_closed():
+            raise RuntimeError(
+                f"Cliente HTTP {self.prefixo} aberto em outro event loop; "
+                f"chame fechar() naquele loop antes de usá-lo neste"
+            )
+        print(f"⚠️ Cliente HTTP {self.prefixo} não foi fechado antes do fim do seu event loop; descartado")
+        self._cliente = None
+        self._loop = None
+
+
+# Cliente compartilhado do assistente de IA (criado/fechado no lifespan da aplicação)
+_cliente_assistente = ClienteHttpCompartilhado("ASSISTENTE_IA")
+
+
+async def iniciar_cliente_assistente() -> httpx.AsyncClient:
+    """Cria o cliente compartilhado do assistente de IA no loop atual"""
+    return await _cliente_assistente.iniciar()
+
+
+async def fechar_cliente_assistente() -> None:
+    """Fecha o cliente compartilhado do assistente de IA"""
+    await _cliente_assistente.fechar()
+
+
+def obter_cliente_assistente() -> httpx.AsyncClient:
+    """Retorna o cliente compartilhado do assistente de IA"""
+    return _cliente_assistente.obter()
@@ -0,0 +1,179 @@
+"""
+Módulo de Concorrência - Mock ERP Application
+Primitivas assíncronas para chamadas a serviços externos
+"""
+import asyncio
+import os
+import statistics
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, Dict, Hashable, Optional
+
+
+class ColapsadorRequisicoes:
+    """
+    Agrupa chamadas idênticas em andamento (single-flight)
+
+    Enquanto a primeira chamada para uma chave está em andamento, chamadas
+    concorrentes com a mesma chave aguardam o mesmo resultado em vez de
+    disparar uma nova requisição. O cancelamento de um chamador não cancela
+    a requisição compartilhada com os demais.
+    """
+
+    def __init__(self):
+        self._em_andamento: Dict[Hashable, asyncio.Future] = {}
+        self.compartilhadas = 0
+
+    def __len__(self) -> int:
+        return len(self._em_andamento)
+
+    async def executar(self, chave: Hashable, fabrica: Callable[[], Awaitable[Any]]) -> Any:
+        """Executa fabrica() uma única vez por chave entre chamadas concorrentes"""
+        tarefa = self._em_andamento.get(chave)
+        if tarefa is None:
+            tarefa = asyncio.ensure_future(fabrica())
+            self._em_andamento[chave] = tarefa
+            tarefa.add_done_callback(lambda concluida: self._finalizar(chave, concluida))
+        else:
+            self.compartilhadas += 1
+        return await asyncio.shield(tarefa)
+
+    def _finalizar(self, chave: Hashable, tarefa: asyncio.Future) -> None:
+        if self._em_andamento.get(chave) is tarefa:
+            del self._em_andamento[chave]
+        # Marca a exceção como consumida mesmo se todos os chamadores desistiram
+        if not tarefa.cancelled():
+            tarefa.exception()
+
+
+class LimitadorPorChave:
+    """Limita chamadas simultâneas por chave (ex.: host de destino)"""
+
+    def __init__(self, limite: int):
+        self.limite = limite
+        self._semaforos: Dict[Hashable, asyncio.Semaphore] = {}
+
+    def __call__(self, chave: Hashable) -> asyncio.Semaphore:
+        semaforo = self._semaforos.get(chave)
+        if semaforo is None:
+            semaforo = self._semaforos[chave] = asyncio.Semaphore(self.limite)
+        return semaforo
+
+
+class FilaCheia(Exception):
+    """Chamada rejeitada pela antepara (fila de espera cheia ou espera esgotada)"""
+
+
+class Antepara:
+    """
+    Antepara (bulkhead) para chamadas a um serviço externo
+
+    Limita as chamadas simultâneas a um endpoint e mantém uma fila de espera
+    limitada. Quando a fila está cheia, ou a espera passa de timeout_fila,
+    a chamada falha imediatamente com FilaCheia em vez de se acumular até o
+    timeout do serviço. Exporta profundidade da fila e tempos de espera.
+
+    Uso:
+        async with antepara:
+            await client.post(...)
+    """
+
+    def __init__(
+        self,
+        prefixo: str,
+        max_concorrentes: int = 20,
+        max_fila: int = 100,
+        timeout_fila: Optional[float] = 10.0,
+        tamanho_historico: int = 500
+    ):
+        self.prefixo = prefixo
+        self.max_concorrentes = max_concorrentes
+        self.max_fila = max_fila
+        self.timeout_fila = timeout_fila
+        self._semaforo = asyncio.Semaphore(max_concorrentes)
+        self._esperas: Deque[float] = deque(maxlen=tamanho_historico)
+        self.em_execucao = 0
+        self.em_espera = 0
+        self.maior_fila = 0
+        self.admitidas = 0
+        self.rejeitadas = 0
+        self.esperas_esgotadas = 0
+
+    def configurar(self) -> None:
+        """Aplica os limites {prefixo}_MAX_CONCORRENTES, _MAX_FILA e _TIMEOUT_FILA do ambiente"""
+        self.max_concorrentes = int(os.getenv(f"{self.prefixo}_MAX_CONCORRENTES", self.max_concorrentes))
+        self.max_fila = int(os.getenv(f"{self.prefixo}_MAX_FILA", self.max_fila))
+        timeout = os.getenv(f"{self.prefixo}_TIMEOUT_FILA")
+        if timeout is not None:
+            self.timeout_fila = float(timeout) if timeout else None
+        # Só deve ser chamado sem chamadas em andamento (ex.: no startup)
+        self._semaforo = asyncio.Semaphore(self.max_concorrentes)
+
+    async def __aenter__(self) -> "Antepara":
+        inicio = time.perf_counter()
+        if not self._semaforo.locked():
+            # Há vaga: acquire() retorna sem suspender
+            await self._semaforo.acquire()
+        elif self.em_espera >= self.max_fila:
+            self.rejeitadas += 1
+            raise FilaCheia(f"{self.prefixo}: fila de espera cheia ({self.max_fila})")
+        else:
+            self.em_espera += 1
+            self.maior_fila = max(self.maior_fila, self.em_espera)
+            try:
+                if self.timeout_fila is None:
+                    await self._semaforo.acquire()
+                elif not await self._adquirir_com_timeout(self.timeout_fila):
+                    self.esperas_esgotadas += 1
+                    raise FilaCheia(f"{self.prefixo}: espera na fila excedeu {self.timeout_fila}s")
+            finally:
+                self.em_espera -= 1
+
+        self._esperas.append(time.perf_counter() - inicio)
+        self.admitidas += 1
+        self.em_execucao += 1
+        return self
+
+    async def _adquirir_com_timeout(self, timeout: float) -> bool:
+        """
+        acquire() do semáforo com limite de espera; False se o tempo esgotar
+
+        Não usa wait_for: no 3.11 ele pode levantar TimeoutError com o
+        acquire() já concluído, e a vaga nunca seria devolvida. Com
+        asyncio.timeout o cancelamento chega dentro do próprio acquire(),
+        que devolve a vaga se já tinha sido acordado.
+        """
+        try:
+            async with asyncio.timeout(timeout):
+                await self._semaforo.acquire()
+        except TimeoutError:
+            return False
+        return True
+
+    async def __aexit__(self, *excecao) -> None:
+        self.em_execucao -= 1
+        self._semaforo.release()
+
+    def estatisticas(self) -> Dict[str, Any]:
+        """Limites, ocupação atual, rejeições e tempos de espera na fila (segundos)"""
+        estatisticas: Dict[str, Any] = {
+            "max_concorrentes": self.max_concorrentes,
+            "max_fila": self.max_fila,
+            "timeout_fila": self.timeout_fila,
+            "em_execucao": self.em_execucao,
+            "em_espera": self.em_espera,
+            "maior_fila": self.maior_fila,
+            "admitidas": self.admitidas,
+            "rejeitadas": self.rejeitadas,
+            "esperas_esgotadas": self.esperas_esgotadas
+        }
+        if self._esperas:
+            esperas = sorted(self._esperas)
+            estatisticas["espera"] = {
+                "amostras": len(esperas),
+                "media": statistics.fmean(esperas),
+                "p50": esperas[len(esperas) // 2],
+                "p95": esperas[min(len(esperas) - 1, int(len(esperas) * 0.95))],
+                "max": esperas[-1]
+            }
+        return estatisticas
@@ -0,0 +1,179 @@
+"""
+Módulo Disjuntor - Mock ERP Application
+Circuit breaker para a integração com o assistente de IA
+"""
+import asyncio
+import os
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple
+
+from .saude_assistente import monitor_saude_assistente
+
+
+FECHADO = "fechado"
+ABERTO = "aberto"
+SEMIABERTO = "semiaberto"
+
+
+class DisjuntorCircuito:
+    """
+    Disjuntor (circuit breaker) com estados fechado, aberto e semiaberto
+
+    - Fechado: chamadas passam; o resultado e a latência de cada uma entram
+      em uma janela deslizante. Abre quando, com ao menos min_chamadas na
+      janela, a taxa de falhas ou a taxa de chamadas lentas passa do limite.
+    - Aberto: chamadas são recusadas na hora (sem rede) até tempo_aberto.
+    - Semiaberto: passado tempo_aberto, a próxima chamada dispara uma sonda
+      em segundo plano (o mesmo health check do monitor de saúde) e continua
+      recusada. Sonda saudável fecha o circuito; falha reabre.
+    """
+
+    def __init__(
+        self,
+        prefixo: str,
+        sonda: Callable[[], Awaitable[bool]],
+        janela: int = 20,
+        min_chamadas: int = 10,
+        taxa_falha: float = 0.5,
+        latencia_lenta: float = 10.0,
+        taxa_lentas: float = 0.8,
+        tempo_aberto: float = 30.0
+    ):
+        self.prefixo = prefixo
+        self._sonda = sonda
+        self.min_chamadas = min_chamadas
+        self.taxa_falha = taxa_falha
+        self.latencia_lenta = latencia_lenta
+        self.taxa_lentas = taxa_lentas
+        self.tempo_aberto = tempo_aberto
+        # (sucesso, latência em segundos) das chamadas recentes
+        self._janela: Deque[Tuple[bool, float]] = deque(maxlen=janela)
+        self.estado = FECHADO
+        self._desde = datetime.now()
+        self._reabre_em = 0.0
+        self._tarefa_sonda: Optional[asyncio.Task] = None
+        self._ultima_sonda: Optional[Dict[str, Any]] = None
+        self.aberturas = 0
+        self.recusadas = 0
+
+    def configurar(self) -> None:
+        """Aplica os parâmetros {prefixo}_DISJUNTOR_* definidos no ambiente"""
+        p = f"{self.prefixo}_DISJUNTOR"
+        self._janela = deque(self._janela, maxlen=int(os.getenv(f"{p}_JANELA", self._janela.maxlen)))
+        self.min_chamadas = int(os.getenv(f"{p}_MIN_CHAMADAS", self.min_chamadas))
+        self.taxa_falha = float(os.getenv(f"{p}_TAXA_FALHA", self.taxa_falha))
+        self.latencia_lenta = float(os.getenv(f"{p}_LATENCIA_LENTA", self.latencia_lenta))
+        self.taxa_lentas = float(os.getenv(f"{p}_TAXA_LENTAS", self.taxa_lentas))
+        self.tempo_aberto = float(os.getenv(f"{p}_TEMPO_ABERTO", self.tempo_aberto))
+
+    def _mudar_estado(self, estado: str) -> None:
+        if estado != self.estado:
+            print(f"🔌 Disjuntor {self.prefixo}: {self.estado} -> {estado}")
+            self.estado = estado
+            self._desde = datetime.now()
+
+    def _abrir(self) -> None:
+        if self.estado != ABERTO:
+            self.aberturas += 1
+        self._mudar_estado(ABERTO)
+        self._reabre_em = time.monotonic() + self.tempo_aberto
+
+    def _fechar(self) -> None:
+        self._janela.clear()
+        self._mudar_estado(FECHADO)
+
+    def permitir(self) -> bool:
+        """
+        Indica se uma chamada pode seguir para o serviço
+
+        Não faz I/O: com o circuito aberto a resposta é imediata. Ao fim do
+        tempo aberto, agenda a sonda de saúde e passa para semiaberto.
+        """
+        if self.estado == FECHADO:
+            return True
+
+        if self.estado == ABERTO and time.monotonic() >= self._reabre_em:
+            self._mudar_estado(SEMIABERTO)
+            self._tarefa_sonda = asyncio.create_task(self._sondar())
+
+        self.recusadas += 1
+        return False
+
+    async def _sondar(self) -> None:
+        try:
+            saudavel = await self._sonda()
+        except Exception as e:
+            print(f"❌ Erro na sonda do disjuntor {self.prefixo}: {e}")
+            saudavel = False
+        self._ultima_sonda = {"saudavel": saudavel, "em": datetime.now().isoformat()}
+        if self.estado != SEMIABERTO:
+            return
+        if saudavel:
+            self._fechar()
+        else:
+            self._abrir()
+
+    def registrar(self, sucesso: bool, latencia: float) -> None:
+        """Registra o resultado de uma chamada ao serviço e abre o circuito se preciso"""
+        if self.estado != FECHADO:
+            return
+        self._janela.append((sucesso, latencia))
+        if len(self._janela) < self.min_chamadas:
+            return
+        taxa_falha, taxa_lentas = self._taxas()
+        if taxa_falha >= self.taxa_falha or taxa_lentas >= self.taxa_lentas:
+            self._abrir()
+
+    def _taxas(self) -> Tuple[float, float]:
+        if not self._janela:
+            return 0.0, 0.0
+        falhas = sum(1 for sucesso, _ in self._janela if not sucesso)
+        lentas = sum(1 for _, latencia in self._janela if latencia >= self.latencia_lenta)
+        return falhas / len(self._janela), lentas / len(self._janela)
+
+    def estado_atual(self) -> Dict[str, Any]:
+        """Estado, taxas da janela e contadores do disjuntor"""
+        taxa_falha, taxa_lentas = self._taxas()
+        return {
+            "estado": self.estado,
+            "desde": self._desde.isoformat(),
+            "reabre_em": max(0.0, self._reabre_em - time.monotonic()) if self.estado == ABERTO else None,
+            "janela": {
+                "chamadas": len(self._janela),
+                "tamanho": self._janela.maxlen,
+                "taxa_falha": taxa_falha,
+                "taxa_lentas": taxa_lentas
+            },
+            "limites": {
+                "min_chamadas": self.min_chamadas,
+                "taxa_falha": self.taxa_falha,
+                "latencia_lenta": self.latencia_lenta,
+                "taxa_lentas": self.taxa_lentas,
+                "tempo_aberto": self.tempo_aberto
+            },
+            "aberturas": self.aberturas,
+            "recusadas": self.recusadas,
+            "ultima_sonda": self._ultima_sonda
+        }
+
+    async def parar(self) -> None:
+        """Cancela uma sonda em andamento"""
+        if self._tarefa_sonda is None or self._tarefa_sonda.done():
+            return
+        self._tarefa_sonda.cancel()
+        try:
+            await self._tarefa_sonda
+        except asyncio.CancelledError:
+            pass
+
+
+async def _sondar_assistente() -> bool:
+    """Sonda do semiaberto: o mesmo health check do monitor de saúde"""
+    resultado = await monitor_saude_assistente.sondar()
+    return bool(resultado.get("available"))
+
+
+# Disjuntor das chamadas ao assistente de IA (configurado no lifespan via ASSISTENTE_IA_DISJUNTOR_*)
+disjuntor_assistente = DisjuntorCircuito("ASSISTENTE_IA", sonda=_sondar_assistente)
@@ -0,0 +1,530 @@
+"""
+Módulo de Escrita Adiada - Mock ERP Application
+Repositório write-behind: escritas acumuladas em memória e gravadas em lote
+"""
+import asyncio
+import threading
+import time
+from contextlib import contextmanager
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .armazenamento import CAMPOS_CONTADOS, RepositorioSolicitacoes
+from .cache import CacheLRU
+
+
+class RepositorioEscritaAdiada(RepositorioSolicitacoes):
+    """
+    Camada write-behind sobre outro repositório (ex.: SQLite)
+
+    inserir, atualizar e remover só mexem em memória: o registro vivo vai
+    para o mapa de sujos e mutações seguidas do mesmo ID se fundem no
+    estado mais recente (criar + "processando" + resposta viram uma única
+    gravação). Um descarregador em segundo plano grava os sujos com
+    gravar_lote, numa transação por lote, a cada `intervalo` segundos ou
+    assim que houver `limite` registros sujos; a gravação roda numa thread,
+    então o event loop não espera o disco.
+
+    - Leituras por ID consultam sujos, lote em gravação e registros
+      recém-gravados (LRU) antes de ir ao repositório de baixo.
+    - Contadores e total são mantidos aqui a cada mutação, sem esperar a
+      gravação.
+    - listar, ids_por e a iteração não forçam gravação: consultam o
+      repositório de baixo e aplicam por cima o estado em memória (sujos,
+      lote em gravação e remoções pendentes). Inserções ainda não gravadas
+      entram como as mais recentes; registros já gravados mantêm a posição
+      (sequencias()) do repositório de baixo.
+    - Cada lote recebe um número crescente e a gravação descarta um lote
+      mais antigo do que o último já gravado, então um lote atrasado nunca
+      sobrescreve um estado mais novo (ex.: fechar() regravando o lote de
+      uma tarefa cancelada enquanto a thread ainda grava).
+    - Falha na gravação devolve o lote aos sujos para a próxima rodada.
+    - fechar() (no shutdown do lifespan) grava tudo o que estiver pendente,
+      inclusive um lote interrompido no meio, antes de fechar o repositório
+      de baixo. Como cada lote é uma transação, uma queda do processo perde
+      no máximo as escritas ainda em memória, nunca um lote pela metade.
+
+    As leituras no repositório de baixo (busca por ID fora do LRU, listar,
+    ids_por e iteração) usam o leitor de abrir_leitor() quando o backend
+    oferece um (SQLite em arquivo: segunda conexão em WAL), então o event
+    loop não espera a trava que a thread do descarregador segura durante
+    gravar_lote. Sem leitor (memória, SQLite em memória), leem o
+    repositório de baixo sob a trava.
+
+    A retenção (remover_criadas_antes / remover_mais_antigas) roda no
+    repositório de baixo; as removidas lá saem também do estado em memória.
+
+    Inserções não consultam o repositório de baixo para detectar IDs
+    repetidos (os IDs são gerados com UUID); a verificação cobre apenas
+    o que está em memória.
+    """
+
+    def __init__(
+        self,
+        base: RepositorioSolicitacoes,
+        intervalo: float = 0.5,
+        limite: int = 500,
+        max_recentes: int = 10000
+    ):
+        self.base = base
+        self.intervalo = intervalo
+        self.limite = limite
+        # ID -> registro vivo ainda não gravado
+        self._sujos: Dict[str, Dict[str, Any]] = {}
+        # IDs a remover no repositório de baixo
+        self._removidos: Dict[str, None] = {}
+        # Lote em gravação pelo descarregador (ainda legível até confirmar)
+        self._em_voo: Dict[str, Dict[str, Any]] = {}
+        self._removidos_em_voo: Dict[str, None] = {}
+        self._gravacao: Optional[asyncio.Future] = None
+        # Inseridos aqui e ainda não confirmados no repositório de baixo, em ordem de criação
+        self._novos: Dict[str, None] = {}
+        # Número do próximo lote e do último gravado (lotes mais antigos são descartados)
+        self._proximo_lote = 1
+        self._ultimo_lote_gravado = 0
+        # Registros recém-gravados, para atualizações seguintes não lerem do disco
+        self._recentes = CacheLRU(max_itens=max_recentes)
+        # Serializa o acesso ao repositório de baixo (thread do descarregador x event loop)
+        self._trava = threading.Lock()
+        # Conexão só de leitura, lida sem a trava (None: leituras usam o de baixo sob a trava)
+        self._leitor = base.abrir_leitor()
+        self._contadores: Dict[str, Dict[Any, int]] = {campo: base.contagens(campo) for campo in CAMPOS_CONTADOS}
+        self._total = len(base)
+        self._sinal: Optional[asyncio.Event] = None
+        self._tarefa: Optional[asyncio.Task] = None
+        self.mutacoes = 0
+        self.registros_gravados = 0
+        self.descargas = 0
+        self.falhas = 0
+        self.tempo_gravacao = 0.0
+
+    @property
+    def registros_em_memoria(self) -> bool:
+        return self.base.registros_em_memoria
+
+    def iniciar(self) -> None:
+        """Inicia o descarregador em segundo plano"""
+        if self._tarefa is not None:
+            return
+        self._sinal = asyncio.Event()
+        self._tarefa = asyncio.create_task(self._descarregar_continuamente())
+
+    async def parar(self) -> None:
+        """
+        Para o descarregador e espera a gravação em andamento terminar (o que
+        estiver pendente é gravado por fechar())
+        """
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+        if self._gravacao is not None:
+            try:
+                await self._gravacao
+            except Exception:
+                pass
+            self._gravacao = None
+
+    @contextmanager
+    def _leitura(self) -> Iterator[RepositorioSolicitacoes]:
+        """Repositório para as leituras: o leitor próprio, ou o de baixo sob a trava"""
+        if self._leitor is not None:
+            yield self._leitor
+        else:
+            with self._trava:
+                yield self.base
+
+    # Estado em memória
+
+    def _em_memoria(self, solicitacao_id: str) -> Optional[Dict[str, Any]]:
+        solicitacao = self._sujos.get(solicitacao_id)
+        if solicitacao is None:
+            solicitacao = self._em_voo.get(solicitacao_id)
+        if solicitacao is None:
+            solicitacao = self._recentes.espiar(solicitacao_id)
+        return solicitacao
+
+    def _obter(self, solicitacao_id: str) -> Optional[Dict[str, Any]]:
+        if solicitacao_id in self._removidos or solicitacao_id in self._removidos_em_voo:
+            return None
+        solicitacao = self._em_memoria(solicitacao_id)
+        if solicitacao is None:
+            with self._leitura() as repositorio:
+                solicitacao = repositorio.buscar(solicitacao_id)
+            if solicitacao is not None:
+                self._recentes.definir(solicitacao_id, solicitacao)
+        return solicitacao
+
+    def _marcar_sujo(self, solicitacao: Dict[str, Any]) -> None:
+        self._sujos[solicitacao["id"]] = solicitacao
+        self.mutacoes += 1
+        if self._sinal is not None and len(self._sujos) >= self.limite:
+            self._sinal.set()
+
+    def _contar(self, campo: str, valor: Any, delta: int) -> None:
+        contagem = self._contadores[campo]
+        total = contagem.get(valor, 0) + delta
+        if total > 0:
+            contagem[valor] = total
+        else:
+            contagem.pop(valor, None)
+
+    def _valor_contado(self, solicitacao: Dict[str, Any], campo: str) -> Any:
+        valor = solicitacao.get(campo)
+        return CAMPOS_CONTADOS[campo] if valor is None else valor
+
+    # Descarga
+
+    def _separar_lote(self) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, None]]:
+        sujos, removidos = self._sujos, self._removidos
+        self._sujos, self._removidos = {}, {}
+        return sujos, removidos
+
+    def _numerar_lote(self) -> int:
+        numero = self._proximo_lote
+        self._proximo_lote += 1
+        return numero
+
+    def _gravar(self, numero: int, registros: List[Dict[str, Any]], removidos: List[str]) -> bool:
+        """Grava o lote, a menos que um lote mais novo já tenha sido gravado"""
+        inicio = time.perf_counter()
+        with self._trava:
+            if numero < self._ultimo_lote_gravado:
+                return False
+            self.base.gravar_lote(registros, removidos)
+            self._ultimo_lote_gravado = numero
+        self.tempo_gravacao += time.perf_counter() - inicio
+        return True
+
+    def _concluir_lote(self, sujos: Dict[str, Dict[str, Any]], removidos: Dict[str, None]) -> None:
+        for solicitacao_id, solicitacao in sujos.items():
+            self._recentes.definir(solicitacao_id, solicitacao)
+            self._novos.pop(solicitacao_id, None)
+        self.registros_gravados += len(sujos)
+        self.descargas += 1
+
+    def _devolver_lote(self, sujos: Dict[str, Dict[str, Any]], removidos: Dict[str, None]) -> None:
+        """Lote que falhou volta a ser pendente, sem sobrescrever mutações mais novas"""
+        self.falhas += 1
+        for solicitacao_id, solicitacao in sujos.items():
+            if solicitacao_id not in self._removidos:
+                self._sujos.setdefault(solicitacao_id, solicitacao)
+        for solicitacao_id in removidos:
+            if solicitacao_id not in self._sujos:
+                self._removidos[solicitacao_id] = None
+
+    def descarregar(self) -> int:
+        """
+        Grava de forma síncrona tudo o que está pendente, inclusive um lote
+        em gravação pelo descarregador
+
+        Usado no encerramento (fechar); o caminho das requisições só grava
+        pelo descarregador em segundo plano.
+
+        Returns:
+            Quantidade de registros gravados
+        """
+        sujos, removidos = self._separar_lote()
+        # Lote em voo interrompido (ex.: tarefa cancelada no shutdown): regravar é idempotente
+        for solicitacao_id, solicitacao in self._em_voo.items():
+            if solicitacao_id not in removidos:
+                sujos.setdefault(solicitacao_id, solicitacao)
+        for solicitacao_id in self._removidos_em_voo:
+            if solicitacao_id not in sujos:
+                removidos[solicitacao_id] = None
+        if not sujos and not removidos:
+            return 0
+        try:
+            self._gravar(self._numerar_lote(), [dict(solicitacao) for solicitacao in sujos.values()], list(removidos))
+        except Exception:
+            self._devolver_lote(sujos, removidos)
+            raise
+        self._concluir_lote(sujos, removidos)
+        return len(sujos)
+
+    async def descarregar_em_segundo_plano(self) -> int:
+        """Grava os pendentes numa thread, mantendo-os legíveis até a confirmação"""
+        if self._em_voo or self._removidos_em_voo or (not self._sujos and not self._removidos):
+            return 0
+        sujos, removidos = self._separar_lote()
+        self._em_voo, self._removidos_em_voo = sujos, removidos
+        # Cópias rasas: o event loop pode continuar alterando os registros vivos durante a gravação
+        registros = [dict(solicitacao) for solicitacao in sujos.values()]
+        self._gravacao = asyncio.ensure_future(
+            asyncio.to_thread(self._gravar, self._numerar_lote(), registros, list(removidos))
+        )
+        try:
+            # shield: cancelar o descarregador não interrompe a thread; parar() espera por ela
+            await asyncio.shield(self._gravacao)
+        except asyncio.CancelledError:
+            # fechar() regrava o lote em voo com um número mais novo
+            raise
+        except Exception:
+            self._em_voo, self._removidos_em_voo = {}, {}
+            self._gravacao = None
+            self._devolver_lote(sujos, removidos)
+            raise
+        self._em_voo, self._removidos_em_voo = {}, {}
+        self._gravacao = None
+        self._concluir_lote(sujos, removidos)
+        return len(sujos)
+
+    async def _descarregar_continuamente(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._sinal.wait(), timeout=self.intervalo)
+            except asyncio.TimeoutError:
+                pass
+            self._sinal.clear()
+            try:
+                await self.descarregar_em_segundo_plano()
+            except Exception as e:
+                print(f"❌ Erro ao gravar solicitações em lote: {e}")
+
+    # Interface do repositório
+
+    def __len__(self) -> int:
+        return self._total
+
+    def _pendentes(self) -> Tuple[Dict[str, Dict[str, Any]], Dict[str, None]]:
+        """Estado em memória ainda não confirmado: ID -> registro mais novo e IDs removidos"""
+        pendentes = dict(self._em_voo)
+        pendentes.update(self._sujos)
+        removidos = dict(self._removidos_em_voo)
+        removidos.update(self._removidos)
+        for solicitacao_id in removidos:
+            pendentes.pop(solicitacao_id, None)
+        return pendentes, removidos
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        pendentes, removidos = self._pendentes()
+        with self._leitura() as repositorio:
+            registros = list(repositorio)
+        resultado = []
+        for solicitacao in registros:
+            solicitacao_id = solicitacao["id"]
+            if solicitacao_id in removidos or solicitacao_id in self._novos:
+                continue
+            resultado.append(pendentes.get(solicitacao_id, solicitacao))
+        resultado.extend(pendentes[solicitacao_id] for solicitacao_id in self._novos if solicitacao_id in pendentes)
+        return iter(resultado)
+
+    def __contains__(self, solicitacao_id: object) -> bool:
+        return self._obter(solicitacao_id) is not None
+
+    def inserir(self, solicitacao: Dict[str, Any]) -> Dict[str, Any]:
+        solicitacao_id = solicitacao["id"]
+        if self._em_memoria(solicitacao_id) is not None and solicitacao_id not in self._removidos:
+            raise ValueError(f"Solicitação {solicitacao_id} já existe")
+        self._removidos.pop(solicitacao_id, None)
+        for campo in CAMPOS_CONTADOS:
+            self._contar(campo, self._valor_contado(solicitacao, campo), 1)
+        self._total += 1
+        self._novos[solicitacao_id] = None
+        self._marcar_sujo(solicitacao)
+        return solicitacao
+
+    def buscar(self, solicitacao_id: str) -> Optional[Dict[str, Any]]:
+        return self._obter(solicitacao_id)
+
+    def atualizar(self, solicitacao_id: str, **campos: Any) -> Optional[Dict[str, Any]]:
+        solicitacao = self._obter(solicitacao_id)
+        if solicitacao is None:
+            return None
+
+        for campo, valor in campos.items():
+            if campo in self._contadores:
+                anterior = self._valor_contado(solicitacao, campo)
+                if anterior != valor:
+                    self._contar(campo, anterior, -1)
+                    self._contar(campo, valor, 1)
+            solicitacao[campo] = valor
+        self._marcar_sujo(solicitacao)
+        return solicitacao
+
+    def remover(self, solicitacao_id: str) -> Optional[Dict[str, Any]]:
+        solicitacao = self._obter(solicitacao_id)
+        if solicitacao is None:
+            return None
+
+        self._sujos.pop(solicitacao_id, None)
+        self._recentes.remover(solicitacao_id)
+        self._novos.pop(solicitacao_id, None)
+        self._removidos[solicitacao_id] = None
+        self.mutacoes += 1
+        for campo in CAMPOS_CONTADOS:
+            self._contar(campo, self._valor_contado(solicitacao, campo), -1)
+        self._total -= 1
+        return solicitacao
+
+    def contagens(self, campo: str) -> Dict[Any, int]:
+        return dict(self._contadores[campo])
+
+    def ids_por(self, campo: str, valor: Any) -> Dict[str, None]:
+        pendentes, removidos = self._pendentes()
+        with self._leitura() as repositorio:
+            ids = dict(repositorio.ids_por(campo, valor))
+        for solicitacao_id in removidos:
+            ids.pop(solicitacao_id, None)
+        for solicitacao_id, solicitacao in pendentes.items():
+            if solicitacao.get(campo) == valor:
+                ids[solicitacao_id] = None
+            else:
+                ids.pop(solicitacao_id, None)
+        return ids
+
+    def listar(
+        self,
+        user_id: Optional[int] = None,
+        tipo: Optional[str] = None,
+        status: Optional[str] = None,
+        limit: int = 50,
+        before: Optional[str] = None,
+        after: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Listagem do repositório de baixo com o estado em memória por cima
+
+        Cada registro é posicionado por (0, seq) se já está no repositório de
+        baixo ou (1, ordem de inserção) se ainda não foi gravado. O
+        repositório de baixo devolve `limit` registros a mais do que o
+        necessário, mais um por pendente ou remoção (os que podem cair do
+        resultado); pendentes que passaram a atender os filtros (ex.: status
+        alterado) são posicionados pela sequência gravada.
+        """
+        if limit <= 0:
+            return []
+
+        filtros = {
+            campo: valor
+            for campo, valor in (("user_id", user_id), ("tipo", tipo), ("status", status))
+            if valor
+        }
+
+        def atende(solicitacao: Dict[str, Any]) -> bool:
+            return all(str(solicitacao.get(campo)) == str(valor) for campo, valor in filtros.items())
+
+        pendentes, removidos = self._pendentes()
+        novos = {solicitacao_id: indice for indice, solicitacao_id in enumerate(self._novos)}
+        cursor = after if after is not None else before
+        extras = len(pendentes) + len(removidos)
+
+        with self._leitura() as repositorio:
+            if cursor is None or cursor not in novos:
+                base_cursor = {"before": before, "after": after} if cursor is not None else {}
+                linhas = repositorio.listar(user_id=user_id, tipo=tipo, status=status, limit=limit + extras, **base_cursor)
+            elif before is not None:
+                # Cursor ainda só em memória: tudo o que está gravado é mais antigo
+                linhas = repositorio.listar(user_id=user_id, tipo=tipo, status=status, limit=limit + extras)
+            else:
+                linhas = []
+            ids_linhas = {solicitacao["id"] for solicitacao in linhas}
+            procurar = [
+                solicitacao_id for solicitacao_id, solicitacao in pendentes.items()
+                if solicitacao_id not in novos and solicitacao_id not in ids_linhas and atende(solicitacao)
+            ]
+            if cursor is not None and cursor not in novos:
+                procurar.append(cursor)
+            sequencias = repositorio.sequencias(procurar + [solicitacao["id"] for solicitacao in linhas])
+
+        if cursor is not None:
+            if cursor in novos:
+                posicao_cursor = (1, novos[cursor])
+            elif cursor in sequencias and cursor not in removidos:
+                posicao_cursor = (0, sequencias[cursor])
+            else:
+                return []
+
+        candidatos: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+        for solicitacao in linhas:
+            solicitacao_id = solicitacao["id"]
+            if solicitacao_id in removidos or solicitacao_id in novos or solicitacao_id not in sequencias:
+                continue
+            candidatos[solicitacao_id] = ((0, sequencias[solicitacao_id]), pendentes.get(solicitacao_id, solicitacao))
+        for solicitacao_id in procurar:
+            if solicitacao_id in sequencias and solicitacao_id in pendentes:
+                candidatos[solicitacao_id] = ((0, sequencias[solicitacao_id]), pendentes[solicitacao_id])
+        for solicitacao_id, indice in novos.items():
+            if solicitacao_id in pendentes:
+                candidatos[solicitacao_id] = ((1, indice), pendentes[solicitacao_id])
+
+        ordenados = sorted(
+            (
+                (posicao, solicitacao) for posicao, solicitacao in candidatos.values()
+                if atende(solicitacao)
+                and (after is None or posicao > posicao_cursor)
+                and (before is None or posicao < posicao_cursor)
+            ),
+            key=lambda item: item[0]
+        )
+        # after: as mais próximas do cursor; sem after: as mais recentes
+        selecionados = ordenados[:limit] if after is not None else ordenados[-limit:]
+        return [solicitacao for _, solicitacao in reversed(selecionados)]
+
+    def remover_criadas_antes(self, limite: datetime, quantidade: int) -> List[Dict[str, Any]]:
+        with self._trava:
+            removidas = self.base.remover_criadas_antes(limite, quantidade)
+        return self._descontar_removidas(removidas)
+
+    def remover_mais_antigas(self, quantidade: int, status: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        with self._trava:
+            removidas = self.base.remover_mais_antigas(quantidade, status)
+        return self._descontar_removidas(removidas)
+
+    def _descontar_removidas(self, removidas: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Aplica ao estado em memória as remoções feitas direto no repositório de baixo"""
+        resultado = []
+        for removida in removidas:
+            solicitacao_id = removida["id"]
+            if solicitacao_id in self._removidos or solicitacao_id in self._removidos_em_voo:
+                # Já removida aqui (e descontada) antes da retenção
+                continue
+            # Versão em memória é a mais nova; a do lote em voo seria regravada, então vira remoção pendente
+            atual = self._sujos.pop(solicitacao_id, None) or self._em_voo.get(solicitacao_id)
+            if solicitacao_id in self._em_voo:
+                self._removidos[solicitacao_id] = None
+            self._recentes.remover(solicitacao_id)
+            self._novos.pop(solicitacao_id, None)
+            if atual is not None:
+                removida = {"id": solicitacao_id, **{campo: self._valor_contado(atual, campo) for campo in CAMPOS_CONTADOS}}
+            for campo in CAMPOS_CONTADOS:
+                self._contar(campo, removida[campo], -1)
+            self._total -= 1
+            resultado.append(removida)
+        return resultado
+
+    def fechar(self) -> None:
+        """Grava tudo o que estiver pendente e fecha o repositório de baixo"""
+        for tentativa in range(1, 4):
+            try:
+                gravados = self.descarregar()
+                if gravados:
+                    print(f"💾 {gravados} solicitações pendentes gravadas no encerramento")
+                break
+            except Exception as e:
+                print(f"❌ Falha ao gravar solicitações pendentes (tentativa {tentativa}/3): {e}")
+                time.sleep(0.1 * tentativa)
+        else:
+            print(f"⚠️ {len(self._sujos)} solicitações e {len(self._removidos)} remoções não gravadas")
+        with self._trava:
+            self.base.fechar()
+        if self._leitor is not None:
+            self._leitor.fechar()
+
+    def descricao(self) -> Dict[str, Any]:
+        descricao = self.base.descricao()
+        descricao["escrita_adiada"] = {
+            "intervalo": self.intervalo,
+            "limite": self.limite,
+            "pendentes": len(self._sujos) + len(self._em_voo),
+            "remocoes_pendentes": len(self._removidos) + len(self._removidos_em_voo),
+            "mutacoes": self.mutacoes,
+            "registros_gravados": self.registros_gravados,
+            "descargas": self.descargas,
+            "falhas": self.falhas,
+            "tempo_gravacao_ms": round(self.tempo_gravacao * 1000, 2)
+        }
+        return descricao
@@ -0,0 +1,42 @@
+"""
+Módulo de Eventos - Mock ERP Application
+Publicação em memória das mudanças de status das solicitações
+"""
+import asyncio
+from typing import Any, Dict, Hashable, Set
+
+
+class CanalEventos:
+    """
+    Canal de eventos por chave (ex.: ID da solicitação)
+
+    Cada assinante recebe sua própria fila; publicar sem assinantes custa
+    apenas uma consulta a dict. Usado pelo stream SSE de status.
+    """
+
+    def __init__(self):
+        self._assinantes: Dict[Hashable, Set[asyncio.Queue]] = {}
+
+    def assinar(self, chave: Hashable) -> asyncio.Queue:
+        fila: asyncio.Queue = asyncio.Queue()
+        self._assinantes.setdefault(chave, set()).add(fila)
+        return fila
+
+    def cancelar(self, chave: Hashable, fila: asyncio.Queue) -> None:
+        filas = self._assinantes.get(chave)
+        if filas is None:
+            return
+        filas.discard(fila)
+        if not filas:
+            del self._assinantes[chave]
+
+    def publicar(self, chave: Hashable, evento: Dict[str, Any]) -> None:
+        for fila in self._assinantes.get(chave, ()):
+            fila.put_nowait(evento)
+
+    def __len__(self) -> int:
+        return sum(len(filas) for filas in self._assinantes.values())
+
+
+# Mudanças de status das solicitações (publicadas pelo GerenciadorSolicitacoes)
+eventos_solicitacoes = CanalEventos()
@@ -0,0 +1,354 @@
+"""
+Módulo de Fila de Feedback - Mock ERP Application
+Fila local durável (append-only) para o envio de feedback ao assistente de IA
+"""
+import asyncio
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TextIO, Tuple
+
+from .cache import CacheLRU
+
+
+class FilaFeedbackDuravel:
+    """
+    Fila de feedback gravada em disco antes de responder ao usuário
+
+    Cada feedback vira uma linha {"op": "item", ...} no arquivo (flush e,
+    por padrão, fsync) e é confirmado assim que a linha está em disco. A
+    escrita roda em uma thread (asyncio.to_thread), fora do loop de
+    eventos, e em grupo: as linhas que chegam enquanto um fsync está em
+    andamento são gravadas juntas, com um único fsync, no seguinte. Um descarregador em segundo
+    plano entrega os pendentes em lotes, a cada `intervalo` segundos ou assim
+    que a fila junta `tamanho_lote` itens, e grava {"op": "entregue"} ou
+    {"op": "descartado"} ao terminar. Ao iniciar, o arquivo é relido e os
+    itens sem confirmação voltam para a fila, então nada se perde com o
+    assistente fora do ar ou com o servidor reiniciando.
+
+    - Falhas de rede, 5xx, 408 e 429 são tentadas de novo com backoff
+      exponencial (com jitter) por item, sem limite de tentativas.
+    - Outros 4xx descartam o item (nova tentativa daria o mesmo erro).
+    - Deduplicação: o mesmo feedback (solicitação, avaliação e texto) ainda
+      pendente ou já entregue não é enfileirado de novo; um feedback novo
+      para a mesma solicitação substitui o pendente. Cada envio leva o ID
+      do item como Idempotency-Key, para o serviço ignorar repetições de
+      um envio que chegou mas cuja resposta se perdeu.
+    """
+
+    def __init__(
+        self,
+        prefixo: str,
+        entregar: Callable[[str, Dict[str, Any], str], Awaitable[int]],
+        arquivo: str = "dados/fila_feedback.jsonl",
+        tamanho_lote: int = 50,
+        intervalo: float = 1.0,
+        backoff_base: float = 1.0,
+        backoff_max: float = 300.0,
+        fsync: bool = True
+    ):
+        self.prefixo = prefixo
+        self._entregar = entregar
+        self.arquivo = arquivo
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.fsync = fsync
+        # ID da solicitação -> item pendente (em ordem de chegada)
+        self._pendentes: Dict[str, Dict[str, Any]] = {}
+        # Impressão digital -> ID do item já entregue
+        self._entregues = CacheLRU(max_itens=10000)
+        self._saida: Optional[TextIO] = None
+        self._linhas = 0
+        # Linhas aguardando o próximo grupo, quem espera por elas e o escritor em andamento
+        self._buffer: List[str] = []
+        self._grupo: Optional[asyncio.Future] = None
+        self._escritor: Optional[asyncio.Task] = None
+        # Serializa escrita e compactação do arquivo (feitas em threads)
+        self._trava = threading.Lock()
+        self._sinal: Optional[asyncio.Event] = None
+        self._tarefa: Optional[asyncio.Task] = None
+        self.enfileirados = 0
+        self.entregues = 0
+        self.descartados = 0
+        self.duplicados = 0
+        self.substituidos = 0
+        self.falhas = 0
+
+    def iniciar(self) -> None:
+        """
+        Lê {prefixo}_FILA_* do ambiente, recupera os pendentes do arquivo
+        e inicia o descarregador
+        """
+        if self._tarefa is not None:
+            return
+        p = f"{self.prefixo}_FILA"
+        self.arquivo = os.getenv(f"{p}_ARQUIVO", self.arquivo)
+        self.tamanho_lote = int(os.getenv(f"{p}_LOTE", self.tamanho_lote))
+        self.intervalo = float(os.getenv(f"{p}_INTERVALO", self.intervalo))
+        self.backoff_base = float(os.getenv(f"{p}_BACKOFF_BASE", self.backoff_base))
+        self.backoff_max = float(os.getenv(f"{p}_BACKOFF_MAX", self.backoff_max))
+        self.fsync = os.getenv(f"{p}_FSYNC", str(self.fsync)).lower() == "true"
+
+        self._recuperar()
+        if self._pendentes:
+            print(f"📬 {len(self._pendentes)} feedbacks pendentes recuperados de {self.arquivo}")
+        self._sinal = asyncio.Event()
+        self._tarefa = asyncio.create_task(self._descarregar_continuamente())
+
+    async def parar(self) -> None:
+        """Para o descarregador; os pendentes continuam no arquivo para a próxima execução"""
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+        if self._escritor is not None:
+            await asyncio.gather(self._escritor, return_exceptions=True)
+            self._escritor = None
+        if self._saida is not None:
+            self._saida.close()
+            self._saida = None
+
+    def _recuperar(self) -> None:
+        """Relê o arquivo e o reescreve só com os itens pendentes"""
+        self._pendentes.clear()
+        if os.path.exists(self.arquivo):
+            with open(self.arquivo, encoding="utf-8") as entrada:
+                for numero, linha in enumerate(entrada, 1):
+                    try:
+                        registro = json.loads(linha)
+                    except ValueError:
+                        # Linha truncada por uma queda no meio da escrita
+                        print(f"⚠️ Linha {numero} inválida em {self.arquivo}; ignorada")
+                        continue
+                    if registro.get("op") == "item":
+                        item = registro["item"]
+                        item["tentativas"] = 0
+                        item["proxima"] = 0.0
+                        self._pendentes.pop(item["solicitacao_id"], None)
+                        self._pendentes[item["solicitacao_id"]] = item
+                    else:
+                        pendente = self._pendentes.get(registro.get("solicitacao_id"))
+                        if pendente is not None and pendente["id"] == registro.get("id"):
+                            del self._pendentes[registro["solicitacao_id"]]
+        self._compactar()
+
+    def _compactar(self) -> None:
+        """Reescreve o arquivo (de forma atômica) apenas com os pendentes"""
+        self._reescrever([self._linha("item", item) for item in self._pendentes.values()])
+
+    def _reescrever(self, linhas: List[str]) -> None:
+        diretorio = os.path.dirname(self.arquivo)
+        if diretorio:
+            os.makedirs(diretorio, exist_ok=True)
+        with self._trava:
+            if self._saida is not None:
+                self._saida.close()
+            temporario = f"{self.arquivo}.tmp"
+            with open(temporario, "w", encoding="utf-8") as saida:
+                saida.writelines(linhas)
+                saida.flush()
+                os.fsync(saida.fileno())
+            os.replace(temporario, self.arquivo)
+            self._saida = open(self.arquivo, "a", encoding="utf-8")
+            self._linhas = len(linhas)
+
+    @staticmethod
+    def _linha(op: str, item: Dict[str, Any]) -> str:
+        if op == "item":
+            persistido = {campo: valor for campo, valor in item.items() if campo not in ("tentativas", "proxima")}
+            registro = {"op": op, "item": persistido}
+        else:
+            registro = {"op": op, "id": item["id"], "solicitacao_id": item["solicitacao_id"]}
+        return json.dumps(registro, ensure_ascii=False, default=str) + "\n"
+
+    async def _gravar(self, op: str, item: Dict[str, Any]) -> None:
+        """Acrescenta a linha ao próximo grupo e espera o grupo chegar ao disco"""
+        if self._saida is None:
+            # Usada sem iniciar() (ex.: scripts): recuperar antes de reescrever o arquivo
+            self._recuperar()
+        self._buffer.append(self._linha(op, item))
+        if self._grupo is None:
+            self._grupo = asyncio.get_running_loop().create_future()
+        grupo = self._grupo
+        if self._escritor is None or self._escritor.done():
+            self._escritor = asyncio.ensure_future(self._escrever_grupos())
+        # Quem desiste de esperar não interrompe a escrita dos demais
+        await asyncio.shield(grupo)
+
+    async def _escrever_grupos(self) -> None:
+        while self._buffer:
+            linhas, self._buffer = self._buffer, []
+            grupo, self._grupo = self._grupo, None
+            try:
+                await asyncio.to_thread(self._escrever, linhas)
+            except Exception as e:
+                grupo.set_exception(e)
+                # Marca a exceção como consumida mesmo se ninguém mais espera o grupo
+                grupo.exception()
+            else:
+                grupo.set_result(None)
+
+    def _escrever(self, linhas: List[str]) -> None:
+        with self._trava:
+            self._saida.writelines(linhas)
+            self._saida.flush()
+            if self.fsync:
+                os.fsync(self._saida.fileno())
+            self._linhas += len(linhas)
+
+    @staticmethod
+    def _impressao_digital(solicitacao_id: str, payload: Dict[str, Any]) -> Tuple:
+        return (solicitacao_id, payload.get("avaliacao_usuario"), payload.get("feedback_texto") or "")
+
+    async def enfileirar(self, solicitacao_id: str, payload: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Grava o feedback na fila local e retorna assim que ele está em disco
+
+        Returns:
+            Dict com feedback_id e duplicado (True se o mesmo feedback já
+            estava pendente ou entregue)
+
+        Raises:
+            OSError: Falha ao gravar no arquivo da fila
+        """
+        digital = self._impressao_digital(solicitacao_id, payload)
+        pendente = self._pendentes.get(solicitacao_id)
+        if pendente is not None and self._impressao_digital(solicitacao_id, pendente["payload"]) == digital:
+            self.duplicados += 1
+            return {"feedback_id": pendente["id"], "duplicado": True}
+        entregue = self._entregues.espiar(digital)
+        if entregue is not None:
+            self.duplicados += 1
+            return {"feedback_id": entregue, "duplicado": True}
+
+        item = {
+            "id": uuid.uuid4().hex,
+            "solicitacao_id": solicitacao_id,
+            "payload": payload,
+            "criado_em": datetime.now().isoformat(),
+            "tentativas": 0,
+            "proxima": 0.0
+        }
+        # Entra nos pendentes antes da escrita: uma compactação durante o fsync
+        # já inclui o item, e um feedback idêntico concorrente é deduplicado
+        if pendente is not None:
+            # Avaliação nova para a mesma solicitação: só a última é enviada
+            del self._pendentes[solicitacao_id]
+        self._pendentes[solicitacao_id] = item
+        try:
+            await self._gravar("item", item)
+        except BaseException:
+            if self._pendentes.get(solicitacao_id) is item:
+                del self._pendentes[solicitacao_id]
+                if pendente is not None:
+                    self._pendentes[solicitacao_id] = pendente
+            raise
+        if pendente is not None:
+            self.substituidos += 1
+        self.enfileirados += 1
+        if self._sinal is not None and len(self._pendentes) >= self.tamanho_lote:
+            self._sinal.set()
+        return {"feedback_id": item["id"], "duplicado": False}
+
+    async def _descarregar_continuamente(self) -> None:
+        while True:
+            try:
+                await asyncio.wait_for(self._sinal.wait(), timeout=self.intervalo)
+            except asyncio.TimeoutError:
+                pass
+            self._sinal.clear()
+            try:
+                await self.descarregar()
+            except Exception as e:
+                print(f"❌ Erro ao descarregar a fila de feedback: {e}")
+
+    async def descarregar(self) -> int:
+        """
+        Envia um lote de itens pendentes cujo backoff já venceu
+
+        Returns:
+            Quantidade de itens entregues
+        """
+        agora = time.monotonic()
+        lote: List[Dict[str, Any]] = []
+        for item in self._pendentes.values():
+            if item["proxima"] <= agora:
+                lote.append(item)
+                if len(lote) >= self.tamanho_lote:
+                    break
+        if not lote:
+            return 0
+
+        entregues = sum(await asyncio.gather(*(self._enviar_item(item) for item in lote)))
+        if entregues:
+            print(f"📤 Fila de feedback: {entregues}/{len(lote)} entregues, {len(self._pendentes)} pendentes")
+        # Arquivo dominado por itens já confirmados: reescrever só com os pendentes
+        if self._linhas > 1000 and self._linhas > 4 * len(self._pendentes):
+            await asyncio.to_thread(self._reescrever, [self._linha("item", item) for item in self._pendentes.values()])
+        return entregues
+
+    async def _enviar_item(self, item: Dict[str, Any]) -> bool:
+        try:
+            status = await self._entregar(item["solicitacao_id"], item["payload"], item["id"])
+        except Exception as e:
+            print(f"🔁 Feedback {item['id']} não entregue ({type(e).__name__}: {e}); nova tentativa agendada")
+            self._agendar_nova_tentativa(item)
+            return False
+
+        if 200 <= status < 300:
+            await self._confirmar(item, "entregue")
+            self._entregues.definir(self._impressao_digital(item["solicitacao_id"], item["payload"]), item["id"])
+            self.entregues += 1
+            return True
+        if 400 <= status < 500 and status not in (408, 429):
+            print(f"🗑️ Feedback {item['id']} descartado: status {status}")
+            await self._confirmar(item, "descartado")
+            self.descartados += 1
+            return False
+
+        print(f"🔁 Feedback {item['id']} não entregue (status {status}); nova tentativa agendada")
+        self._agendar_nova_tentativa(item)
+        return False
+
+    def _agendar_nova_tentativa(self, item: Dict[str, Any]) -> None:
+        self.falhas += 1
+        item["tentativas"] += 1
+        atraso = min(self.backoff_base * 2 ** (item["tentativas"] - 1), self.backoff_max)
+        item["proxima"] = time.monotonic() + atraso * random.uniform(0.5, 1.0)
+
+    async def _confirmar(self, item: Dict[str, Any], op: str) -> None:
+        # O item pode ter sido substituído por um feedback novo durante o envio. Sai
+        # dos pendentes antes da escrita: uma compactação durante o fsync não o
+        # regrava (se a escrita falhar, ele volta na próxima recuperação do arquivo)
+        if self._pendentes.get(item["solicitacao_id"]) is item:
+            del self._pendentes[item["solicitacao_id"]]
+        await self._gravar(op, item)
+
+    def __len__(self) -> int:
+        return len(self._pendentes)
+
+    def estatisticas(self) -> Dict[str, Any]:
+        agora = time.monotonic()
+        proxima = min((item["proxima"] for item in self._pendentes.values()), default=None)
+        return {
+            "arquivo": self.arquivo,
+            "pendentes": len(self._pendentes),
+            "enfileirados": self.enfileirados,
+            "entregues": self.entregues,
+            "descartados": self.descartados,
+            "duplicados": self.duplicados,
+            "substituidos": self.substituidos,
+            "falhas": self.falhas,
+            "proxima_tentativa_em": max(0.0, proxima - agora) if proxima is not None else None,
+            "tamanho_lote": self.tamanho_lote,
+            "intervalo": self.intervalo
+        }
@@ -0,0 +1,326 @@
+"""
+Módulo de Importação de Usuários - Mock ERP Application
+Importação e exportação em massa de usuários em NDJSON ou CSV, em streaming
+"""
+import codecs
+import csv
+import io
+import json
+import os
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Optional, Tuple, Union
+
+from pydantic import ConfigDict, Field, TypeAdapter, ValidationError
+from typing_extensions import Annotated, NotRequired, TypedDict
+
+from .usuarios import CAMPOS_LISTAGEM, GerenciadorUsuarios
+
+
+FORMATOS = ("ndjson", "csv")
+
+MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+
+# Erros listados na resposta da importação (os demais só entram na contagem)
+MAX_ERROS_RELATORIO = 100
+
+
+def tamanho_lote_importacao() -> int:
+    """Linhas validadas e gravadas juntas na importação (e usuários por página na exportação)"""
+    return max(1, int(os.getenv("USUARIOS_IMPORTACAO_LOTE", 1000)))
+
+
+class UsuarioImportado(TypedDict):
+    """Linha da importação; colunas extras (ex.: id) são ignoradas"""
+    __pydantic_config__ = ConfigDict(str_strip_whitespace=True)  # type: ignore[misc]
+
+    name: Annotated[str, Field(min_length=1)]
+    email: Annotated[str, Field(min_length=3, pattern="@")]
+    active: NotRequired[bool]
+
+
+# Valida o lote inteiro em uma chamada (pydantic-core) e devolve dicts, sem um modelo por linha
+_VALIDADOR_LOTE = TypeAdapter(List[UsuarioImportado])
+
+
+def formato_por_content_type(content_type: Optional[str]) -> str:
+    """CSV para text/csv (e variações), NDJSON para o resto"""
+    return "csv" if content_type and "csv" in content_type.lower() else "ndjson"
+
+
+async def _pedacos_de_linhas(partes: AsyncIterator[bytes]) -> AsyncIterator[List[str]]:
+    """
+    Linhas completas (com o "\n") de cada pedaço do corpo, conforme chegam
+
+    Decodifica em UTF-8, com ou sem BOM; só a última linha incompleta fica
+    guardada entre um pedaço e o seguinte (e sai no fim, sem "\n").
+    """
+    decodificador = codecs.getincrementaldecoder("utf-8-sig")()
+    resto = ""
+    async for parte in partes:
+        linhas = (resto + decodificador.decode(parte)).split("\n")
+        resto = linhas.pop()
+        if linhas:
+            yield [linha + "\n" for linha in linhas]
+    resto += decodificador.decode(b"", final=True)
+    if resto:
+        yield [resto]
+
+
+async def _lotes_de_linhas(
+    partes: AsyncIterator[bytes],
+    tamanho: int
+) -> AsyncIterator[List[Tuple[int, str]]]:
+    """Linhas não vazias do corpo, com o número da linha, em lotes de `tamanho`"""
+    numero = 0
+    lote: List[Tuple[int, str]] = []
+    async for linhas in _pedacos_de_linhas(partes):
+        for linha in linhas:
+            numero += 1
+            if linha.strip():
+                lote.append((numero, linha.rstrip("\r\n")))
+                if len(lote) >= tamanho:
+                    yield lote
+                    lote = []
+    if lote:
+        yield lote
+
+
+class _FaltamLinhas(Exception):
+    """O registro do CSV continua em um pedaço do corpo que ainda não chegou"""
+
+
+class _LinhasCSV:
+    """
+    Fonte de linhas de um único csv.reader, alimentada pedaço a pedaço
+
+    Sem linhas no meio do corpo, levanta _FaltamLinhas em vez de encerrar
+    o reader: as linhas do registro incompleto voltam para a fila e ele é
+    lido de novo quando o próximo pedaço chegar. Assim o csv.reader vê o
+    texto contínuo, inclusive quebras de linha dentro de campos com aspas.
+    """
+
+    def __init__(self):
+        self._linhas: Deque[str] = deque()
+        self._lidas: List[str] = []
+        self.fim = False
+        # Linhas consumidas por registros completos (numeração dos erros)
+        self.numero = 0
+
+    def __iter__(self) -> "_LinhasCSV":
+        return self
+
+    def __next__(self) -> str:
+        if not self._linhas:
+            if self.fim:
+                raise StopIteration
+            raise _FaltamLinhas
+        linha = self._linhas.popleft()
+        self._lidas.append(linha)
+        return linha
+
+    def acrescentar(self, linhas: List[str]) -> None:
+        self._linhas.extend(linhas)
+
+    def registros(self, leitor: Any) -> Iterator[Tuple[int, Union[List[str], str]]]:
+        """Registros completos disponíveis: linha em que começam e células (ou a mensagem de erro)"""
+        while True:
+            self._lidas = []
+            try:
+                registro: Union[List[str], str] = next(leitor)
+            except StopIteration:
+                return
+            except _FaltamLinhas:
+                self._linhas.extendleft(reversed(self._lidas))
+                return
+            except csv.Error as e:
+                registro = f"CSV inválido: {e}"
+            inicio = self.numero + 1
+            self.numero += len(self._lidas)
+            # Linhas em branco não contam como registros
+            if registro and (len(registro) > 1 or registro[0].strip()):
+                yield inicio, registro
+
+
+async def _lotes_csv(
+    partes: AsyncIterator[bytes],
+    tamanho: int
+) -> AsyncIterator[List[Tuple[int, Union[List[str], str]]]]:
+    """Registros do CSV (linha inicial, células ou erro) em lotes de `tamanho`"""
+    linhas = _LinhasCSV()
+    leitor = csv.reader(linhas)
+    lote: List[Tuple[int, Union[List[str], str]]] = []
+    async for pedaco in _pedacos_de_linhas(partes):
+        linhas.acrescentar(pedaco)
+        for registro in linhas.registros(leitor):
+            lote.append(registro)
+            if len(lote) >= tamanho:
+                yield lote
+                lote = []
+    # Fim do corpo: um campo com aspas não fechadas termina aqui
+    linhas.fim = True
+    lote.extend(linhas.registros(leitor))
+    if lote:
+        yield lote
+
+
+def _ler_ndjson(lote: List[Tuple[int, str]]) -> Tuple[List[Tuple[int, Any]], List[Dict[str, Any]]]:
+    itens: List[Tuple[int, Any]] = []
+    erros: List[Dict[str, Any]] = []
+    for numero, linha in lote:
+        try:
+            dados = json.loads(linha)
+        except ValueError:
+            erros.append({"line": numero, "error": "JSON inválido"})
+            continue
+        if not isinstance(dados, dict):
+            erros.append({"line": numero, "error": "Esperado um objeto JSON por linha"})
+            continue
+        itens.append((numero, dados))
+    return itens, erros
+
+
+def _ler_csv(
+    lote: List[Tuple[int, Union[List[str], str]]],
+    colunas: List[str]
+) -> Tuple[List[Tuple[int, Any]], List[Dict[str, Any]]]:
+    # Células vazias ficam de fora (active vazio assume o padrão, name/email vazios falham na validação)
+    itens: List[Tuple[int, Any]] = []
+    erros: List[Dict[str, Any]] = []
+    for numero, celulas in lote:
+        if isinstance(celulas, str):
+            erros.append({"line": numero, "error": celulas})
+            continue
+        itens.append((numero, {coluna: valor for coluna, valor in zip(colunas, celulas) if valor != ""}))
+    return itens, erros
+
+
+def _colunas_csv(celulas: Union[List[str], str]) -> List[str]:
+    if isinstance(celulas, str):
+        raise ValueError(f"Cabeçalho do CSV: {celulas}")
+    colunas = [coluna.strip().lower() for coluna in celulas]
+    if "name" not in colunas or "email" not in colunas:
+        raise ValueError("Cabeçalho do CSV precisa das colunas name e email")
+    return colunas
+
+
+def _validar(itens: List[Tuple[int, Any]]) -> Tuple[List[Tuple[int, Dict[str, Any]]], List[Dict[str, Any]]]:
+    """Valida o lote de uma vez; com erros, revalida só as linhas que passaram"""
+    try:
+        return list(zip((numero for numero, _ in itens), _VALIDADOR_LOTE.validate_python([d for _, d in itens]))), []
+    except ValidationError as e:
+        mensagens: Dict[int, str] = {}
+        for erro in e.errors(include_url=False):
+            indice = erro["loc"][0]
+            if indice not in mensagens:
+                campo = ".".join(str(parte) for parte in erro["loc"][1:]) or "linha"
+                mensagens[indice] = f"{campo}: {erro['msg']}"
+    erros = [{"line": itens[indice][0], "error": mensagem} for indice, mensagem in mensagens.items()]
+    restantes = [item for indice, item in enumerate(itens) if indice not in mensagens]
+    validos, _ = _validar(restantes) if restantes else ([], [])
+    return validos, erros
+
+
+async def importar_usuarios(
+    partes: AsyncIterator[bytes],
+    formato: str = "ndjson",
+    tamanho_lote: Optional[int] = None
+) -> Dict[str, Any]:
+    """
+    Cria usuários a partir de um corpo NDJSON ou CSV lido em streaming
+
+    O corpo é consumido em lotes de USUARIOS_IMPORTACAO_LOTE linhas: cada
+    lote é validado de uma vez e gravado com GerenciadorUsuarios
+    .criar_usuarios_em_lote (uma transação no SQLite), então nem o corpo
+    nem a lista de usuários ficam inteiros em memória. Linhas inválidas ou
+    com e-mail já cadastrado não interrompem a importação: entram em
+    "failed" e, até MAX_ERROS_RELATORIO, em "errors" com o número da linha.
+
+    CSV: o primeiro registro é o cabeçalho (name, email e, opcional,
+    active). O texto passa por um único csv.reader, então campos entre
+    aspas podem conter vírgulas e quebras de linha; o número informado nos
+    erros é o da linha em que o registro começa.
+
+    Raises:
+        ValueError: Formato desconhecido ou cabeçalho do CSV sem name/email
+    """
+    if formato not in FORMATOS:
+        raise ValueError(f"Formato não suportado: {formato} (use {' ou '.join(FORMATOS)})")
+
+    resumo: Dict[str, Any] = {"total": 0, "created": 0, "failed": 0, "first_id": None, "last_id": None, "errors": []}
+    colunas: Optional[List[str]] = None
+    tamanho = tamanho_lote or tamanho_lote_importacao()
+    lotes = _lotes_csv(partes, tamanho) if formato == "csv" else _lotes_de_linhas(partes, tamanho)
+    async for lote in lotes:
+        if formato == "csv":
+            if colunas is None:
+                colunas = _colunas_csv(lote[0][1])
+                lote = lote[1:]
+            itens, erros = _ler_csv(lote, colunas)
+        else:
+            itens, erros = _ler_ndjson(lote)
+
+        validos, erros_validacao = _validar(itens)
+        erros.extend(erros_validacao)
+        criados = GerenciadorUsuarios.criar_usuarios_em_lote([dados for _, dados in validos])
+        for (numero, dados), usuario in zip(validos, criados):
+            if usuario is None:
+                erros.append({"line": numero, "error": f"E-mail {dados['email']} já cadastrado"})
+                continue
+            if resumo["first_id"] is None:
+                resumo["first_id"] = usuario["id"]
+            resumo["last_id"] = usuario["id"]
+            resumo["created"] += 1
+
+        resumo["total"] += len(lote)
+        resumo["failed"] += len(erros)
+        espaco = MAX_ERROS_RELATORIO - len(resumo["errors"])
+        if espaco > 0:
+            resumo["errors"].extend(sorted(erros, key=lambda erro: erro["line"])[:espaco])
+
+    print(f"📥 Importação de usuários ({formato}): {resumo['created']} criados, {resumo['failed']} com erro")
+    return resumo
+
+
+async def exportar_usuarios(
+    formato: str = "ndjson",
+    active: Optional[bool] = None,
+    email_prefix: Optional[str] = None,
+    name_prefix: Optional[str] = None,
+    campos: Optional[List[str]] = None
+) -> AsyncIterator[str]:
+    """
+    Usuários em NDJSON ou CSV, uma página por pedaço do stream
+
+    Percorre o repositório pelo cursor da listagem (páginas de
+    USUARIOS_IMPORTACAO_LOTE), então só uma página fica em memória. O CSV
+    começa pelo cabeçalho e usa true/false em active, o mesmo formato
+    aceito pela importação.
+    """
+    campos = campos or list(CAMPOS_LISTAGEM)
+    tamanho = tamanho_lote_importacao()
+    if formato == "csv":
+        yield ",".join(campos) + "\r\n"
+
+    cursor = None
+    while True:
+        pagina, cursor = GerenciadorUsuarios.listar_usuarios(
+            limit=tamanho,
+            cursor=cursor,
+            active=active,
+            email_prefix=email_prefix,
+            name_prefix=name_prefix,
+            campos=campos
+        )
+        if pagina:
+            if formato == "csv":
+                saida = io.StringIO()
+                escritor = csv.writer(saida)
+                for usuario in pagina:
+                    escritor.writerow(
+                        [("true" if valor else "false") if type(valor) is bool else valor for valor in usuario.values()]
+                    )
+                yield saida.getvalue()
+            else:
+                yield "".join(json.dumps(usuario, ensure_ascii=False) + "\n" for usuario in pagina)
+        if cursor is None:
+            return
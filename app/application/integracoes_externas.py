@@ -0,0 +1,85 @@
+"""
+Módulo de Integrações Externas - Mock ERP Application
+Busca assíncrona de APIs externas com cache, agrupamento de requisições e limite por host
+"""
+import os
+from typing import Any, Dict, Optional
+
+import httpx
+
+from .cache import CacheLRU
+from .cliente_http import ClienteHttpCompartilhado
+from .concorrencia import ColapsadorRequisicoes, LimitadorPorChave
+
+
+class ClienteExterno:
+    """
+    Cliente para integrações do ERP com APIs externas
+
+    - Pool de conexões compartilhado (configurado via variáveis EXTERNO_*)
+    - Cache das respostas JSON com TTL
+    - Requisições idênticas em andamento são agrupadas em uma só
+    - Limite de requisições simultâneas por host de destino
+
+    As respostas em cache são compartilhadas entre chamadores e não devem
+    ser modificadas.
+    """
+
+    def __init__(self, ttl_cache: float = 60.0, max_cache: int = 512, max_por_host: int = 10):
+        self._cliente = ClienteHttpCompartilhado("EXTERNO")
+        self.cache = CacheLRU(max_itens=max_cache, ttl=ttl_cache)
+        self._colapsador = ColapsadorRequisicoes()
+        self._limitador = LimitadorPorChave(max_por_host)
+
+    async def iniciar(self) -> None:
+        self.cache.ttl = float(os.getenv("EXTERNO_CACHE_TTL", self.cache.ttl))
+        self._limitador.limite = int(os.getenv("EXTERNO_MAX_POR_HOST", self._limitador.limite))
+        await self._cliente.iniciar()
+
+    async def fechar(self) -> None:
+        await self._cliente.fechar()
+
+    async def buscar_json(self, url: str, ttl: Optional[float] = None) -> Any:
+        """
+        Faz GET em uma URL externa e retorna o JSON da resposta
+
+        Args:
+            url: URL completa do recurso
+            ttl: TTL específico do cache para esta URL (0 desativa o cache)
+
+        Raises:
+            httpx.HTTPError: Falha de conexão, timeout ou status HTTP de erro
+        """
+        usar_cache = ttl != 0
+        if usar_cache:
+            dados = self.cache.obter(url)
+            if dados is not None:
+                return dados
+
+        dados = await self._colapsador.executar(url, lambda: self._requisitar(url))
+        if usar_cache:
+            self.cache.definir(url, dados, ttl=ttl)
+        return dados
+
+    async def _requisitar(self, url: str) -> Any:
+        host = httpx.URL(url).host
+        async with self._limitador(host):
+            response = await self._cliente.obter().get(url)
+            response.raise_for_status()
+            return response.json()
+
+    def estatisticas(self) -> Dict[str, Any]:
+        return {
+            "cache": self.cache.estatisticas(),
+            "em_andamento": len(self._colapsador),
+            "requisicoes_agrupadas": self._colapsador.compartilhadas
+        }
+
+
+# Cliente externo compartilhado (iniciado/fechado no lifespan da aplicação)
+cliente_externo = ClienteExterno()
+
+
+async def buscar_externo(url: str, ttl: Optional[float] = None) -> Any:
+    """Função helper para buscar JSON de uma API externa"""
+    return await cliente_externo.buscar_json(url, ttl=ttl)
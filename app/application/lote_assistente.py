@@ -0,0 +1,133 @@
+"""
+Módulo de Lote do Assistente - Mock ERP Application
+Processamento de listas de perguntas ao assistente de IA com paralelismo limitado
+"""
+import asyncio
+import os
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from .analise_pergunta import enriquecer_perguntas
+from .solicitacoes import (
+    GerenciadorSolicitacoes,
+    criar_solicitacao_assistente_virtual,
+    enviar_para_assistente_ia
+)
+
+
+def paralelismo_lote() -> int:
+    """Chamadas simultâneas ao assistente por lote (ASSISTENTE_IA_LOTE_PARALELISMO)"""
+    return max(1, int(os.getenv("ASSISTENTE_IA_LOTE_PARALELISMO", 8)))
+
+
+def max_itens_lote() -> int:
+    """Tamanho máximo de um lote (ASSISTENTE_IA_LOTE_MAX_ITENS)"""
+    return int(os.getenv("ASSISTENTE_IA_LOTE_MAX_ITENS", 500))
+
+
+async def processar_lote_assistente(
+    itens: List[Dict[str, Any]],
+    paralelismo: Optional[int] = None
+) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+    """
+    Processa um lote de perguntas, gerando (índice, resultado) à medida que terminam
+
+    Cada item (user_data, product_data, user_question, request_id) ganha seu
+    próprio registro local antes de qualquer chamada, com o status próprio
+    (pendente, processando, concluida ou erro). O enriquecimento do lote é
+    feito de uma vez, com perguntas repetidas analisadas uma única vez, e no
+    máximo `paralelismo` itens ficam em andamento junto ao assistente (cache,
+    agrupamento, antepara e disjuntor continuam valendo por item). O
+    resultado de cada item tem o formato de enviar_para_assistente_ia.
+
+    Se o consumidor desistir no meio, os itens ainda não concluídos são
+    cancelados e seus registros terminam como "erro".
+    """
+    paralelismo = paralelismo or paralelismo_lote()
+
+    solicitacoes = [
+        criar_solicitacao_assistente_virtual(
+            user_data=item.get("user_data"),
+            pergunta=item["user_question"],
+            contexto_produto={"modulo": item.get("product_data")}
+        )
+        for item in itens
+    ]
+
+    # Itens sem dados do módulo falham na hora, sem chamar o assistente
+    validos = [indice for indice, item in enumerate(itens) if item.get("product_data")]
+    enriquecimentos = enriquecer_perguntas(
+        (itens[indice]["user_question"], itens[indice]["product_data"]) for indice in validos
+    )
+
+    semaforo = asyncio.Semaphore(paralelismo)
+
+    async def processar(indice: int, enriquecimento: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+        item = itens[indice]
+        async with semaforo:
+            try:
+                resultado = await enviar_para_assistente_ia(
+                    item.get("user_data"),
+                    item["product_data"],
+                    item["user_question"],
+                    request_id=item.get("request_id"),
+                    solicitacao_local=solicitacoes[indice],
+                    enriquecimento=enriquecimento
+                )
+            except Exception as e:
+                print(f"❌ Erro no item {indice} do lote: {e}")
+                GerenciadorSolicitacoes.atualizar_status(solicitacoes[indice]["id"], "erro")
+                resultado = {
+                    "success": False,
+                    "error": f"Erro inesperado: {str(e)}",
+                    "request_id": item.get("request_id") or "",
+                    "local_id": solicitacoes[indice]["id"],
+                    "unexpected_error": True
+                }
+        return indice, resultado
+
+    tarefas = [
+        asyncio.create_task(processar(indice, enriquecimento))
+        for indice, enriquecimento in zip(validos, enriquecimentos)
+    ]
+    concluidos = set()
+    try:
+        for indice, item in enumerate(itens):
+            if not item.get("product_data"):
+                GerenciadorSolicitacoes.atualizar_status(solicitacoes[indice]["id"], "erro")
+                concluidos.add(indice)
+                yield indice, {
+                    "success": False,
+                    "error": "Dados insuficientes: module ou product são obrigatórios",
+                    "request_id": item.get("request_id") or "",
+                    "local_id": solicitacoes[indice]["id"],
+                    "fallback_response": "Por favor, preencha os dados do formulário antes de usar o assistente."
+                }
+
+        for proxima in asyncio.as_completed(tarefas):
+            indice, resultado = await proxima
+            concluidos.add(indice)
+            yield indice, resultado
+    finally:
+        pendentes = [tarefa for tarefa in tarefas if not tarefa.done()]
+        for tarefa in pendentes:
+            tarefa.cancel()
+        if pendentes:
+            await asyncio.gather(*pendentes, return_exceptions=True)
+            print(f"🛑 Lote interrompido: {len(pendentes)} itens cancelados")
+        for indice in validos:
+            if indice in concluidos:
+                continue
+            solicitacao = GerenciadorSolicitacoes.buscar_solicitacao(solicitacoes[indice]["id"])
+            if solicitacao is not None and solicitacao["status"] not in ("concluida", "erro"):
+                GerenciadorSolicitacoes.atualizar_status(solicitacao["id"], "erro")
+
+
+async def processar_lote_ordenado(
+    itens: List[Dict[str, Any]],
+    paralelismo: Optional[int] = None
+) -> List[Dict[str, Any]]:
+    """Processa o lote inteiro e retorna os resultados na ordem dos itens"""
+    resultados: List[Dict[str, Any]] = [{} for _ in itens]
+    async for indice, resultado in processar_lote_assistente(itens, paralelismo):
+        resultados[indice] = resultado
+    return resultados
@@ -0,0 +1,151 @@
+"""
+Módulo de Registro - Mock ERP Application
+Representação compacta (__slots__) das solicitações guardadas em memória
+"""
+import sys
+from collections.abc import MutableMapping
+from datetime import datetime
+from typing import Any, Dict, Iterator, Optional
+
+
+# Campos com slot próprio (os das solicitações do assistente, as mais numerosas)
+CAMPOS_FIXOS = (
+    "id", "user_id", "user_name", "user_email", "tipo", "status", "prioridade",
+    "pergunta", "contexto_produto", "resposta", "tokens_utilizados", "tempo_resposta",
+    "created_at", "updated_at"
+)
+
+# Valores de um conjunto pequeno e repetido: internados, todos os registros apontam para a mesma string
+CAMPOS_INTERNADOS = frozenset(("tipo", "status", "prioridade"))
+
+# Guardados como epoch (float) e devolvidos como datetime
+CAMPOS_DATA = frozenset(("created_at", "updated_at"))
+
+_FIXOS = frozenset(CAMPOS_FIXOS)
+
+
+class _Ausente:
+    """Marca slots de campos que o registro não tem (ex.: pergunta em solicitações de produto)"""
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "<ausente>"
+
+
+_AUSENTE = _Ausente()
+
+
+def _interno(valor: Any) -> Any:
+    return sys.intern(valor) if type(valor) is str else valor
+
+
+def _para_epoch(valor: Any) -> Any:
+    return valor.timestamp() if isinstance(valor, datetime) else valor
+
+
+class RegistroSolicitacao(MutableMapping):
+    """
+    Solicitação com slots em vez de um dict por registro
+
+    Cada registro guarda só ponteiros nos slots dos campos comuns; tipo,
+    status e prioridade são strings internadas (compartilhadas entre todos
+    os registros) e created_at/updated_at ficam como epoch em float em vez
+    de objetos datetime. Campos fora de CAMPOS_FIXOS (ex.: acao, categoria,
+    compactada) vão para um dict de extras criado só quando necessário.
+
+    Mantém o acesso de dict usado pelo resto da aplicação: registro["status"],
+    get, in, items, atribuição e remoção de chaves, dict(registro) e
+    registro.copy() (que devolve um dict comum). Datas lidas voltam como
+    datetime e datas atribuídas são convertidas.
+    """
+
+    __slots__ = CAMPOS_FIXOS + ("_extras",)
+
+    def __init__(self, dados: Optional[Dict[str, Any]] = None):
+        for campo in CAMPOS_FIXOS:
+            object.__setattr__(self, campo, _AUSENTE)
+        self._extras: Optional[Dict[str, Any]] = None
+        if dados:
+            for chave, valor in dados.items():
+                self[chave] = valor
+
+    def __getitem__(self, chave: str) -> Any:
+        if chave in _FIXOS:
+            valor = getattr(self, chave)
+            if valor is _AUSENTE:
+                raise KeyError(chave)
+            if chave in CAMPOS_DATA and valor is not None:
+                return datetime.fromtimestamp(valor)
+            return valor
+        if self._extras is not None and chave in self._extras:
+            return self._extras[chave]
+        raise KeyError(chave)
+
+    def get(self, chave: str, padrao: Any = None) -> Any:
+        # Sem passar por KeyError: get é o acesso mais comum nos índices e contadores
+        if chave in _FIXOS:
+            valor = getattr(self, chave)
+            if valor is _AUSENTE:
+                return padrao
+            if chave in CAMPOS_DATA and valor is not None:
+                return datetime.fromtimestamp(valor)
+            return valor
+        if self._extras is not None:
+            return self._extras.get(chave, padrao)
+        return padrao
+
+    def __setitem__(self, chave: str, valor: Any) -> None:
+        if chave in _FIXOS:
+            if chave in CAMPOS_INTERNADOS:
+                valor = _interno(valor)
+            elif chave in CAMPOS_DATA:
+                valor = _para_epoch(valor)
+            setattr(self, chave, valor)
+            return
+        if self._extras is None:
+            self._extras = {}
+        self._extras[chave] = valor
+
+    def __delitem__(self, chave: str) -> None:
+        if chave in _FIXOS:
+            if getattr(self, chave) is _AUSENTE:
+                raise KeyError(chave)
+            setattr(self, chave, _AUSENTE)
+            return
+        if self._extras is None or chave not in self._extras:
+            raise KeyError(chave)
+        del self._extras[chave]
+        if not self._extras:
+            self._extras = None
+
+    def __contains__(self, chave: object) -> bool:
+        if chave in _FIXOS:
+            return getattr(self, chave) is not _AUSENTE
+        return self._extras is not None and chave in self._extras
+
+    def __iter__(self) -> Iterator[str]:
+        for campo in CAMPOS_FIXOS:
+            if getattr(self, campo) is not _AUSENTE:
+                yield campo
+        if self._extras is not None:
+            yield from self._extras
+
+    def __len__(self) -> int:
+        total = sum(1 for campo in CAMPOS_FIXOS if getattr(self, campo) is not _AUSENTE)
+        return total + (len(self._extras) if self._extras is not None else 0)
+
+    def valores_proprios(self) -> Iterator[Any]:
+        """Valores como guardados (datas em epoch), sem os internados compartilhados entre registros"""
+        for campo in CAMPOS_FIXOS:
+            if campo not in CAMPOS_INTERNADOS:
+                valor = getattr(self, campo)
+                if valor is not _AUSENTE:
+                    yield valor
+        if self._extras is not None:
+            yield self._extras
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"RegistroSolicitacao({self.copy()!r})"
@@ -0,0 +1,316 @@
+"""
+Módulo de Retenção - Mock ERP Application
+Limites de quantidade, idade e memória para o histórico de solicitações
+"""
+import asyncio
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .armazenamento import CAMPOS_CONTADOS, RepositorioSolicitacoes
+from .registro import RegistroSolicitacao
+
+
+STATUS_FINAIS = ("concluida", "erro")
+
+# Campos com payloads grandes descartados na compactação
+CAMPOS_COMPACTADOS = ("contexto_produto", "dados_produto")
+
+# Registros tratados entre duas devoluções do loop de eventos durante a varredura
+TAMANHO_BLOCO_VARREDURA = 500
+
+
+def estimar_bytes(valor: Any) -> int:
+    """Tamanho aproximado de um registro em memória (objetos + conteúdo aninhado)"""
+    if isinstance(valor, RegistroSolicitacao):
+        # Valores internados são compartilhados entre registros e não entram na conta
+        return sys.getsizeof(valor) + sum(estimar_bytes(item) for item in valor.valores_proprios())
+    if isinstance(valor, dict):
+        return sys.getsizeof(valor) + sum(estimar_bytes(chave) + estimar_bytes(item) for chave, item in valor.items())
+    if isinstance(valor, (list, tuple)):
+        return sys.getsizeof(valor) + sum(estimar_bytes(item) for item in valor)
+    return sys.getsizeof(valor)
+
+
+class RetencaoSolicitacoes:
+    """
+    Política de retenção do histórico de solicitações
+
+    Uma varredura periódica (a cada `intervalo` segundos) percorre o
+    repositório em ordem de criação e:
+
+    - compacta registros finalizados ("concluida"/"erro") há mais de
+      `compactar_apos` segundos: contexto_produto/dados_produto viram apenas
+      o tipo do módulo e a resposta é truncada em `max_resposta` caracteres;
+    - remove os criados há mais de `ttl` segundos;
+    - enquanto houver mais de `max_registros` registros ou o tamanho
+      estimado passar de `max_bytes`, remove os mais antigos, primeiro os
+      finalizados e só depois os em andamento.
+
+    Em repositórios fora da memória (SQLite) só valem o TTL e o limite de
+    registros, aplicados em SQL (remover_criadas_antes /
+    remover_mais_antigas); compactação e `max_bytes` medem objetos em
+    memória e ficam só para o repositório em memória.
+
+    Os valores de status, tipo e prioridade dos removidos são acumulados
+    aqui, para as estatísticas continuarem contando todas as solicitações
+    já feitas. Limites iguais a 0 ficam desativados.
+    """
+
+    def __init__(
+        self,
+        repositorio: Callable[[], RepositorioSolicitacoes],
+        max_registros: int = 100000,
+        ttl: float = 7 * 24 * 3600.0,
+        max_bytes: int = 256 * 1024 * 1024,
+        compactar_apos: float = 300.0,
+        max_resposta: int = 500,
+        intervalo: float = 30.0
+    ):
+        self._repositorio = repositorio
+        self.max_registros = max_registros
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        self.compactar_apos = compactar_apos
+        self.max_resposta = max_resposta
+        self.intervalo = intervalo
+        # ID -> (marcador de versão, bytes estimados); reaproveitado entre varreduras
+        self._tamanhos: Dict[str, Tuple[Any, int]] = {}
+        self._removidas: Dict[str, Dict[Any, int]] = {campo: {} for campo in CAMPOS_CONTADOS}
+        self.total_removidas = 0
+        self.removidas_ttl = 0
+        self.removidas_limite = 0
+        self.compactadas = 0
+        self.bytes_estimados = 0
+        self.varreduras = 0
+        self.ultima_varredura_ms = 0.0
+        self._tarefa: Optional[asyncio.Task] = None
+
+    def configurar(self) -> None:
+        """Aplica os limites SOLICITACOES_* definidos no ambiente"""
+        self.max_registros = int(os.getenv("SOLICITACOES_MAX_REGISTROS", self.max_registros))
+        self.ttl = float(os.getenv("SOLICITACOES_TTL", self.ttl))
+        self.max_bytes = int(float(os.getenv("SOLICITACOES_MAX_MB", self.max_bytes / (1024 * 1024))) * 1024 * 1024)
+        self.compactar_apos = float(os.getenv("SOLICITACOES_COMPACTAR_APOS", self.compactar_apos))
+        self.max_resposta = int(os.getenv("SOLICITACOES_MAX_RESPOSTA_COMPACTADA", self.max_resposta))
+        self.intervalo = float(os.getenv("SOLICITACOES_RETENCAO_INTERVALO", self.intervalo))
+
+    def iniciar(self) -> None:
+        """Configura e inicia a varredura periódica"""
+        if self._tarefa is not None:
+            return
+        self.configurar()
+        self._tarefa = asyncio.create_task(self._varrer_continuamente())
+
+    async def parar(self) -> None:
+        if self._tarefa is not None:
+            self._tarefa.cancel()
+            try:
+                await self._tarefa
+            except asyncio.CancelledError:
+                pass
+            self._tarefa = None
+
+    async def _varrer_continuamente(self) -> None:
+        while True:
+            await asyncio.sleep(self.intervalo)
+            try:
+                resultado = await self.varrer()
+            except Exception as e:
+                print(f"❌ Erro na retenção de solicitações: {e}")
+                continue
+            if resultado["removidas"] or resultado["compactadas"]:
+                print(
+                    f"🧹 Retenção: {resultado['removidas']} removidas, {resultado['compactadas']} compactadas, "
+                    f"{resultado['registros']} registros (~{resultado['bytes'] // 1024} KB)"
+                )
+
+    # Varredura
+
+    def _compactar(self, repositorio: RepositorioSolicitacoes, solicitacao: Dict[str, Any]) -> Dict[str, Any]:
+        campos: Dict[str, Any] = {"compactada": True}
+        for campo in CAMPOS_COMPACTADOS:
+            valor = solicitacao.get(campo)
+            if isinstance(valor, dict):
+                modulo = valor.get("modulo")
+                tipo_modulo = modulo.get("type") if isinstance(modulo, dict) else None
+                # Mantém o formato {"modulo": {...}} lido por processar_solicitacao_assistente
+                campos[campo] = {"modulo": {"type": tipo_modulo}} if tipo_modulo else None
+            elif valor is not None:
+                campos[campo] = None
+        resposta = solicitacao.get("resposta")
+        if isinstance(resposta, str) and len(resposta) > self.max_resposta:
+            campos["resposta"] = resposta[:self.max_resposta] + "…"
+        self.compactadas += 1
+        return repositorio.atualizar(solicitacao["id"], **campos) or solicitacao
+
+    def _tamanho(self, solicitacao: Dict[str, Any]) -> int:
+        marcador = (solicitacao.get("updated_at"), solicitacao.get("compactada"))
+        anterior = self._tamanhos.get(solicitacao["id"])
+        if anterior is not None and anterior[0] == marcador:
+            return anterior[1]
+        tamanho = estimar_bytes(solicitacao)
+        self._tamanhos[solicitacao["id"]] = (marcador, tamanho)
+        return tamanho
+
+    def _contabilizar(self, removida: Dict[str, Any]) -> None:
+        for campo, padrao in CAMPOS_CONTADOS.items():
+            valor = removida.get(campo)
+            valor = padrao if valor is None else valor
+            self._removidas[campo][valor] = self._removidas[campo].get(valor, 0) + 1
+        self.total_removidas += 1
+
+    def _remover(self, repositorio: RepositorioSolicitacoes, solicitacao_id: str) -> bool:
+        removida = repositorio.remover(solicitacao_id)
+        self._tamanhos.pop(solicitacao_id, None)
+        if removida is None:
+            return False
+        self._contabilizar(removida)
+        return True
+
+    async def varrer(self) -> Dict[str, int]:
+        """
+        Aplica compactação, TTL e limites uma vez; retorna o que foi feito
+
+        Roda em blocos de TAMANHO_BLOCO_VARREDURA registros, devolvendo o
+        loop de eventos entre um bloco e o seguinte.
+        """
+        inicio = time.perf_counter()
+        repositorio = self._repositorio()
+        if repositorio.registros_em_memoria:
+            resultado = await self._varrer_memoria(repositorio)
+        else:
+            resultado = await self._varrer_fora_da_memoria(repositorio)
+        self.varreduras += 1
+        self.ultima_varredura_ms = (time.perf_counter() - inicio) * 1000
+        return resultado
+
+    async def _varrer_fora_da_memoria(self, repositorio: RepositorioSolicitacoes) -> Dict[str, int]:
+        """TTL e limite de registros em SQL, pelos índices do repositório (sem compactação nem limite de bytes)"""
+        removidas = 0
+        if self.ttl > 0:
+            expira_antes = datetime.now() - timedelta(seconds=self.ttl)
+            while True:
+                bloco = repositorio.remover_criadas_antes(expira_antes, TAMANHO_BLOCO_VARREDURA)
+                for removida in bloco:
+                    self._contabilizar(removida)
+                removidas += len(bloco)
+                self.removidas_ttl += len(bloco)
+                if not bloco:
+                    break
+                await asyncio.sleep(0)
+
+        if self.max_registros > 0:
+            for status in (STATUS_FINAIS, None):
+                while len(repositorio) > self.max_registros:
+                    quantidade = min(len(repositorio) - self.max_registros, TAMANHO_BLOCO_VARREDURA)
+                    bloco = repositorio.remover_mais_antigas(quantidade, status)
+                    for removida in bloco:
+                        self._contabilizar(removida)
+                    removidas += len(bloco)
+                    self.removidas_limite += len(bloco)
+                    if not bloco:
+                        break
+                    await asyncio.sleep(0)
+
+        self.bytes_estimados = 0
+        return {"removidas": removidas, "compactadas": 0, "registros": len(repositorio), "bytes": 0}
+
+    async def _varrer_memoria(self, repositorio: RepositorioSolicitacoes) -> Dict[str, int]:
+        agora = datetime.now()
+        compactar_antes = agora - timedelta(seconds=self.compactar_apos) if self.compactar_apos >= 0 else None
+        compactadas_antes = self.compactadas
+
+        # Cópia da ordem atual: o repositório pode mudar enquanto a varredura cede o loop
+        registros: List[Dict[str, Any]] = list(repositorio)
+        tamanhos: Dict[str, int] = {}
+        total_bytes = 0
+        for indice, solicitacao in enumerate(registros):
+            if indice and indice % TAMANHO_BLOCO_VARREDURA == 0:
+                await asyncio.sleep(0)
+            if (
+                compactar_antes is not None
+                and not solicitacao.get("compactada")
+                and solicitacao.get("status") in STATUS_FINAIS
+                and solicitacao["updated_at"] <= compactar_antes
+            ):
+                solicitacao = self._compactar(repositorio, solicitacao)
+                registros[indice] = solicitacao
+            tamanho = self._tamanho(solicitacao)
+            tamanhos[solicitacao["id"]] = tamanho
+            total_bytes += tamanho
+        # Descarta estimativas de registros que já não existem
+        for solicitacao_id in [chave for chave in self._tamanhos if chave not in tamanhos]:
+            del self._tamanhos[solicitacao_id]
+
+        removidas: Dict[str, None] = {}
+        restantes = len(registros)
+
+        if self.ttl > 0:
+            expira_antes = agora - timedelta(seconds=self.ttl)
+            for indice, solicitacao in enumerate(registros):
+                if solicitacao["created_at"] >= expira_antes:
+                    break
+                if indice and indice % TAMANHO_BLOCO_VARREDURA == 0:
+                    await asyncio.sleep(0)
+                if self._remover(repositorio, solicitacao["id"]):
+                    removidas[solicitacao["id"]] = None
+                    restantes -= 1
+                    total_bytes -= tamanhos[solicitacao["id"]]
+                    self.removidas_ttl += 1
+
+        def excedido() -> bool:
+            return (
+                (self.max_registros > 0 and restantes > self.max_registros)
+                or (self.max_bytes > 0 and total_bytes > self.max_bytes)
+            )
+
+        for somente_finais in (True, False):
+            for indice, solicitacao in enumerate(registros):
+                if not excedido():
+                    break
+                if indice and indice % TAMANHO_BLOCO_VARREDURA == 0:
+                    await asyncio.sleep(0)
+                if solicitacao["id"] in removidas:
+                    continue
+                if somente_finais and solicitacao.get("status") not in STATUS_FINAIS:
+                    continue
+                if self._remover(repositorio, solicitacao["id"]):
+                    removidas[solicitacao["id"]] = None
+                    restantes -= 1
+                    total_bytes -= tamanhos[solicitacao["id"]]
+                    self.removidas_limite += 1
+
+        self.bytes_estimados = total_bytes
+        return {
+            "removidas": len(removidas),
+            "compactadas": self.compactadas - compactadas_antes,
+            "registros": restantes,
+            "bytes": total_bytes
+        }
+
+    # Estatísticas
+
+    def somar_removidas(self, campo: str, contagem: Dict[Any, int]) -> Dict[Any, int]:
+        """Contagem do repositório somada às das solicitações já removidas"""
+        total = dict(contagem)
+        for valor, quantidade in self._removidas[campo].items():
+            total[valor] = total.get(valor, 0) + quantidade
+        return total
+
+    def estatisticas(self) -> Dict[str, Any]:
+        return {
+            "max_registros": self.max_registros,
+            "ttl": self.ttl,
+            "max_bytes": self.max_bytes,
+            "compactar_apos": self.compactar_apos,
+            "bytes_estimados": self.bytes_estimados,
+            "removidas": self.total_removidas,
+            "removidas_ttl": self.removidas_ttl,
+            "removidas_limite": self.removidas_limite,
+            "compactadas": self.compactadas,
+            "varreduras": self.varreduras,
+            "ultima_varredura_ms": round(self.ultima_varredura_ms, 2)
+        }
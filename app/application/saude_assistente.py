@@ -0,0 +1,133 @@
+"""
+Módulo de Saúde do Assistente - Mock ERP Application
+Sonda periódica e assíncrona do /health do assistente de IA com resultado em cache
+"""
+import asyncio
+import os
+import statistics
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Deque, Dict, Optional
+
+import httpx
+
+from .cliente_http import obter_cliente_assistente
+
+
+ASSISTENTE_IA_HEALTH_URL = "http://localhost:8001/health"
+
+
+class MonitorSaudeAssistente:
+    """
+    Monitora a saúde do assistente de IA em segundo plano
+
+    Uma tarefa assíncrona sonda o endpoint de health em intervalo fixo e
+    guarda o último resultado e um histórico de latências. Consultas de
+    status apenas leem esse snapshot, então muitos dashboards consultando
+    ao mesmo tempo não geram várias sondagens ao serviço.
+    """
+
+    def __init__(
+        self,
+        url: str = ASSISTENTE_IA_HEALTH_URL,
+        intervalo: float = 15.0,
+        timeout: float = 5.0,
+        tamanho_historico: int = 60
+    ):
+        self.url = url
+        self.intervalo = intervalo
+        self.timeout = timeout
+        self._latencias: Deque[float] = deque(maxlen=tamanho_historico)
+        self._falhas_consecutivas = 0
+        self._tarefa: Optional[asyncio.Task] = None
+        self._snapshot: Dict[str, Any] = {
+            "available": False,
+            "status": "desconhecido",
+            "error": "Nenhuma verificação realizada ainda",
+            "checked_at": None
+        }
+
+    async def sondar(self) -> Dict[str, Any]:
+        """Executa uma verificação de health agora e atualiza o snapshot"""
+        inicio = time.perf_counter()
+        try:
+            client = obter_cliente_assistente()
+            response = await client.get(self.url, timeout=self.timeout)
+            latencia = time.perf_counter() - inicio
+            self._latencias.append(latencia)
+
+            if response.status_code == 200:
+                self._falhas_consecutivas = 0
+                resultado = {
+                    "available": True,
+                    "status": "online",
+                    "response_time": latencia,
+                    "service_info": response.json() if response.headers.get("content-type", "").startswith("application/json") else None
+                }
+            else:
+                self._falhas_consecutivas += 1
+                resultado = {
+                    "available": False,
+                    "status": "error",
+                    "response_time": latencia,
+                    "error": f"HTTP {response.status_code}"
+                }
+        except (httpx.HTTPError, ValueError) as e:
+            self._falhas_consecutivas += 1
+            resultado = {
+                "available": False,
+                "status": "offline",
+                "error": str(e) or e.__class__.__name__
+            }
+
+        resultado["checked_at"] = datetime.now().isoformat()
+        resultado["falhas_consecutivas"] = self._falhas_consecutivas
+        self._snapshot = resultado
+        return self.snapshot()
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Retorna o último resultado em cache com estatísticas de latência"""
+        snapshot = dict(self._snapshot)
+        if self._latencias:
+            latencias = sorted(self._latencias)
+            snapshot["latencia"] = {
+                "amostras": len(latencias),
+                "media": statistics.fmean(latencias),
+                "p50": latencias[len(latencias) // 2],
+                "p95": latencias[min(len(latencias) - 1, int(len(latencias) * 0.95))],
+                "max": latencias[-1]
+            }
+        snapshot["monitor_ativo"] = self.ativo
+        return snapshot
+
+    @property
+    def ativo(self) -> bool:
+        return self._tarefa is not None and not self._tarefa.done()
+
+    async def _executar(self) -> None:
+        while True:
+            await self.sondar()
+            await asyncio.sleep(self.intervalo)
+
+    def iniciar(self) -> None:
+        """Inicia a tarefa de sondagem no loop atual (intervalo via ASSISTENTE_IA_HEALTH_INTERVALO)"""
+        if self.ativo:
+            return
+        self.intervalo = float(os.getenv("ASSISTENTE_IA_HEALTH_INTERVALO", self.intervalo))
+        self._tarefa = asyncio.create_task(self._executar())
+
+    async def parar(self) -> None:
+        """Cancela a tarefa de sondagem"""
+        if self._tarefa is None:
+            return
+        self._tarefa.cancel()
+        try:
+            await self._tarefa
+        except asyncio.CancelledError:
+            pass
+        self._tarefa = None
+
+
+# Monitor compartilhado (iniciado/parado no lifespan da aplicação)
+monitor_saude_assistente = MonitorSaudeAssistente()
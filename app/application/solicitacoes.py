@@ -3,13 +3,32 @@ Módulo de Solicitações - Mock ERP Application
 Gerencia as solicitações e interações do sistema
 """
 from datetime import datetime
-from typing import Dict, List, Optional, Any
+import json
+from typing import Dict, List, Optional, Any, Tuple
 from pydantic import BaseModel
 import uuid
 import httpx
 import asyncio
+import os
 import time
 
+from .armazenamento import ArmazenamentoSolicitacoes, RepositorioSolicitacoes, criar_armazenamento
+from .escrita_adiada import RepositorioEscritaAdiada
+from .retencao import RetencaoSolicitacoes
+from .cache_respostas import cache_respostas
+from .analise_pergunta import (
+    analisar_pergunta,
+    cache_enriquecimento,
+    detectar_categoria,
+    enriquecer_pergunta
+)
+from .cliente_http import fechar_cliente_assistente, obter_cliente_assistente
+from .concorrencia import Antepara, ColapsadorRequisicoes, FilaCheia
+from .disjuntor import disjuntor_assistente
+from .eventos import eventos_solicitacoes
+from .fila_feedback import FilaFeedbackDuravel
+from .saude_assistente import monitor_saude_assistente
+
 
 class SolicitacaoCreate(BaseModel):
     """Modelo para criação de solicitações seguindo o padrão do assistente de IA"""
@@ -85,8 +104,80 @@ class SolicitacaoSuporte(SolicitacaoBase):
     nivel_urgencia: str = 'normal'
 
 
-# Simulação de banco de dados em memória
-solicitacoes_db: List[Dict[str, Any]] = []
+# Repositório das solicitações: em memória até o lifespan aplicar DATABASE_URL (iniciar_armazenamento)
+solicitacoes_db: RepositorioSolicitacoes = ArmazenamentoSolicitacoes()
+_tarefa_confirmacao: Optional[asyncio.Task] = None
+
+# Limites de quantidade, idade e memória do histórico (varredura iniciada no lifespan)
+retencao_solicitacoes = RetencaoSolicitacoes(lambda: solicitacoes_db)
+
+# Chamadas ao assistente em andamento, agrupadas pelo payload sem dados do usuário
+_agrupador_assistente = ColapsadorRequisicoes()
+
+# Anteparas por endpoint do assistente (configuradas no lifespan via variáveis *_MAX_CONCORRENTES etc.)
+antepara_assistente = Antepara("ASSISTENTE_IA")
+antepara_feedback = Antepara("ASSISTENTE_IA_FEEDBACK", max_concorrentes=10, max_fila=200)
+
+
+def _estatisticas_agrupamento() -> Dict[str, Any]:
+    return {
+        "em_andamento": len(_agrupador_assistente),
+        "requisicoes_agrupadas": _agrupador_assistente.compartilhadas
+    }
+
+
+def iniciar_armazenamento() -> None:
+    """
+    Abre o repositório indicado por DATABASE_URL (memória se vazia)
+
+    Repositórios com commit em lote (SQLite) ficam, por padrão, atrás da
+    camada de escrita adiada (DATABASE_ESCRITA_ADIADA): as escritas do
+    caminho da requisição ficam em memória e são gravadas em lote a cada
+    DATABASE_ESCRITA_INTERVALO segundos ou DATABASE_ESCRITA_LIMITE
+    registros. Sem ela, aplica DATABASE_LOTE_COMMIT /
+    DATABASE_INTERVALO_COMMIT e agenda a efetivação periódica, para que
+    escritas isoladas não fiquem pendentes.
+    """
+    global solicitacoes_db, _tarefa_confirmacao
+    repositorio = criar_armazenamento(os.getenv("DATABASE_URL"))
+    if hasattr(repositorio, "lote_commit"):
+        repositorio.lote_commit = int(os.getenv("DATABASE_LOTE_COMMIT", repositorio.lote_commit))
+        repositorio.intervalo_commit = float(os.getenv("DATABASE_INTERVALO_COMMIT", repositorio.intervalo_commit))
+        if os.getenv("DATABASE_ESCRITA_ADIADA", "True").lower() == "true":
+            repositorio = RepositorioEscritaAdiada(
+                repositorio,
+                intervalo=float(os.getenv("DATABASE_ESCRITA_INTERVALO", 0.5)),
+                limite=int(os.getenv("DATABASE_ESCRITA_LIMITE", 500))
+            )
+            repositorio.iniciar()
+        else:
+            _tarefa_confirmacao = asyncio.create_task(_confirmar_periodicamente(repositorio))
+    solicitacoes_db = repositorio
+    print(f"🗄️ Armazenamento de solicitações: {repositorio.descricao()['backend']} ({len(repositorio)} registros)")
+
+
+async def _confirmar_periodicamente(repositorio: RepositorioSolicitacoes) -> None:
+    while True:
+        await asyncio.sleep(repositorio.intervalo_commit)
+        try:
+            repositorio.confirmar()
+        except Exception as e:
+            print(f"❌ Erro ao efetivar escritas das solicitações: {e}")
+
+
+async def fechar_armazenamento() -> None:
+    """Grava as escritas pendentes e fecha o repositório (chamado no shutdown do lifespan)"""
+    global _tarefa_confirmacao
+    if _tarefa_confirmacao is not None:
+        _tarefa_confirmacao.cancel()
+        try:
+            await _tarefa_confirmacao
+        except asyncio.CancelledError:
+            pass
+        _tarefa_confirmacao = None
+    if isinstance(solicitacoes_db, RepositorioEscritaAdiada):
+        await solicitacoes_db.parar()
+    solicitacoes_db.fechar()
 
 
 class GerenciadorSolicitacoes:
@@ -124,8 +215,7 @@ class GerenciadorSolicitacoes:
             "updated_at": datetime.now()
         }
         
-        solicitacoes_db.append(solicitacao)
-        return solicitacao
+        return solicitacoes_db.inserir(solicitacao)
     
     @staticmethod
     def criar_solicitacao_produto(
@@ -157,8 +247,7 @@ class GerenciadorSolicitacoes:
             "updated_at": datetime.now()
         }
         
-        solicitacoes_db.append(solicitacao)
-        return solicitacao
+        return solicitacoes_db.inserir(solicitacao)
     
     @staticmethod
     def criar_solicitacao_suporte(
@@ -188,48 +277,49 @@ class GerenciadorSolicitacoes:
             "updated_at": datetime.now()
         }
         
-        solicitacoes_db.append(solicitacao)
-        return solicitacao
+        return solicitacoes_db.inserir(solicitacao)
     
     @staticmethod
     def buscar_solicitacao(solicitacao_id: str) -> Optional[Dict[str, Any]]:
         """Busca uma solicitação pelo ID"""
-        return next((sol for sol in solicitacoes_db if sol["id"] == solicitacao_id), None)
+        return solicitacoes_db.buscar(solicitacao_id)
     
     @staticmethod
     def listar_solicitacoes(
         user_id: Optional[int] = None,
         tipo: Optional[str] = None,
         status: Optional[str] = None,
-        limit: int = 50
+        limit: int = 50,
+        before: Optional[str] = None,
+        after: Optional[str] = None
     ) -> List[Dict[str, Any]]:
-        """Lista solicitações com filtros opcionais"""
-        
-        solicitacoes = solicitacoes_db.copy()
-        
-        if user_id:
-            solicitacoes = [sol for sol in solicitacoes if sol.get("user_id") == user_id]
+        """
+        Lista solicitações com filtros opcionais (mais recentes primeiro)
         
-        if tipo:
-            solicitacoes = [sol for sol in solicitacoes if sol.get("tipo") == tipo]
-        
-        if status:
-            solicitacoes = [sol for sol in solicitacoes if sol.get("status") == status]
-        
-        # Ordenar por data de criação (mais recentes primeiro)
-        solicitacoes.sort(key=lambda x: x.get("created_at", datetime.min), reverse=True)
-        
-        return solicitacoes[:limit]
+        Suporta paginação por cursor: before retorna a página anterior
+        (mais antiga) a um ID e after a página seguinte (mais recente).
+        """
+        return solicitacoes_db.listar(
+            user_id=user_id,
+            tipo=tipo,
+            status=status,
+            limit=limit,
+            before=before,
+            after=after
+        )
     
     @staticmethod
     def atualizar_status(solicitacao_id: str, novo_status: str) -> bool:
         """Atualiza o status de uma solicitação"""
-        solicitacao = GerenciadorSolicitacoes.buscar_solicitacao(solicitacao_id)
-        if solicitacao:
-            solicitacao["status"] = novo_status
-            solicitacao["updated_at"] = datetime.now()
-            return True
-        return False
+        solicitacao = solicitacoes_db.atualizar(
+            solicitacao_id,
+            status=novo_status,
+            updated_at=datetime.now()
+        )
+        if solicitacao is None:
+            return False
+        eventos_solicitacoes.publicar(solicitacao_id, GerenciadorSolicitacoes.resumo_status(solicitacao))
+        return True
     
     @staticmethod
     def atualizar_resposta_assistente(
@@ -241,50 +331,73 @@ class GerenciadorSolicitacoes:
         """Atualiza a resposta de uma solicitação do assistente virtual"""
         solicitacao = GerenciadorSolicitacoes.buscar_solicitacao(solicitacao_id)
         if solicitacao and solicitacao.get("tipo") == "assistente_virtual":
-            solicitacao["resposta"] = resposta
-            solicitacao["tokens_utilizados"] = tokens_utilizados
-            solicitacao["tempo_resposta"] = tempo_resposta
-            solicitacao["status"] = "concluida"
-            solicitacao["updated_at"] = datetime.now()
+            solicitacao = solicitacoes_db.atualizar(
+                solicitacao_id,
+                resposta=resposta,
+                tokens_utilizados=tokens_utilizados,
+                tempo_resposta=tempo_resposta,
+                status="concluida",
+                updated_at=datetime.now()
+            )
+            eventos_solicitacoes.publicar(solicitacao_id, GerenciadorSolicitacoes.resumo_status(solicitacao))
             return True
         return False
     
+    @staticmethod
+    def resumo_status(solicitacao: Dict[str, Any]) -> Dict[str, Any]:
+        """Resumo do progresso de uma solicitação (status e horários)"""
+        return {
+            "id": solicitacao["id"],
+            "status": solicitacao["status"],
+            "created_at": solicitacao["created_at"].isoformat(),
+            "updated_at": solicitacao["updated_at"].isoformat()
+        }
+    
     @staticmethod
     def obter_estatisticas() -> Dict[str, Any]:
-        """Retorna estatísticas das solicitações"""
-        total = len(solicitacoes_db)
+        """
+        Retorna estatísticas das solicitações
+
+        total e os contadores incluem as solicitações já removidas pela
+        retenção; armazenadas é o que ainda está no repositório.
+        """
+        armazenadas = len(solicitacoes_db)
+        total = armazenadas + retencao_solicitacoes.total_removidas
         
         if total == 0:
             return {
                 "total": 0,
+                "armazenadas": 0,
                 "por_status": {},
                 "por_tipo": {},
-                "por_prioridade": {}
+                "por_prioridade": {},
+                "cache_enriquecimento": cache_enriquecimento.estatisticas(),
+                "cache_respostas": cache_respostas.estatisticas(),
+                "agrupamento_assistente": _estatisticas_agrupamento(),
+                "antepara_assistente": antepara_assistente.estatisticas(),
+                "antepara_feedback": antepara_feedback.estatisticas(),
+                "fila_feedback": fila_feedback.estatisticas(),
+                "disjuntor_assistente": disjuntor_assistente.estado_atual(),
+                "armazenamento": solicitacoes_db.descricao(),
+                "retencao": retencao_solicitacoes.estatisticas()
             }
         
-        # Contar por status
-        status_count = {}
-        for sol in solicitacoes_db:
-            status = sol.get("status", "pendente")
-            status_count[status] = status_count.get(status, 0) + 1
-        
-        # Contar por tipo
-        tipo_count = {}
-        for sol in solicitacoes_db:
-            tipo = sol.get("tipo", "indefinido")
-            tipo_count[tipo] = tipo_count.get(tipo, 0) + 1
-        
-        # Contar por prioridade
-        prioridade_count = {}
-        for sol in solicitacoes_db:
-            prioridade = sol.get("prioridade", "normal")
-            prioridade_count[prioridade] = prioridade_count.get(prioridade, 0) + 1
-        
+        # Contadores mantidos incrementalmente pelo armazenamento e pela retenção
         return {
             "total": total,
-            "por_status": status_count,
-            "por_tipo": tipo_count,
-            "por_prioridade": prioridade_count,
+            "armazenadas": armazenadas,
+            "por_status": retencao_solicitacoes.somar_removidas("status", solicitacoes_db.contagens("status")),
+            "por_tipo": retencao_solicitacoes.somar_removidas("tipo", solicitacoes_db.contagens("tipo")),
+            "por_prioridade": retencao_solicitacoes.somar_removidas("prioridade", solicitacoes_db.contagens("prioridade")),
+            "cache_enriquecimento": cache_enriquecimento.estatisticas(),
+            "cache_respostas": cache_respostas.estatisticas(),
+            "agrupamento_assistente": _estatisticas_agrupamento(),
+            "antepara_assistente": antepara_assistente.estatisticas(),
+            "antepara_feedback": antepara_feedback.estatisticas(),
+            "fila_feedback": fila_feedback.estatisticas(),
+            "disjuntor_assistente": disjuntor_assistente.estado_atual(),
+            "armazenamento": solicitacoes_db.descricao(),
+            "retencao": retencao_solicitacoes.estatisticas(),
             "ultima_atualizacao": datetime.now()
         }
 
@@ -395,195 +508,35 @@ def gerar_resposta_simulada(pergunta: str, contexto: Dict[str, Any]) -> str:
 
 
 # Funções auxiliares para análise de solicitações
+# Cada função analisa a pergunta isoladamente; quem precisa de vários campos
+# deve usar analisar_pergunta() uma única vez (ver enviar_para_assistente_ia)
+
 def detectar_categoria_solicitacao(pergunta: str) -> str:
     """Detecta a categoria da solicitação baseada na pergunta com contexto melhorado"""
-    pergunta_lower = pergunta.lower()
-    
-    # Categorias mais específicas e contextuais
-    categorias = {
-        "user_interface": [
-            "onde", "como encontrar", "como acessar", "onde fica", "onde está",
-            "botão", "campo", "formulário", "aba", "tela", "menu", "interface"
-        ],
-        "data_entry": [
-            "como inserir", "como adicionar", "como preencher", "cadastrar",
-            "criar", "novo", "inserir", "adicionar", "registrar", "incluir"
-        ],
-        "data_edit": [
-            "como alterar", "como editar", "como modificar", "atualizar",
-            "mudar", "corrigir", "editar", "modificar", "alterar"
-        ],
-        "data_search": [
-            "como buscar", "como encontrar", "como localizar", "procurar",
-            "pesquisar", "consultar", "visualizar", "listar", "ver"
-        ],
-        "data_delete": [
-            "como excluir", "como apagar", "como remover", "deletar",
-            "excluir", "apagar", "remover", "eliminar"
-        ],
-        "business_process": [
-            "processo", "fluxo", "workflow", "etapa", "procedimento",
-            "como fazer", "passos", "sequência", "operação"
-        ],
-        "reporting": [
-            "relatório", "relatórios", "dados", "informações", "análise",
-            "dashboard", "gráfico", "exportar", "imprimir"
-        ],
-        "fiscal_tax": [
-            "nota fiscal", "nfe", "nfce", "nfse", "imposto", "tributo",
-            "fiscal", "sefaz", "xml", "chave", "cancelar", "inutilizar"
-        ],
-        "financial": [
-            "preço", "valor", "custo", "dinheiro", "pagamento", "cobrança",
-            "faturamento", "financeiro", "total", "cálculo", "desconto"
-        ],
-        "inventory": [
-            "estoque", "quantidade", "produto", "item", "inventário",
-            "disponível", "saldo", "movimentação", "entrada", "saída"
-        ],
-        "customer_management": [
-            "cliente", "clientes", "contato", "relacionamento", "crm",
-            "pessoa", "empresa", "cnpj", "cpf", "endereço"
-        ],
-        "sales": [
-            "venda", "vendas", "pedido", "orçamento", "proposta",
-            "vendedor", "comissão", "meta", "pipeline"
-        ],
-        "user_access": [
-            "usuário", "login", "senha", "acesso", "permissão", "perfil",
-            "bloqueado", "ativo", "administrador", "segurança"
-        ],
-        "system_config": [
-            "configuração", "parâmetro", "setting", "empresa", "dados",
-            "sistema", "backup", "integração", "api"
-        ],
-        "error_troubleshooting": [
-            "erro", "problema", "bug", "falha", "não funciona", "quebrado",
-            "travou", "lento", "não carrega", "deu pau"
-        ],
-        "tutorial_help": [
-            "como", "tutorial", "ajuda", "explicar", "ensinar", "mostrar",
-            "exemplo", "dica", "orientação", "instrução"
-        ]
-    }
-    
-    # Verificar categoria por palavras-chave (mais específica primeiro)
-    for categoria, palavras in categorias.items():
-        if any(palavra in pergunta_lower for palavra in palavras):
-            return categoria
-    
-    # Análise contextual adicional
-    if "?" in pergunta:
-        if any(word in pergunta_lower for word in ["onde", "qual campo", "que campo"]):
-            return "user_interface"
-        elif any(word in pergunta_lower for word in ["como fazer", "como"]):
-            return "tutorial_help"
-        else:
-            return "general_inquiry"
-    
-    # Fallback para categorias gerais
-    return "general_inquiry"
+    return detectar_categoria(pergunta)
 
 
-def detectar_subcategoria_solicitacao(pergunta: str, product_data: Dict[str, Any]) -> str:
-    """Detecta a subcategoria baseada na pergunta, dados e contexto do módulo"""
-    categoria = detectar_categoria_solicitacao(pergunta)
-    pergunta_lower = pergunta.lower()
-    
-    # Determinar módulo atual
-    module_type = product_data.get("type", "")
-    tela_atual = determinar_tela_atual(product_data)
-    
-    # Subcategorias específicas por módulo
-    if module_type:
-        module_suffix = module_type.lower().replace(" ", "_")
-        
-        # Subcategorias específicas baseadas no conteúdo da pergunta
-        if categoria == "user_interface":
-            if any(word in pergunta_lower for word in ["cnpj", "documento"]):
-                return f"field_location_{module_suffix}_documento"
-            elif any(word in pergunta_lower for word in ["email", "e-mail"]):
-                return f"field_location_{module_suffix}_email"
-            elif any(word in pergunta_lower for word in ["telefone", "fone"]):
-                return f"field_location_{module_suffix}_telefone"
-            elif any(word in pergunta_lower for word in ["endereco", "endereço"]):
-                return f"field_location_{module_suffix}_endereco"
-            else:
-                return f"interface_navigation_{module_suffix}"
-        
-        elif categoria == "data_entry":
-            return f"create_new_{module_suffix}"
-        
-        elif categoria == "data_edit":
-            return f"edit_existing_{module_suffix}"
-        
-        elif categoria == "business_process":
-            if "venda" in module_suffix:
-                return "sales_process_flow"
-            elif "fiscal" in module_suffix:
-                return "fiscal_process_flow"
-            elif "cliente" in module_suffix:
-                return "customer_process_flow"
-            else:
-                return f"process_{module_suffix}"
-    
-    # Subcategorias baseadas na tela atual
-    if tela_atual:
-        return f"{categoria}_{tela_atual}"
+def detectar_subcategoria_solicitacao(
+    pergunta: str,
+    product_data: Dict[str, Any],
+    categoria: Optional[str] = None
+) -> str:
+    """
+    Detecta a subcategoria baseada na pergunta, dados e contexto do módulo
     
-    # Fallback
-    return f"{categoria}_general"
+    A categoria já detectada pode ser informada para evitar reclassificar a pergunta.
+    """
+    return analisar_pergunta(pergunta, product_data).subcategoria(categoria)
 
 
 def extrair_palavras_chave(pergunta: str) -> List[str]:
     """Extrai palavras-chave relevantes da pergunta"""
-    import re
-    
-    # Remover pontuação e converter para minúsculas
-    pergunta_limpa = re.sub(r'[^\w\s]', '', pergunta.lower())
-    palavras = pergunta_limpa.split()
-    
-    # Palavras irrelevantes (stop words)
-    stop_words = {
-        "o", "a", "os", "as", "um", "uma", "de", "da", "do", "das", "dos", 
-        "em", "na", "no", "nas", "nos", "para", "por", "com", "como", 
-        "que", "qual", "quando", "onde", "porque", "este", "esta", "isso",
-        "é", "são", "foi", "será", "tem", "ter", "posso", "pode", "deve"
-    }
-    
-    # Filtrar palavras relevantes
-    palavras_relevantes = [palavra for palavra in palavras 
-                          if len(palavra) > 2 and palavra not in stop_words]
-    
-    return list(set(palavras_relevantes))[:10]  # Máximo 10 palavras-chave únicas
+    return analisar_pergunta(pergunta).palavras_chave()
 
 
 def extrair_topicos_abordados(pergunta: str, product_data: Dict[str, Any]) -> List[str]:
     """Extrai tópicos abordados na pergunta"""
-    topicos = []
-    pergunta_lower = pergunta.lower()
-    
-    # Tópicos baseados na pergunta
-    topicos_map = {
-        "preço": ["pricing", "cost_analysis"],
-        "custo": ["pricing", "cost_analysis"],
-        "estoque": ["inventory_management", "stock_control"],
-        "venda": ["sales_strategy", "customer_engagement"],
-        "marketing": ["marketing_strategy", "promotion"],
-        "fornecedor": ["supplier_management", "procurement"],
-        "cadastro": ["data_entry", "product_registration"],
-        "categoria": ["categorization", "product_classification"]
-    }
-    
-    for palavra, topics in topicos_map.items():
-        if palavra in pergunta_lower:
-            topicos.extend(topics)
-    
-    # Adicionar tópico da categoria do produto
-    if product_data.get("category"):
-        topicos.append(f"product_{product_data['category']}")
-    
-    return list(set(topicos))
+    return analisar_pergunta(pergunta, product_data).topicos_abordados()
 
 
 def extrair_entidades(pergunta: str, product_data: Dict[str, Any]) -> List[str]:
@@ -616,363 +569,123 @@ def extrair_entidades(pergunta: str, product_data: Dict[str, Any]) -> List[str]:
 
 def detectar_complexidade(pergunta: str) -> str:
     """Detecta a complexidade da pergunta"""
-    pergunta_lower = pergunta.lower()
-    
-    # Indicadores de alta complexidade
-    alta_complexidade = [
-        "como integrar", "análise detalhada", "estratégia", "implementar",
-        "otimizar", "automatizar", "processo completo", "workflow"
-    ]
-    
-    # Indicadores de baixa complexidade
-    baixa_complexidade = [
-        "o que é", "como faço", "onde encontro", "qual valor", "quanto custa"
-    ]
-    
-    if any(indicador in pergunta_lower for indicador in alta_complexidade):
-        return "alta"
-    elif any(indicador in pergunta_lower for indicador in baixa_complexidade):
-        return "baixa"
-    elif len(pergunta.split()) > 15:
-        return "media"
-    else:
-        return "baixa"
+    return analisar_pergunta(pergunta).complexidade()
 
 
 def detectar_sentimento(pergunta: str) -> str:
     """Detecta o sentimento da pergunta"""
-    pergunta_lower = pergunta.lower()
-    
-    # Palavras positivas
-    positivas = ["ótimo", "excelente", "bom", "gosto", "adorei", "perfeito"]
-    
-    # Palavras negativas
-    negativas = ["problema", "erro", "ruim", "não funciona", "difícil", "complicado"]
-    
-    # Palavras neutras/questionamento
-    neutras = ["como", "onde", "quando", "qual", "preciso", "quero", "gostaria"]
-    
-    if any(palavra in pergunta_lower for palavra in positivas):
-        return "positivo"
-    elif any(palavra in pergunta_lower for palavra in negativas):
-        return "negativo"
-    elif any(palavra in pergunta_lower for palavra in neutras):
-        return "neutro"
-    else:
-        return "neutro"
+    return analisar_pergunta(pergunta).sentimento()
 
 
 def gerar_tags(pergunta: str, product_data: Dict[str, Any]) -> List[str]:
     """Gera tags relevantes para a solicitação baseadas na tela atual e contexto"""
-    tags = []
-    pergunta_lower = pergunta.lower()
-    
-    # Determinar tela atual para tags específicas
-    tela_atual = determinar_tela_atual(product_data)
-    
-    # Tags específicas por módulo/tela
-    tags_por_modulo = {
-        "clientes": [
-            "clientes", "customers", "crm", "cadastro_cliente", "pessoa_fisica", "pessoa_juridica",
-            "cnpj", "cpf", "endereco", "contato", "relacionamento", "base_clientes"
-        ],
-        "produtos": [
-            "produtos", "products", "inventory", "catalogo", "estoque", "ean", "codigo_produto",
-            "categoria", "preco", "descricao", "imagem", "referencia", "gestao_produtos"
-        ],
-        "vendas": [
-            "vendas", "sales", "revenue", "faturamento", "pedidos", "orcamento", "proposta",
-            "comissao", "meta", "pipeline", "funil", "conversao", "vendedor", "gestao_vendas"
-        ],
-        "transportadoras": [
-            "transportadoras", "shipping", "logistics", "frete", "entrega", "transporte",
-            "logistica", "prazo", "rastreamento", "correios", "transportadora", "distribuicao"
-        ],
-        "notas_fiscais": [
-            "notas_fiscais", "fiscal", "nfe", "nfce", "nfse", "sefaz", "autorizacao",
-            "cancelamento", "inutilizacao", "tributacao", "impostos", "chave_acesso", "xml"
-        ],
-        "usuarios": [
-            "usuarios", "users", "acesso", "permissoes", "perfil", "login", "senha",
-            "administrador", "vendedor", "operador", "seguranca", "autenticacao", "roles"
-        ],
-        "empresa": [
-            "empresa", "company", "dados_empresa", "cnpj", "razao_social", "inscricao_estadual",
-            "configuracao", "parametros", "sede", "filial", "empresa_dados", "corporativo"
-        ]
-    }
-    
-    # Adicionar tags do módulo atual
-    if tela_atual in tags_por_modulo:
-        tags.extend(tags_por_modulo[tela_atual])
-    
-    # Tags baseadas em palavras-chave da pergunta (mais específicas)
-    palavras_chave_contextuais = {
-        # Operações CRUD
-        "como": ["tutorial", "howto", "instrucoes"],
-        "criar": ["create", "novo", "adicionar", "cadastrar"],
-        "editar": ["edit", "alterar", "modificar", "atualizar"],
-        "excluir": ["delete", "remover", "apagar"],
-        "buscar": ["search", "localizar", "encontrar", "consultar"],
-        "listar": ["list", "visualizar", "exibir", "mostrar"],
-        
-        # Problemas e dúvidas
-        "erro": ["error", "problema", "bug", "falha"],
-        "duvida": ["question", "help", "ajuda", "suporte"],
-        "nao": ["not_working", "problema", "dificuldade"],
-        "funciona": ["funcionamento", "operacao", "uso"],
-        
-        # Campos específicos por contexto
-        "cnpj": ["documento", "fiscal", "empresa"],
-        "cpf": ["documento", "pessoa_fisica", "individual"],
-        "email": ["contato", "comunicacao", "endereco_eletronico"],
-        "telefone": ["contato", "comunicacao", "fone"],
-        "endereco": ["localizacao", "address", "cep"],
-        "senha": ["password", "acesso", "login", "seguranca"],
-        "preco": ["valor", "custo", "money", "financeiro"],
-        "quantidade": ["qtd", "estoque", "inventory"],
-        "data": ["date", "periodo", "tempo"],
-        "status": ["situacao", "estado", "condicao"],
-        
-        # Ações específicas do ERP
-        "vender": ["comercial", "negocio", "revenue"],
-        "comprar": ["aquisicao", "fornecedor", "procurement"],
-        "entregar": ["delivery", "shipping", "logistica"],
-        "faturar": ["billing", "invoice", "cobranca"],
-        "pagar": ["payment", "financeiro", "contas"],
-        "receber": ["receivables", "cobranca", "entrada"],
-        
-        # Relatórios e consultas
-        "relatorio": ["report", "dashboard", "analytics"],
-        "consulta": ["query", "search", "lookup"],
-        "historico": ["history", "log", "tracking"],
-        "backup": ["backup", "copia", "seguranca"],
-        
-        # Integrações
-        "api": ["integration", "webservice", "endpoint"],
-        "xml": ["arquivo", "dados", "export"],
-        "excel": ["planilha", "import", "export"],
-        "pdf": ["documento", "impressao", "relatorio"],
-        
-        # Urgência e prioridade
-        "urgente": ["priority", "critico", "importante"],
-        "rapido": ["fast", "agil", "quick"],
-        "lento": ["slow", "performance", "otimizacao"]
-    }
-    
-    # Adicionar tags baseadas em palavras-chave contextuais
-    for palavra, tag_list in palavras_chave_contextuais.items():
-        if palavra in pergunta_lower:
-            tags.extend(tag_list)
-    
-    # Tags especiais baseadas no tipo de dados do módulo atual
-    if product_data.get("type"):
-        module_type = product_data.get("type", "")
-        
-        # Tags específicas por tipo de módulo
-        if module_type == "Clientes":
-            if any(word in pergunta_lower for word in ["cnpj", "empresa", "juridica"]):
-                tags.extend(["pessoa_juridica", "corporativo", "b2b"])
-            elif any(word in pergunta_lower for word in ["cpf", "fisica", "individual"]):
-                tags.extend(["pessoa_fisica", "individual", "b2c"])
-                
-        elif module_type == "Produtos":
-            if any(word in pergunta_lower for word in ["categoria", "tipo"]):
-                tags.extend(["classificacao", "taxonomia"])
-            if any(word in pergunta_lower for word in ["estoque", "quantidade"]):
-                tags.extend(["inventory_management", "stock_control"])
-                
-        elif module_type == "Vendas":
-            if any(word in pergunta_lower for word in ["produto", "item"]):
-                tags.extend(["produtos_venda", "carrinho", "itens"])
-            if any(word in pergunta_lower for word in ["total", "valor"]):
-                tags.extend(["calculo", "pricing", "financeiro"])
-                
-        elif module_type == "Notas Fiscais":
-            if any(word in pergunta_lower for word in ["nfe", "eletronica"]):
-                tags.extend(["nfe", "sefaz", "digital"])
-            if any(word in pergunta_lower for word in ["cancelar", "inutilizar"]):
-                tags.extend(["cancelamento", "fiscal_operations"])
-                
-        elif module_type == "Usuários":
-            if any(word in pergunta_lower for word in ["admin", "administrador"]):
-                tags.extend(["admin_rights", "super_user"])
-            if any(word in pergunta_lower for word in ["perfil", "permissao"]):
-                tags.extend(["access_control", "authorization"])
-    
-    # Tags do contexto de dados específicos
-    if product_data.get("data"):
-        data = product_data.get("data", {})
-        
-        # Se há dados preenchidos, adicionar tags de "edicao"
-        if any(str(value).strip() for value in data.values() if value):
-            tags.extend(["edicao", "dados_preenchidos", "formulario_ativo"])
-        else:
-            tags.extend(["novo_registro", "formulario_vazio", "criacao"])
-    
-    # Adicionar tags do sistema e ambiente
-    tags.extend(["mock_erp", "sistema_gestao", "erp", "web_interface"])
-    
-    # Tags de complexidade baseadas no tamanho e tipo da pergunta
-    if len(pergunta.split()) <= 3:
-        tags.append("pergunta_simples")
-    elif len(pergunta.split()) <= 8:
-        tags.append("pergunta_media")
-    else:
-        tags.append("pergunta_complexa")
-    
-    # Tags de categoria de pergunta
-    if "?" in pergunta:
-        tags.append("duvida_direta")
-    if any(word in pergunta_lower for word in ["como", "onde", "quando", "porque", "qual"]):
-        tags.append("pergunta_explicativa")
-    if any(word in pergunta_lower for word in ["preciso", "quero", "gostaria"]):
-        tags.append("solicitacao_acao")
-    
-    return list(set(tags))[:15]  # Máximo 15 tags únicas (aumentado para maior contexto)
+    return analisar_pergunta(pergunta, product_data).tags()
 
 
-def determinar_tela_atual(product_data: Dict[str, Any]) -> str:
+async def _executar_no_assistente(url: str, payload: Dict[str, Any], request_id: str) -> Tuple[int, Any]:
     """
-    Determina a tela/módulo atual baseado nos dados do produto/módulo
+    Faz o POST ao assistente de IA (cliente compartilhado com pool)
     
-    Args:
-        product_data: Dados do produto ou módulo atual
-        
     Returns:
-        String identificando a tela atual
-    """
-    # Verificar se é um módulo específico
-    if isinstance(product_data, dict):
-        module_type = product_data.get("type", "")
-        
-        if module_type == "Clientes":
-            return "clientes"
-        elif module_type == "Vendas":
-            return "vendas"
-        elif module_type == "Transportadoras":
-            return "transportadoras"
-        elif module_type == "Notas Fiscais":
-            return "notas_fiscais"
-        elif module_type == "Usuários":
-            return "usuarios"
-        elif module_type == "Empresa":
-            return "empresa"
-        elif module_type == "Produtos":
-            return "produtos"
-        
-        # Se tem categoria de produto, é tela de produtos
-        if product_data.get("category"):
-            return "produtos"
-            
-        # Se tem dados de cliente
-        if any(key in product_data for key in ["clienteNome", "clienteTipo", "clienteDocumento"]):
-            return "clientes"
-            
-        # Se tem dados de venda
-        if any(key in product_data for key in ["vendaNumero", "vendaCliente", "vendaTotal"]):
-            return "vendas"
-            
-        # Se tem dados de transportadora
-        if any(key in product_data for key in ["transpNome", "transpCnpj", "transpRegiao"]):
-            return "transportadoras"
-            
-        # Se tem dados de nota fiscal
-        if any(key in product_data for key in ["nfNumero", "nfSerie", "nfTipo"]):
-            return "notas_fiscais"
-            
-        # Se tem dados de usuário
-        if any(key in product_data for key in ["usuarioNome", "usuarioLogin", "usuarioPerfil"]):
-            return "usuarios"
-            
-        # Se tem dados de empresa
-        if any(key in product_data for key in ["empresaNome", "empresaCnpj", "empresaFantasia"]):
-            return "empresa"
+        (status HTTP, JSON da resposta se 200, senão o texto da resposta)
     
-    # Default para produtos se não conseguir determinar
-    return "produtos"
+    Raises:
+        FilaCheia: Assistente saturado (antepara sem vaga nem espaço na fila)
+    """
+    client = obter_cliente_assistente()
+    async with antepara_assistente:
+        inicio = time.perf_counter()
+        try:
+            response = await client.post(
+                url,
+                json=payload,
+                headers={
+                    "Content-Type": "application/json",
+                    "User-Agent": "MockERP/1.0",
+                    "X-Request-Source": "mock_erp",
+                    "X-Request-ID": request_id
+                }
+            )
+        except httpx.HTTPError:
+            disjuntor_assistente.registrar(False, time.perf_counter() - inicio)
+            raise
+        disjuntor_assistente.registrar(response.status_code < 500, time.perf_counter() - inicio)
+    
+    if response.status_code == 200:
+        return response.status_code, response.json()
+    return response.status_code, response.text
 
 
-async def enviar_para_assistente_ia(
+def montar_envio_assistente(
     user_data: Optional[Dict[str, Any]],
     product_data: Dict[str, Any],
     user_question: str,
-    request_id: Optional[str] = None
+    enriquecimento: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
-    Envia os dados para o endpoint /solicitacoes do assistente de IA na porta 8001
+    Monta o payload enviado ao assistente de IA e o contexto usado no cache
+
+    Compartilhado pela chamada completa (enviar_para_assistente_ia) e pela
+    transmitida (transmitir_para_assistente_ia). `enriquecimento` já
+    calculado (ex.: em lote, por enriquecer_perguntas) dispensa a análise.
     
-    Args:
-        user_data: Dados do usuário (id, name, email, active)
-        product_data: Dados do produto (code, name, category, description, etc.)
-        user_question: Pergunta/dúvida do usuário
-        request_id: ID único da solicitação (gerado automaticamente se não fornecido)
+    `payload_compartilhado` é o mesmo payload sem os campos do usuário
+    (usuario_id vazio e contexto da conversa sem o nome): só depende da
+    pergunta, do módulo e do enriquecimento, então usuários diferentes
+    fazendo a mesma pergunta na mesma tela podem dividir uma chamada.
     
     Returns:
-        Dict com a resposta do assistente ou erro
+        Dict com payload, payload_compartilhado, enriquecimento, usuario_id, tela_atual,
+        module_type e contexto_descricao
     """
-    
-    # URL do endpoint do assistente de IA
-    ASSISTENTE_IA_URL = "http://localhost:8001/solicitacoes/executar"
-    
-    # Gerar ID se não fornecido
-    if not request_id:
-        request_id = GerenciadorSolicitacoes.gerar_id()
-    
     # Extrair informações do usuário
     usuario_id = str(user_data.get("id")) if user_data and user_data.get("id") else None
     usuario_nome = user_data.get("name") if user_data else "Usuário Anônimo"
     
+    # Analisar a pergunta uma única vez (memorizado por pergunta e módulo)
+    if enriquecimento is None:
+        enriquecimento = enriquecer_pergunta(user_question, product_data)
+    
     # Determinar a tela/módulo atual baseado no tipo de dados
-    tela_atual = determinar_tela_atual(product_data)
+    tela_atual = enriquecimento["tela_atual"]
     module_type = product_data.get("type", "")
     
-    # Criar contexto da conversa baseado no módulo atual
+    # Assunto da conversa baseado no módulo atual (sem dados do usuário)
     if module_type == "Clientes":
-        contexto_descricao = f"Usuário {usuario_nome} consultando sobre gestão de clientes"
+        assunto = "gestão de clientes"
         if product_data.get("data", {}).get("nome"):
-            contexto_descricao += f" - cliente: {product_data['data']['nome']}"
+            assunto += f" - cliente: {product_data['data']['nome']}"
     elif module_type == "Vendas":
-        contexto_descricao = f"Usuário {usuario_nome} consultando sobre vendas"
+        assunto = "vendas"
         if product_data.get("data", {}).get("vendaCliente"):
-            contexto_descricao += f" - venda para: {product_data['data']['vendaCliente']}"
+            assunto += f" - venda para: {product_data['data']['vendaCliente']}"
     elif module_type == "Transportadoras":
-        contexto_descricao = f"Usuário {usuario_nome} consultando sobre transportadoras"
+        assunto = "transportadoras"
         if product_data.get("data", {}).get("transpNome"):
-            contexto_descricao += f" - transportadora: {product_data['data']['transpNome']}"
+            assunto += f" - transportadora: {product_data['data']['transpNome']}"
     elif module_type == "Notas Fiscais":
-        contexto_descricao = f"Usuário {usuario_nome} consultando sobre notas fiscais"
+        assunto = "notas fiscais"
         if product_data.get("data", {}).get("nfNumero"):
-            contexto_descricao += f" - NF: {product_data['data']['nfNumero']}"
+            assunto += f" - NF: {product_data['data']['nfNumero']}"
     elif module_type == "Usuários":
-        contexto_descricao = f"Usuário {usuario_nome} consultando sobre gestão de usuários"
+        assunto = "gestão de usuários"
         if product_data.get("data", {}).get("usuarioNome"):
-            contexto_descricao += f" - usuário: {product_data['data']['usuarioNome']}"
+            assunto += f" - usuário: {product_data['data']['usuarioNome']}"
     elif module_type == "Empresa":
-        contexto_descricao = f"Usuário {usuario_nome} consultando sobre dados da empresa"
+        assunto = "dados da empresa"
         if product_data.get("data", {}).get("empresaNome"):
-            contexto_descricao += f" - empresa: {product_data['data']['empresaNome']}"
+            assunto += f" - empresa: {product_data['data']['empresaNome']}"
     else:
         # Fallback para produtos ou dados genéricos
-        contexto_descricao = f"Usuário {usuario_nome} consultando sobre produto {product_data.get('name', 'N/A')} da categoria {product_data.get('category', 'N/A')}"
-    
-    # Criar contexto da conversa com informações do módulo
-    contexto_conversa = {
-        "usuario": user_data,
-        "modulo": product_data,
-        "tela_atual": tela_atual,
-        "sessao_id": f"erp_session_{int(time.time())}",
-        "origem": "mock_erp_dashboard",
-        "timestamp": datetime.now().isoformat()
-    }
+        assunto = f"produto {product_data.get('name', 'N/A')} da categoria {product_data.get('category', 'N/A')}"
+    contexto_descricao = f"Usuário {usuario_nome} consultando sobre {assunto}"
     
-    # Detectar categoria e subcategoria baseada na pergunta
-    categoria_solicitacao = detectar_categoria_solicitacao(user_question)
-    subcategoria = detectar_subcategoria_solicitacao(user_question, product_data)
+    # Categoria detectada na pergunta
+    categoria_solicitacao = enriquecimento["categoria"]
     
     # Extrair palavras-chave e tópicos
-    palavras_chave = extrair_palavras_chave(user_question)
-    topicos_abordados = extrair_topicos_abordados(user_question, product_data)
+    palavras_chave = enriquecimento["palavras_chave"]
+    topicos_abordados = enriquecimento["topicos_abordados"]
     
     # Preparar payload completo seguindo o formato esperado pela API
     payload = {
@@ -981,11 +694,11 @@ async def enviar_para_assistente_ia(
         "contexto_conversa": contexto_descricao,
         "historico_mensagens": [user_question],
         "categoria_solicitacao": categoria_solicitacao,
-        "tags": gerar_tags(user_question, product_data),
+        "tags": enriquecimento["tags"],
         "modulo_nome": module_type or "Sistema",
         "modulo_categoria": tela_atual,
-        "complexidade": detectar_complexidade(user_question),
-        "sentimento": detectar_sentimento(user_question),
+        "complexidade": enriquecimento["complexidade"],
+        "sentimento": enriquecimento["sentimento"],
         "palavras_chave": palavras_chave,
         "topicos_abordados": topicos_abordados,
         # Campos específicos do módulo
@@ -993,13 +706,212 @@ async def enviar_para_assistente_ia(
         "resposta_assistente": ""  # Campo obrigatório, será preenchido pela IA
     }
     
+    return {
+        "payload": payload,
+        "payload_compartilhado": {**payload, "usuario_id": None, "contexto_conversa": f"Consulta sobre {assunto}"},
+        "enriquecimento": enriquecimento,
+        "usuario_id": usuario_id,
+        "tela_atual": tela_atual,
+        "module_type": module_type,
+        "contexto_descricao": contexto_descricao
+    }
+
+
+def chave_resposta_assistente(user_question: str, envio: Dict[str, Any]) -> Tuple:
+    return cache_respostas.chave(
+        user_question,
+        envio["usuario_id"],
+        envio["contexto_descricao"],
+        envio["module_type"],
+        envio["tela_atual"]
+    )
+
+
+def resposta_em_cache_assistente(
+    chave_resposta: Tuple,
+    request_id: str,
+    local_id: str,
+    user_question: str
+) -> Optional[Dict[str, Any]]:
+    """
+    Resultado servido do cache de respostas, se a mesma pergunta no mesmo
+    contexto foi respondida recentemente (None se não houver)
+
+    Associa a solicitação local à chave (para a avaliação dela invalidar a
+    resposta) e grava a resposta no registro local.
+    """
+    resposta_cache = cache_respostas.obter(chave_resposta)
+    if resposta_cache is None:
+        return None
+    print(f"♻️ Resposta servida do cache para: {user_question}")
+    cache_respostas.associar(chave_resposta, local_id)
+    GerenciadorSolicitacoes.atualizar_resposta_assistente(
+        solicitacao_id=local_id,
+        resposta=resposta_cache["response"],
+        tokens_utilizados=0,
+        tempo_resposta=0.0
+    )
+    return {
+        **resposta_cache,
+        "request_id": request_id,
+        "tokens_used": 0,
+        "response_time": 0.0,
+        "cache": True,
+        "tokens_economizados": resposta_cache.get("tokens_used") or 0
+    }
+
+
+def resultado_falha_assistente(
+    request_id: str,
+    local_id: Optional[str],
+    erro: str,
+    resposta_simulada: Optional[str] = None,
+    **indicadores: Any
+) -> Dict[str, Any]:
+    """Resultado de falha (no formato de enviar_para_assistente_ia) e registro local marcado como erro"""
+    if local_id is not None:
+        GerenciadorSolicitacoes.atualizar_status(local_id, "erro")
+    resultado = {"success": False, "error": erro, "request_id": request_id, "local_id": local_id}
+    if resposta_simulada is not None:
+        resultado["fallback_response"] = resposta_simulada
+    resultado.update(indicadores)
+    return resultado
+
+
+def circuito_aberto_assistente(
+    request_id: str,
+    local_id: str,
+    user_question: str,
+    product_data: Dict[str, Any]
+) -> Optional[Dict[str, Any]]:
+    """Resultado com a resposta simulada se o disjuntor não deixa chamar o assistente (None se deixa)"""
+    if disjuntor_assistente.permitir():
+        return None
+    print(f"⚡ Circuito do assistente de IA {disjuntor_assistente.estado}: usando resposta simulada")
+    return resultado_falha_assistente(
+        request_id, local_id,
+        "O assistente de IA está temporariamente indisponível. Exibindo uma resposta local.",
+        gerar_resposta_simulada(user_question, {"modulo": product_data}),
+        circuit_open=True  # Indicador específico de circuito aberto
+    )
+
+
+def resultado_status_assistente(
+    request_id: str,
+    local_id: str,
+    user_question: str,
+    product_data: Dict[str, Any],
+    status_code: int,
+    conteudo: Any
+) -> Dict[str, Any]:
+    """Resultado de falha para uma resposta do assistente com status diferente de 200"""
+    print(f"❌ Erro na API de IA: Status {status_code}")
+    print(f"📄 Resposta: {conteudo}")
+    return resultado_falha_assistente(
+        request_id, local_id,
+        f"Erro na API de IA: {status_code} - {conteudo}",
+        gerar_resposta_simulada(user_question, {"modulo": product_data})
+    )
+
+
+def resultado_excecao_assistente(
+    excecao: Exception,
+    url: str,
+    request_id: str,
+    local_id: Optional[str],
+    user_question: str,
+    product_data: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Resultado de falha para uma exceção na chamada ao assistente (antepara, timeout, conexão ou inesperada)"""
+    if isinstance(excecao, FilaCheia):
+        # Assistente saturado: falhar rápido com a resposta simulada
+        print(f"🚧 Assistente de IA saturado: {excecao}")
+        return resultado_falha_assistente(
+            request_id, local_id,
+            "O assistente de IA está sobrecarregado no momento. Tente novamente em instantes.",
+            gerar_resposta_simulada(user_question, {"modulo": product_data}),
+            overloaded=True  # Indicador específico de sobrecarga
+        )
+    if isinstance(excecao, httpx.TimeoutException):
+        print("⏰ Timeout na conexão com o assistente de IA")
+        return resultado_falha_assistente(
+            request_id, local_id,
+            "A solicitação demorou mais que o esperado. Por favor, tente novamente.",
+            timeout=True  # Indicador específico de timeout
+        )
+    if isinstance(excecao, httpx.ConnectError):
+        # Serviço indisponível
+        print(f"🔌 Erro de conexão: Assistente de IA indisponível na URL {url}")
+        return resultado_falha_assistente(
+            request_id, local_id,
+            "Não foi possível conectar ao assistente de IA. Verifique se o serviço está rodando e tente novamente.",
+            connection_error=True  # Indicador específico de erro de conexão
+        )
+    return resultado_falha_assistente(
+        request_id, local_id,
+        f"Erro inesperado ao processar solicitação: {str(excecao)}. Tente novamente.",
+        unexpected_error=True  # Indicador específico de erro inesperado
+    )
+
+
+async def enviar_para_assistente_ia(
+    user_data: Optional[Dict[str, Any]],
+    product_data: Dict[str, Any],
+    user_question: str,
+    request_id: Optional[str] = None,
+    solicitacao_local: Optional[Dict[str, Any]] = None,
+    enriquecimento: Optional[Dict[str, Any]] = None
+) -> Dict[str, Any]:
+    """
+    Envia os dados para o endpoint /solicitacoes do assistente de IA na porta 8001
+    
+    Args:
+        user_data: Dados do usuário (id, name, email, active)
+        product_data: Dados do produto (code, name, category, description, etc.)
+        user_question: Pergunta/dúvida do usuário
+        request_id: ID único da solicitação (gerado automaticamente se não fornecido)
+        solicitacao_local: Registro local já criado (modo assíncrono); criado aqui se não fornecido
+        enriquecimento: Enriquecimento já calculado (lote); calculado aqui se não fornecido
+    
+    Returns:
+        Dict com a resposta do assistente ou erro
+    """
+    
+    # URL do endpoint do assistente de IA
+    ASSISTENTE_IA_URL = "http://localhost:8001/solicitacoes/executar"
+    
+    # Gerar ID se não fornecido
+    if not request_id:
+        request_id = GerenciadorSolicitacoes.gerar_id()
+    
+    # Analisar a pergunta e montar o payload
+    envio = montar_envio_assistente(user_data, product_data, user_question, enriquecimento)
+    payload = envio["payload_compartilhado"]
+    tela_atual = envio["tela_atual"]
+    categoria_solicitacao = envio["enriquecimento"]["categoria"]
+    subcategoria = envio["enriquecimento"]["subcategoria"]
+    
+    # Chave semântica da resposta: pergunta normalizada + contexto enviado à IA
+    chave_resposta = chave_resposta_assistente(user_question, envio)
+    
     try:
         # Criar solicitação local antes de enviar
-        solicitacao_local = criar_solicitacao_assistente_virtual(
-            user_data=user_data,
-            pergunta=user_question,
-            contexto_produto={"modulo": product_data}
-        )
+        if solicitacao_local is None:
+            solicitacao_local = criar_solicitacao_assistente_virtual(
+                user_data=user_data,
+                pergunta=user_question,
+                contexto_produto={"modulo": product_data}
+            )
+        
+        # Mesma pergunta no mesmo contexto respondida recentemente: não chamar a IA
+        resultado = resposta_em_cache_assistente(chave_resposta, request_id, solicitacao_local["id"], user_question)
+        if resultado is not None:
+            return resultado
+        
+        # Circuito aberto (assistente falhando ou lento): resposta simulada sem tocar a rede
+        resultado = circuito_aberto_assistente(request_id, solicitacao_local["id"], user_question, product_data)
+        if resultado is not None:
+            return resultado
         
         # Atualizar status para processando
         GerenciadorSolicitacoes.atualizar_status(solicitacao_local["id"], "processando")
@@ -1007,126 +919,82 @@ async def enviar_para_assistente_ia(
         # Log do payload que será enviado
         print(f"📤 Enviando payload para IA: {payload}")
         
-        # Fazer a requisição para o assistente de IA
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.post(
-                ASSISTENTE_IA_URL,
-                json=payload,
-                headers={
-                    "Content-Type": "application/json",
-                    "User-Agent": "MockERP/1.0",
-                    "X-Request-Source": "mock_erp",
-                    "X-Request-ID": request_id
-                }
-            )
+        # Fazer a requisição para o assistente de IA com o payload sem dados do
+        # usuário: chamadas em andamento com a mesma pergunta, módulo e
+        # enriquecimento compartilham uma única chamada; os campos de cada
+        # usuário entram depois, no registro local e no resultado
+        chave_voo = json.dumps(payload, sort_keys=True, default=str)
+        status_code, conteudo = await _agrupador_assistente.executar(
+            chave_voo,
+            lambda: _executar_no_assistente(ASSISTENTE_IA_URL, payload, request_id)
+        )
+        
+        if status_code == 200:
+            resposta_ia = conteudo
+            print(f"📥 Resposta recebida da IA: {resposta_ia}")
             
-            if response.status_code == 200:
-                resposta_ia = response.json()
-                print(f"📥 Resposta recebida da IA: {resposta_ia}")
-                
-                # Extrair dados do formato específico da resposta
-                execucao = resposta_ia.get("execucao", {})
-                processamento = resposta_ia.get("processamento", {})
-                solicitacao_salva = resposta_ia.get("solicitacao_salva", {})
-                
-                print(f"🎯 Execução: {execucao}")
-                print(f"⚙️ Processamento: {processamento}")
-                print(f"💾 Solicitação Salva: {solicitacao_salva}")
-                
-                # Atualizar solicitação local com a resposta
-                # A resposta está em execucao.resposta
-                resposta_texto = execucao.get("resposta", "")
-                if not resposta_texto:
-                    resposta_texto = execucao.get("resposta_assistente", "")
-                if not resposta_texto:
-                    resposta_texto = "Resposta não disponível"
-                    
-                tokens_utilizados = execucao.get("tokens_utilizados", 0)
-                tempo_resposta = processamento.get("tempo_processamento", 0.0)
-                
-                # Usar o ID da solicitacao_salva como identificador para feedback
-                solicitacao_id_ia = solicitacao_salva.get("id", "")
-                
-                GerenciadorSolicitacoes.atualizar_resposta_assistente(
-                    solicitacao_id=solicitacao_local["id"],
-                    resposta=resposta_texto,
-                    tokens_utilizados=tokens_utilizados,
-                    tempo_resposta=tempo_resposta
-                )
-                
-                return {
-                    "success": True,
-                    "request_id": request_id,
-                    "local_id": solicitacao_id_ia,  # Usar ID da IA para feedback
-                    "response": resposta_texto,
-                    "tokens_used": tokens_utilizados,
-                    "response_time": tempo_resposta,
-                    "ia_response": resposta_ia,
-                    "categoria": processamento.get("categoria_detectada", categoria_solicitacao),
-                    "subcategoria": subcategoria,
-                    "execucao": execucao,
-                    "processamento": processamento,
-                    "solicitacao_salva": solicitacao_salva
-                }
+            # Extrair dados do formato específico da resposta
+            execucao = resposta_ia.get("execucao", {})
+            processamento = resposta_ia.get("processamento", {})
+            solicitacao_salva = resposta_ia.get("solicitacao_salva", {})
+            
+            print(f"🎯 Execução: {execucao}")
+            print(f"⚙️ Processamento: {processamento}")
+            print(f"💾 Solicitação Salva: {solicitacao_salva}")
             
-            else:
-                # Erro na resposta da IA
-                print(f"❌ Erro na API de IA: Status {response.status_code}")
-                print(f"📄 Resposta: {response.text}")
-                error_msg = f"Erro na API de IA: {response.status_code} - {response.text}"
-                GerenciadorSolicitacoes.atualizar_status(solicitacao_local["id"], "erro")
+            # Atualizar solicitação local com a resposta
+            # A resposta está em execucao.resposta
+            resposta_texto = execucao.get("resposta", "")
+            if not resposta_texto:
+                resposta_texto = execucao.get("resposta_assistente", "")
+            if not resposta_texto:
+                resposta_texto = "Resposta não disponível"
                 
-                return {
-                    "success": False,
-                    "error": error_msg,
-                    "request_id": request_id,
-                    "local_id": solicitacao_local["id"],
-                    "fallback_response": gerar_resposta_simulada(user_question, {"modulo": product_data})
-                }
-    
-    except httpx.TimeoutException:
-        # Timeout na requisição
-        print(f"⏰ Timeout na conexão com o assistente de IA")
-        error_msg = "A solicitação demorou mais que o esperado. Por favor, tente novamente."
-        if 'solicitacao_local' in locals():
-            GerenciadorSolicitacoes.atualizar_status(solicitacao_local["id"], "erro")
-        
-        return {
-            "success": False,
-            "error": error_msg,
-            "request_id": request_id,
-            "local_id": solicitacao_local["id"] if 'solicitacao_local' in locals() else None,
-            "timeout": True  # Indicador específico de timeout
-        }
-    
-    except httpx.ConnectError:
-        # Erro de conexão (serviço indisponível)
-        print(f"🔌 Erro de conexão: Assistente de IA indisponível na URL {ASSISTENTE_IA_URL}")
-        error_msg = "Não foi possível conectar ao assistente de IA. Verifique se o serviço está rodando e tente novamente."
-        if 'solicitacao_local' in locals():
-            GerenciadorSolicitacoes.atualizar_status(solicitacao_local["id"], "erro")
+            tokens_utilizados = execucao.get("tokens_utilizados", 0)
+            tempo_resposta = processamento.get("tempo_processamento", 0.0)
+            
+            # Usar o ID da solicitacao_salva como identificador para feedback
+            solicitacao_id_ia = solicitacao_salva.get("id", "")
+            
+            GerenciadorSolicitacoes.atualizar_resposta_assistente(
+                solicitacao_id=solicitacao_local["id"],
+                resposta=resposta_texto,
+                tokens_utilizados=tokens_utilizados,
+                tempo_resposta=tempo_resposta
+            )
+            
+            resultado = {
+                "success": True,
+                "request_id": request_id,
+                "usuario_id": envio["usuario_id"],
+                "local_id": solicitacao_id_ia,  # Usar ID da IA para feedback
+                "response": resposta_texto,
+                "tokens_used": tokens_utilizados,
+                "response_time": tempo_resposta,
+                "ia_response": resposta_ia,
+                "categoria": processamento.get("categoria_detectada", categoria_solicitacao),
+                "subcategoria": subcategoria,
+                "execucao": execucao,
+                "processamento": processamento,
+                "solicitacao_salva": solicitacao_salva
+            }
+            cache_respostas.armazenar(chave_resposta, resultado, solicitacao_local["id"])
+            return resultado
         
-        return {
-            "success": False,
-            "error": error_msg,
-            "request_id": request_id,
-            "local_id": solicitacao_local["id"] if 'solicitacao_local' in locals() else None,
-            "connection_error": True  # Indicador específico de erro de conexão
-        }
+        # Erro na resposta da IA
+        return resultado_status_assistente(
+            request_id, solicitacao_local["id"], user_question, product_data, status_code, conteudo
+        )
     
     except Exception as e:
-        # Erro geral
-        error_msg = f"Erro inesperado ao processar solicitação: {str(e)}. Tente novamente."
-        if 'solicitacao_local' in locals():
-            GerenciadorSolicitacoes.atualizar_status(solicitacao_local["id"], "erro")
-        
-        return {
-            "success": False,
-            "error": error_msg,
-            "request_id": request_id,
-            "local_id": solicitacao_local["id"] if 'solicitacao_local' in locals() else None,
-            "unexpected_error": True  # Indicador específico de erro inesperado
-        }
+        return resultado_excecao_assistente(
+            e,
+            ASSISTENTE_IA_URL,
+            request_id,
+            solicitacao_local["id"] if solicitacao_local is not None else None,
+            user_question,
+            product_data
+        )
 
 
 def enviar_para_assistente_ia_sync(
@@ -1139,44 +1007,78 @@ def enviar_para_assistente_ia_sync(
     Versão síncrona da função para enviar dados ao assistente de IA
     Útil para uso em contextos que não suportam async/await
     """
+    async def enviar_e_fechar() -> Dict[str, Any]:
+        # O loop desta chamada termina com ela: fechar o cliente criado para ele
+        try:
+            return await enviar_para_assistente_ia(user_data, product_data, user_question, request_id)
+        finally:
+            await fechar_cliente_assistente()
+
     try:
         loop = asyncio.get_event_loop()
-        return loop.run_until_complete(
-            enviar_para_assistente_ia(user_data, product_data, user_question, request_id)
-        )
+        return loop.run_until_complete(enviar_e_fechar())
     except RuntimeError:
         # Se não há loop em execução, criar um novo
-        return asyncio.run(
-            enviar_para_assistente_ia(user_data, product_data, user_question, request_id)
-        )
+        return asyncio.run(enviar_e_fechar())
 
 
-def verificar_status_assistente_ia() -> Dict[str, Any]:
+def verificar_status_assistente_ia(request_id: Optional[str] = None) -> Dict[str, Any]:
     """
     Verifica se o serviço de assistente de IA está disponível
+    
+    Retorna o último resultado do monitor de saúde em segundo plano, sem
+    fazer requisição ao serviço, de modo que a consulta é instantânea.
     """
-    try:
-        import requests
-        response = requests.get("http://localhost:8001/health", timeout=5)
-        if response.status_code == 200:
-            return {
-                "available": True,
-                "status": "online",
-                "response_time": response.elapsed.total_seconds(),
-                "service_info": response.json() if response.headers.get("content-type", "").startswith("application/json") else None
-            }
-        else:
-            return {
-                "available": False,
-                "status": "error",
-                "error": f"HTTP {response.status_code}"
+    status = monitor_saude_assistente.snapshot()
+    if request_id:
+        status["request_id"] = request_id
+    return status
+
+
+async def entregar_feedback_assistente_ia(
+    solicitacao_id: str,
+    payload: Dict[str, Any],
+    feedback_id: str
+) -> int:
+    """
+    Faz o PUT do feedback ao endpoint de feedback do assistente de IA
+    
+    Chamado pelo descarregador da fila de feedback; o ID do item vai como
+    Idempotency-Key para que reenvios não dupliquem o feedback.
+    
+    Returns:
+        Status HTTP da resposta
+    
+    Raises:
+        FilaCheia: Serviço de feedback saturado (antepara cheia)
+        httpx.HTTPError: Falha de rede ou timeout
+    """
+    
+    # URL do endpoint de feedback
+    FEEDBACK_URL = f"http://localhost:8001/solicitacoes/{solicitacao_id}/feedback"
+    
+    # Fazer requisição PUT para o endpoint de feedback (cliente compartilhado com pool)
+    client = obter_cliente_assistente()
+    async with antepara_feedback:
+        response = await client.put(
+            FEEDBACK_URL,
+            json=payload,
+            headers={
+                "Content-Type": "application/json",
+                "User-Agent": "MockERP/1.0",
+                "X-Request-Source": "mock_erp_feedback",
+                "Idempotency-Key": feedback_id
             }
-    except Exception as e:
-        return {
-            "available": False,
-            "status": "offline",
-            "error": str(e)
-        }
+        )
+    
+    if response.status_code not in [200, 201, 204]:
+        print(f"❌ Erro ao enviar feedback {feedback_id}: Status {response.status_code}")
+        print(f"📄 Resposta: {response.text}")
+    return response.status_code
+
+
+# Fila durável de feedback (iniciada/parada no lifespan via FEEDBACK_FILA_*)
+fila_feedback = FilaFeedbackDuravel("FEEDBACK", entregar=entregar_feedback_assistente_ia)
 
 
 async def enviar_feedback_assistente_ia(
@@ -1186,7 +1088,11 @@ async def enviar_feedback_assistente_ia(
     dados_resposta: Optional[Dict[str, Any]] = None
 ) -> Dict[str, Any]:
     """
-    Envia feedback/avaliação para o endpoint de feedback do assistente de IA
+    Registra o feedback/avaliação para envio ao assistente de IA
+    
+    O feedback é gravado na fila local durável e confirmado na hora; o envio
+    ao endpoint de feedback do assistente acontece em segundo plano, em
+    lotes e com novas tentativas, sem depender da disponibilidade do serviço.
     
     Args:
         solicitacao_id: ID da solicitação original da IA
@@ -1195,11 +1101,12 @@ async def enviar_feedback_assistente_ia(
         dados_resposta: Dados da resposta original para contexto
     
     Returns:
-        Dict com resultado do envio do feedback
+        Dict com resultado do registro do feedback
     """
     
-    # URL do endpoint de feedback
-    FEEDBACK_URL = f"http://localhost:8001/solicitacoes/{solicitacao_id}/feedback"
+    # Avaliação baixa: a resposta avaliada deixa de ser servida do cache
+    if cache_respostas.registrar_avaliacao(solicitacao_id, avaliacao):
+        print(f"🗑️ Resposta da solicitação {solicitacao_id} removida do cache (avaliação {avaliacao})")
     
     # Preparar payload do feedback
     payload = {
@@ -1222,65 +1129,23 @@ async def enviar_feedback_assistente_ia(
         }
     
     try:
-        print(f"📤 Enviando feedback para IA: {payload}")
-        
-        # Fazer requisição PUT para o endpoint de feedback
-        async with httpx.AsyncClient(timeout=60.0) as client:
-            response = await client.put(
-                FEEDBACK_URL,
-                json=payload,
-                headers={
-                    "Content-Type": "application/json",
-                    "User-Agent": "MockERP/1.0",
-                    "X-Request-Source": "mock_erp_feedback"
-                }
-            )
-            
-            if response.status_code in [200, 201, 204]:
-                resposta_feedback = response.json() if response.content else {}
-                print(f"📥 Feedback enviado com sucesso: {resposta_feedback}")
-                
-                return {
-                    "success": True,
-                    "message": "Feedback enviado com sucesso",
-                    "feedback_id": resposta_feedback.get("id"),
-                    "status_code": response.status_code,
-                    "response": resposta_feedback
-                }
-            
-            else:
-                # Erro na resposta da IA
-                print(f"❌ Erro ao enviar feedback: Status {response.status_code}")
-                print(f"📄 Resposta: {response.text}")
-                error_msg = f"Erro ao enviar feedback: {response.status_code} - {response.text}"
-                
-                return {
-                    "success": False,
-                    "error": error_msg,
-                    "status_code": response.status_code,
-                    "fallback_message": "Feedback salvo localmente"
-                }
-    
-    except httpx.TimeoutException:
-        print(f"⏰ Timeout ao enviar feedback para IA")
+        registro = await fila_feedback.enfileirar(solicitacao_id, payload)
+    except OSError as e:
+        print(f"❌ Erro ao gravar feedback na fila local: {e}")
         return {
             "success": False,
-            "error": "Timeout na conexão com o serviço de feedback",
-            "fallback_message": "Feedback salvo localmente"
+            "error": f"Não foi possível registrar o feedback: {str(e)}"
         }
     
-    except httpx.ConnectError:
-        print(f"🔌 Erro de conexão ao enviar feedback para {FEEDBACK_URL}")
-        return {
-            "success": False,
-            "error": "Serviço de feedback indisponível",
-            "fallback_message": "Feedback salvo localmente"
-        }
-    
-    except Exception as e:
-        print(f"❌ Erro inesperado ao enviar feedback: {str(e)}")
-        return {
-            "success": False,
-            "error": f"Erro inesperado: {str(e)}",
-            "fallback_message": "Feedback salvo localmente"
-        }
+    if registro["duplicado"]:
+        print(f"♻️ Feedback repetido para {solicitacao_id} ignorado")
+    else:
+        print(f"📥 Feedback enfileirado para envio: {payload}")
+    
+    return {
+        "success": True,
+        "message": "Feedback registrado com sucesso",
+        "feedback_id": registro["feedback_id"],
+        "queued": True,
+        "duplicate": registro["duplicado"]
+    }
@@ -0,0 +1,172 @@
+"""
+Módulo de Tarefas do Assistente - Mock ERP Application
+Modo assíncrono: solicitações ao assistente executadas por trabalhadores em segundo plano
+"""
+import asyncio
+import os
+from typing import Any, Dict, List, Optional
+
+from .cache import CacheLRU
+from .concorrencia import FilaCheia
+from .eventos import eventos_solicitacoes
+from .solicitacoes import (
+    GerenciadorSolicitacoes,
+    criar_solicitacao_assistente_virtual,
+    enviar_para_assistente_ia
+)
+
+
+STATUS_FINAIS = ("concluida", "erro")
+
+
+class ExecutorTarefasAssistente:
+    """
+    Fila de solicitações ao assistente processadas em segundo plano
+
+    enfileirar() cria o registro local (status "pendente") e retorna na hora;
+    trabalhadores assíncronos chamam enviar_para_assistente_ia com esse
+    registro, que passa por "processando" até "concluida" ou "erro". O
+    resultado completo fica guardado (com TTL) para consulta e é publicado
+    em eventos_solicitacoes como evento "resultado".
+    """
+
+    def __init__(self, trabalhadores: int = 4, max_fila: int = 1000, ttl_resultados: float = 3600.0):
+        self.trabalhadores = trabalhadores
+        self.max_fila = max_fila
+        self._fila: Optional[asyncio.Queue] = None
+        self._tarefas: List[asyncio.Task] = []
+        # ID local -> resultado final; request_id -> ID local
+        self._resultados = CacheLRU(max_itens=10000, ttl=ttl_resultados)
+        self._ids = CacheLRU(max_itens=10000, ttl=ttl_resultados)
+        self._pendentes: Dict[str, Dict[str, Any]] = {}
+        self.concluidas = 0
+
+    def iniciar(self) -> None:
+        """Cria a fila e os trabalhadores (ASSISTENTE_IA_TAREFAS_TRABALHADORES / _MAX_FILA)"""
+        if self._tarefas:
+            return
+        self.trabalhadores = int(os.getenv("ASSISTENTE_IA_TAREFAS_TRABALHADORES", self.trabalhadores))
+        self.max_fila = int(os.getenv("ASSISTENTE_IA_TAREFAS_MAX_FILA", self.max_fila))
+        self._fila = asyncio.Queue(maxsize=self.max_fila)
+        self._tarefas = [asyncio.create_task(self._trabalhar()) for _ in range(self.trabalhadores)]
+
+    async def parar(self) -> None:
+        """Cancela os trabalhadores; solicitações ainda na fila terminam com status "erro" """
+        for tarefa in self._tarefas:
+            tarefa.cancel()
+        await asyncio.gather(*self._tarefas, return_exceptions=True)
+        self._tarefas = []
+        for local_id in list(self._pendentes):
+            GerenciadorSolicitacoes.atualizar_status(local_id, "erro")
+            self._finalizar(local_id, {
+                "success": False,
+                "error": "Solicitação interrompida pelo desligamento do servidor",
+                "local_id": local_id
+            })
+        self._fila = None
+
+    def enfileirar(
+        self,
+        user_data: Optional[Dict[str, Any]],
+        product_data: Dict[str, Any],
+        user_question: str,
+        request_id: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """
+        Cria a solicitação local e a coloca na fila de processamento
+
+        Raises:
+            FilaCheia: Fila de tarefas cheia ou executor não iniciado
+        """
+        if self._fila is None or self._fila.full():
+            raise FilaCheia("Fila de tarefas do assistente cheia")
+
+        request_id = request_id or GerenciadorSolicitacoes.gerar_id()
+        solicitacao = criar_solicitacao_assistente_virtual(
+            user_data=user_data,
+            pergunta=user_question,
+            contexto_produto={"modulo": product_data}
+        )
+        tarefa = {
+            "user_data": user_data,
+            "product_data": product_data,
+            "user_question": user_question,
+            "request_id": request_id,
+            "solicitacao": solicitacao
+        }
+        self._pendentes[solicitacao["id"]] = tarefa
+        self._ids.definir(request_id, solicitacao["id"])
+        self._fila.put_nowait(tarefa)
+        return {"request_id": request_id, "local_id": solicitacao["id"], "status": solicitacao["status"]}
+
+    async def _trabalhar(self) -> None:
+        while True:
+            tarefa = await self._fila.get()
+            local_id = tarefa["solicitacao"]["id"]
+            try:
+                resultado = await enviar_para_assistente_ia(
+                    tarefa["user_data"],
+                    tarefa["product_data"],
+                    tarefa["user_question"],
+                    request_id=tarefa["request_id"],
+                    solicitacao_local=tarefa["solicitacao"]
+                )
+            except Exception as e:
+                print(f"❌ Erro na tarefa do assistente {local_id}: {e}")
+                GerenciadorSolicitacoes.atualizar_status(local_id, "erro")
+                resultado = {"success": False, "error": f"Erro inesperado: {str(e)}", "request_id": tarefa["request_id"]}
+            finally:
+                self._fila.task_done()
+            self._finalizar(local_id, resultado)
+
+    def _finalizar(self, local_id: str, resultado: Dict[str, Any]) -> None:
+        self._pendentes.pop(local_id, None)
+        self._resultados.definir(local_id, resultado)
+        self.concluidas += 1
+        eventos_solicitacoes.publicar(local_id, {"evento": "resultado", "id": local_id, "resultado": resultado})
+
+    def localizar(self, identificador: str) -> Optional[str]:
+        """Retorna o ID local a partir do ID local ou do request_id de uma tarefa"""
+        if identificador in self._pendentes or identificador in self._resultados:
+            return identificador
+        return self._ids.espiar(identificador)
+
+    def eh_tarefa(self, local_id: str) -> bool:
+        return local_id in self._pendentes or local_id in self._resultados
+
+    def resultado(self, local_id: str) -> Optional[Dict[str, Any]]:
+        return self._resultados.espiar(local_id)
+
+    def progresso(self, identificador: str) -> Optional[Dict[str, Any]]:
+        """
+        Progresso de uma solicitação local (tarefa assíncrona ou não)
+
+        Aceita o ID local ou o request_id de uma tarefa. Inclui o resultado
+        completo quando a tarefa já terminou.
+        """
+        local_id = self.localizar(identificador) or identificador
+        solicitacao = GerenciadorSolicitacoes.buscar_solicitacao(local_id)
+        if solicitacao is None:
+            return None
+        progresso: Dict[str, Any] = {
+            "local_id": local_id,
+            "solicitacao": GerenciadorSolicitacoes.resumo_status(solicitacao)
+        }
+        resultado = self.resultado(local_id)
+        if resultado is not None:
+            progresso["resultado"] = resultado
+        return progresso
+
+    def estatisticas(self) -> Dict[str, Any]:
+        return {
+            "trabalhadores": len(self._tarefas),
+            "na_fila": self._fila.qsize() if self._fila is not None else 0,
+            "max_fila": self.max_fila,
+            "pendentes": len(self._pendentes),
+            "concluidas": self.concluidas,
+            "resultados_guardados": len(self._resultados)
+        }
+
+
+# Executor compartilhado (iniciado/parado no lifespan da aplicação)
+executor_tarefas_assistente = ExecutorTarefasAssistente()
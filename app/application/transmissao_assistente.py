@@ -0,0 +1,239 @@
+"""
+Módulo de Transmissão do Assistente - Mock ERP Application
+Respostas do assistente de IA lidas e repassadas de forma incremental (streaming)
+"""
+import json
+import time
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+import httpx
+
+from .cache_respostas import cache_respostas
+from .cliente_http import obter_cliente_assistente
+from .disjuntor import disjuntor_assistente
+from .solicitacoes import (
+    GerenciadorSolicitacoes,
+    antepara_assistente,
+    chave_resposta_assistente,
+    circuito_aberto_assistente,
+    criar_solicitacao_assistente_virtual,
+    montar_envio_assistente,
+    resposta_em_cache_assistente,
+    resultado_excecao_assistente,
+    resultado_status_assistente
+)
+
+
+def _interpretar_linha(linha: str) -> Optional[Dict[str, Any]]:
+    """
+    Interpreta uma linha do stream do assistente (SSE ou NDJSON)
+
+    - `data: {"delta": "..."}` (ou `{"token": "..."}`): trecho da resposta
+    - `data: {"execucao": ..., "processamento": ..., "solicitacao_salva": ...}`:
+      metadados finais, no mesmo formato da resposta completa
+    - `data: [DONE]`: fim do stream
+    - texto que não é JSON: trecho da resposta
+    """
+    linha = linha.strip()
+    if not linha or linha.startswith((":", "event:", "id:", "retry:")):
+        return None
+    if linha.startswith("data:"):
+        linha = linha[5:].strip()
+    if linha == "[DONE]":
+        return {"fim": True}
+    try:
+        dados = json.loads(linha)
+    except ValueError:
+        return {"delta": linha}
+    return dados if isinstance(dados, dict) else {"delta": str(dados)}
+
+
+async def _ler_do_assistente(
+    url: str,
+    payload: Dict[str, Any],
+    request_id: str,
+    final: Dict[str, Any]
+) -> AsyncIterator[str]:
+    """
+    Faz o POST ao assistente pedindo streaming e gera os trechos da resposta
+
+    O status HTTP, o texto de erro e os metadados finais ficam em `final`.
+    Um serviço que ignore o pedido de streaming e responda JSON completo é
+    aceito: a resposta inteira vira um único trecho. A vaga na antepara fica
+    ocupada até o fim do stream; para o disjuntor, a latência registrada é a
+    do primeiro byte, já que a duração total cresce com o tamanho da resposta.
+
+    Raises:
+        FilaCheia: Assistente saturado (antepara sem vaga nem espaço na fila)
+    """
+    client = obter_cliente_assistente()
+    async with antepara_assistente:
+        inicio = time.perf_counter()
+        latencia: Optional[float] = None
+        try:
+            async with client.stream(
+                "POST",
+                url,
+                json={**payload, "stream": True},
+                headers={
+                    "Content-Type": "application/json",
+                    "Accept": "text/event-stream, application/x-ndjson, application/json",
+                    "User-Agent": "MockERP/1.0",
+                    "X-Request-Source": "mock_erp",
+                    "X-Request-ID": request_id
+                }
+            ) as response:
+                latencia = time.perf_counter() - inicio
+                final["status_code"] = response.status_code
+                if response.status_code != 200:
+                    final["conteudo"] = (await response.aread()).decode(errors="replace")
+                    disjuntor_assistente.registrar(response.status_code < 500, latencia)
+                    return
+
+                tipo = response.headers.get("content-type", "")
+                if tipo.startswith("application/json"):
+                    # Serviço sem streaming: resposta completa de uma vez
+                    final.update(json.loads(await response.aread()))
+                    texto = final.get("execucao", {}).get("resposta", "")
+                    if texto:
+                        yield texto
+                else:
+                    async for linha in response.aiter_lines():
+                        dados = _interpretar_linha(linha)
+                        if dados is None:
+                            continue
+                        trecho = dados.get("delta") or dados.get("token")
+                        if trecho:
+                            yield trecho
+                        else:
+                            final.update(dados)
+                        if dados.get("fim"):
+                            break
+        except httpx.HTTPError:
+            disjuntor_assistente.registrar(False, time.perf_counter() - inicio)
+            raise
+        if latencia is not None and final.get("status_code") == 200:
+            disjuntor_assistente.registrar(True, latencia)
+
+
+async def transmitir_para_assistente_ia(
+    user_data: Optional[Dict[str, Any]],
+    product_data: Dict[str, Any],
+    user_question: str,
+    request_id: Optional[str] = None
+) -> AsyncIterator[Tuple[str, Dict[str, Any]]]:
+    """
+    Versão em streaming de enviar_para_assistente_ia
+
+    Gera pares (evento, dados):
+    - ("inicio", {request_id, local_id}) assim que o registro local é criado
+    - ("token", {texto}) para cada trecho recebido do assistente
+    - ("fim", resultado) ou ("erro", resultado), com o mesmo formato do
+      retorno de enviar_para_assistente_ia
+
+    Usa o mesmo cache de respostas, disjuntor, antepara e resultados de
+    falha da chamada completa (helpers de solicitacoes).
+    Ao fim do stream o texto completo e os tokens são gravados no registro
+    local; se o consumidor desistir no meio, o registro termina como "erro".
+    Perguntas idênticas em andamento não são agrupadas: cada stream tem a
+    sua própria chamada.
+    """
+
+    # URL do endpoint do assistente de IA (a mesma da chamada completa)
+    ASSISTENTE_IA_URL = "http://localhost:8001/solicitacoes/executar"
+
+    if not request_id:
+        request_id = GerenciadorSolicitacoes.gerar_id()
+
+    envio = montar_envio_assistente(user_data, product_data, user_question)
+    chave_resposta = chave_resposta_assistente(user_question, envio)
+
+    solicitacao_local = criar_solicitacao_assistente_virtual(
+        user_data=user_data,
+        pergunta=user_question,
+        contexto_produto={"modulo": product_data}
+    )
+    local_id = solicitacao_local["id"]
+    yield "inicio", {"request_id": request_id, "local_id": local_id}
+
+    # Mesma pergunta no mesmo contexto respondida recentemente: não chamar a IA
+    resultado = resposta_em_cache_assistente(chave_resposta, request_id, local_id, user_question)
+    if resultado is not None:
+        yield "token", {"texto": resultado["response"]}
+        yield "fim", resultado
+        return
+
+    # Circuito aberto: resposta simulada sem tocar a rede
+    resultado = circuito_aberto_assistente(request_id, local_id, user_question, product_data)
+    if resultado is not None:
+        yield "erro", resultado
+        return
+
+    GerenciadorSolicitacoes.atualizar_status(local_id, "processando")
+    print(f"📤 Enviando payload para IA (stream): {envio['payload']}")
+
+    inicio = time.perf_counter()
+    primeiro_token: Optional[float] = None
+    partes: List[str] = []
+    final: Dict[str, Any] = {}
+    concluida = False
+    try:
+        async with aclosing(_ler_do_assistente(ASSISTENTE_IA_URL, envio["payload"], request_id, final)) as trechos:
+            async for trecho in trechos:
+                if primeiro_token is None:
+                    primeiro_token = time.perf_counter() - inicio
+                partes.append(trecho)
+                yield "token", {"texto": trecho}
+
+        status_code = final.get("status_code")
+        if status_code != 200:
+            concluida = True
+            yield "erro", resultado_status_assistente(
+                request_id, local_id, user_question, product_data, status_code, final.get("conteudo", "")
+            )
+            return
+
+        execucao = final.get("execucao", {})
+        processamento = final.get("processamento", {})
+        solicitacao_salva = final.get("solicitacao_salva", {})
+
+        resposta_texto = "".join(partes) or execucao.get("resposta_assistente", "") or "Resposta não disponível"
+        # Sem contagem do serviço, cada trecho recebido conta como um token
+        tokens_utilizados = execucao.get("tokens_utilizados") or final.get("tokens_utilizados") or len(partes)
+        tempo_resposta = processamento.get("tempo_processamento") or round(time.perf_counter() - inicio, 3)
+
+        GerenciadorSolicitacoes.atualizar_resposta_assistente(
+            solicitacao_id=local_id,
+            resposta=resposta_texto,
+            tokens_utilizados=tokens_utilizados,
+            tempo_resposta=tempo_resposta
+        )
+        concluida = True
+
+        resultado = {
+            "success": True,
+            "request_id": request_id,
+            "local_id": solicitacao_salva.get("id", ""),  # Usar ID da IA para feedback
+            "response": resposta_texto,
+            "tokens_used": tokens_utilizados,
+            "response_time": tempo_resposta,
+            "first_token_time": primeiro_token,
+            "categoria": processamento.get("categoria_detectada", envio["enriquecimento"]["categoria"]),
+            "subcategoria": envio["enriquecimento"]["subcategoria"],
+            "execucao": execucao,
+            "processamento": processamento,
+            "solicitacao_salva": solicitacao_salva
+        }
+        cache_respostas.armazenar(chave_resposta, resultado, local_id)
+        yield "fim", resultado
+
+    except Exception as e:
+        concluida = True
+        yield "erro", resultado_excecao_assistente(e, ASSISTENTE_IA_URL, request_id, local_id, user_question, product_data)
+
+    finally:
+        # Consumidor desistiu no meio do stream (ex.: navegador fechou a conexão)
+        if not concluida:
+            print(f"🛑 Stream do assistente interrompido: {local_id}")
+            GerenciadorSolicitacoes.atualizar_status(local_id, "erro")
@@ -0,0 +1,497 @@
+"""
+Módulo de Usuários - Mock ERP Application
+Repositório de usuários: índice por ID, sequência de IDs e e-mail único
+"""
+import os
+from bisect import bisect_left, bisect_right, insort
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+
+# Usuários de exemplo criados quando o repositório está vazio
+USUARIOS_INICIAIS = (
+    {"name": "João Silva", "email": "joao@example.com", "active": True},
+    {"name": "Maria Santos", "email": "maria@example.com", "active": True},
+    {"name": "Pedro Oliveira", "email": "pedro@example.com", "active": False},
+    {"name": "Ana Costa", "email": "ana@example.com", "active": True},
+)
+
+# Campos editáveis de um usuário (o ID é atribuído pelo repositório)
+CAMPOS_USUARIO = ("name", "email", "active")
+
+# Campos aceitos na projeção (fields=) da listagem
+CAMPOS_LISTAGEM = ("id",) + CAMPOS_USUARIO
+
+# Mínimo de lápides antes de compactar a lista ordenada de IDs
+MIN_LAPIDES_COMPACTACAO = 1024
+
+
+class EmailDuplicado(ValueError):
+    """Já existe outro usuário com o mesmo e-mail"""
+
+
+def normalizar_email(email: str) -> str:
+    """Chave do índice único de e-mail (sem espaços nas pontas, minúsculas)"""
+    return email.strip().lower()
+
+
+def normalizar_nome(nome: str) -> str:
+    """Chave do índice de prefixo de nome (sem espaços nas pontas, sem diferenciar maiúsculas)"""
+    return nome.strip().casefold()
+
+
+# Prefixos com a lista de IDs já ordenada guardada por IndicePrefixo (paginação)
+MAX_PREFIXOS_ORDENADOS = 16
+
+# Maior caractere possível: chave + FIM_PREFIXO limita o intervalo das chaves que começam com o prefixo
+FIM_PREFIXO = chr(0x10FFFF)
+
+
+class IndicePrefixo:
+    """
+    Lista ordenada de (chave, ID) para buscas por prefixo com bisect
+
+    Construída na primeira busca (cadastros em massa não pagam a ordenação
+    a cada inserção) e mantida a partir daí com insort/remoção por bisect.
+    Os IDs de um prefixo reordenados por ID ficam guardados (até
+    MAX_PREFIXOS_ORDENADOS prefixos, descartados a cada alteração), então
+    as páginas seguintes da mesma busca só fazem bisect pelo cursor.
+    """
+
+    def __init__(self):
+        self._itens: Optional[List[Tuple[str, int]]] = None
+        self._ordenados: Dict[str, List[int]] = {}
+
+    def construir(self, pares: Iterable[Tuple[str, int]]) -> None:
+        self._itens = sorted(pares)
+        self._ordenados.clear()
+
+    @property
+    def construido(self) -> bool:
+        return self._itens is not None
+
+    def invalidar(self) -> None:
+        self._itens = None
+        self._ordenados.clear()
+
+    def adicionar(self, chave: str, user_id: int) -> None:
+        if self._itens is not None:
+            insort(self._itens, (chave, user_id))
+            self._ordenados.clear()
+
+    def remover(self, chave: str, user_id: int) -> None:
+        if self._itens is None:
+            return
+        posicao = bisect_left(self._itens, (chave, user_id))
+        if posicao < len(self._itens) and self._itens[posicao] == (chave, user_id):
+            del self._itens[posicao]
+            self._ordenados.clear()
+
+    def _intervalo(self, prefixo: str) -> Tuple[int, int]:
+        return bisect_left(self._itens, (prefixo,)), bisect_left(self._itens, (prefixo + FIM_PREFIXO,))
+
+    def contar(self, prefixo: str) -> int:
+        """Quantidade de chaves que começam com o prefixo (dois bisects)"""
+        inicio, fim = self._intervalo(prefixo)
+        return fim - inicio
+
+    def ids_com_prefixo(self, prefixo: str) -> List[int]:
+        """IDs cujas chaves começam com o prefixo, em ordem crescente de ID"""
+        ids = self._ordenados.get(prefixo)
+        if ids is None:
+            inicio, fim = self._intervalo(prefixo)
+            ids = sorted(user_id for _, user_id in self._itens[inicio:fim])
+            if len(self._ordenados) >= MAX_PREFIXOS_ORDENADOS:
+                del self._ordenados[next(iter(self._ordenados))]
+            self._ordenados[prefixo] = ids
+        return ids
+
+
+class RepositorioUsuarios:
+    """
+    Interface dos repositórios de usuários usados pelo GerenciadorUsuarios
+
+    Usuários são dicts com "id", "name", "email" e "active". IDs são
+    atribuídos pelo repositório em sequência crescente e nunca reutilizados;
+    o e-mail é único (comparado sem diferenciar maiúsculas). Implementações:
+    ArmazenamentoUsuarios (memória) e ArmazenamentoUsuariosSQLite, escolhidas
+    por criar_repositorio_usuarios.
+    """
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        """Usuários em ordem de ID"""
+        raise NotImplementedError
+
+    def buscar(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Busca um usuário pelo ID"""
+        raise NotImplementedError
+
+    def buscar_por_email(self, email: str) -> Optional[Dict[str, Any]]:
+        """Busca um usuário pelo e-mail (índice único)"""
+        raise NotImplementedError
+
+    def inserir(self, dados: Dict[str, Any]) -> Dict[str, Any]:
+        """Cria um usuário com o próximo ID (EmailDuplicado se o e-mail já existir)"""
+        raise NotImplementedError
+
+    def inserir_lote(self, lote: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """
+        Cria vários usuários de uma vez, na ordem do lote
+
+        Retorna, para cada item, o usuário criado ou None se o e-mail já
+        existia (no repositório ou antes no próprio lote).
+        """
+        criados: List[Optional[Dict[str, Any]]] = []
+        for dados in lote:
+            try:
+                criados.append(self.inserir(dados))
+            except EmailDuplicado:
+                criados.append(None)
+        return criados
+
+    def atualizar(self, user_id: int, **campos: Any) -> Optional[Dict[str, Any]]:
+        """Atualiza campos de um usuário; None se o ID não existir (EmailDuplicado se colidir)"""
+        raise NotImplementedError
+
+    def remover(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Remove um usuário; None se o ID não existir"""
+        raise NotImplementedError
+
+    def listar(
+        self,
+        limit: int = 100,
+        after: Optional[int] = None,
+        active: Optional[bool] = None,
+        email_prefix: Optional[str] = None,
+        name_prefix: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Até `limit` usuários em ordem de ID, a partir do primeiro ID maior que
+        `after`, filtrando por active e por prefixo de e-mail/nome (sem
+        diferenciar maiúsculas)
+        """
+        raise NotImplementedError
+
+    def fechar(self) -> None:
+        """Libera recursos"""
+
+    def descricao(self) -> Dict[str, Any]:
+        """Backend em uso e seus parâmetros"""
+        return {"backend": type(self).__name__}
+
+
+class ArmazenamentoUsuarios(RepositorioUsuarios):
+    """
+    Usuários em memória
+
+    - dict ID -> usuário para busca, atualização e remoção em O(1);
+    - próximo ID mantido em um contador (sem percorrer a tabela a cada
+      inserção);
+    - índice único e-mail normalizado -> ID;
+    - lista de IDs em ordem crescente (a sequência só cresce, então inserir
+      é um append) usada para percorrer em ordem e, com bisect, posicionar
+      o cursor da listagem. Remoções deixam lápides na lista, descartadas
+      em lote quando passam de metade dela;
+    - conjunto dos inativos (filtro active=false sem varrer a tabela) e
+      índices de prefixo de e-mail e nome (IndicePrefixo). Um prefixo que
+      casa com muitos usuários é listado percorrendo a lista de IDs a
+      partir do cursor (acha `limit` deles logo), sem ordenar o intervalo.
+    """
+
+    def __init__(self):
+        self._usuarios: Dict[int, Dict[str, Any]] = {}
+        self._por_email: Dict[str, int] = {}
+        self._ids: List[int] = []
+        self._lapides = 0
+        self._proximo_id = 1
+        self._inativos: Dict[int, None] = {}
+        self._inativos_ordenados: Optional[List[int]] = None
+        self._prefixo_email = IndicePrefixo()
+        self._prefixo_nome = IndicePrefixo()
+
+    def __len__(self) -> int:
+        return len(self._usuarios)
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        for user_id in list(self._ids):
+            usuario = self._usuarios.get(user_id)
+            if usuario is not None:
+                yield usuario
+
+    def _compactar_ids(self) -> None:
+        self._ids = [user_id for user_id in self._ids if user_id in self._usuarios]
+        self._lapides = 0
+
+    def buscar(self, user_id: int) -> Optional[Dict[str, Any]]:
+        return self._usuarios.get(user_id)
+
+    def buscar_por_email(self, email: str) -> Optional[Dict[str, Any]]:
+        user_id = self._por_email.get(normalizar_email(email))
+        return self._usuarios.get(user_id) if user_id is not None else None
+
+    def inserir(self, dados: Dict[str, Any]) -> Dict[str, Any]:
+        chave = normalizar_email(dados["email"])
+        if chave in self._por_email:
+            raise EmailDuplicado(f"E-mail {dados['email']} já cadastrado")
+
+        usuario = self._inserir(dados, chave)
+        self._prefixo_email.adicionar(chave, usuario["id"])
+        self._prefixo_nome.adicionar(normalizar_nome(usuario["name"]), usuario["id"])
+        return usuario
+
+    def inserir_lote(self, lote: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        # Os índices de prefixo são descartados e reconstruídos (uma ordenação) na
+        # próxima busca, em vez de um insort por usuário importado
+        if lote:
+            self._prefixo_email.invalidar()
+            self._prefixo_nome.invalidar()
+        criados: List[Optional[Dict[str, Any]]] = []
+        for dados in lote:
+            chave = normalizar_email(dados["email"])
+            criados.append(self._inserir(dados, chave) if chave not in self._por_email else None)
+        return criados
+
+    def _inserir(self, dados: Dict[str, Any], chave: str) -> Dict[str, Any]:
+        usuario = {
+            "id": self._proximo_id,
+            "name": dados["name"],
+            "email": dados["email"],
+            "active": dados.get("active", True)
+        }
+        self._proximo_id += 1
+        self._usuarios[usuario["id"]] = usuario
+        self._por_email[chave] = usuario["id"]
+        self._ids.append(usuario["id"])
+        if not usuario["active"]:
+            self._inativos[usuario["id"]] = None
+            self._inativos_ordenados = None
+        return usuario
+
+    def atualizar(self, user_id: int, **campos: Any) -> Optional[Dict[str, Any]]:
+        usuario = self._usuarios.get(user_id)
+        if usuario is None:
+            return None
+
+        if "email" in campos:
+            anterior = normalizar_email(usuario["email"])
+            nova = normalizar_email(campos["email"])
+            if nova != anterior:
+                if nova in self._por_email:
+                    raise EmailDuplicado(f"E-mail {campos['email']} já cadastrado")
+                del self._por_email[anterior]
+                self._por_email[nova] = user_id
+                self._prefixo_email.remover(anterior, user_id)
+                self._prefixo_email.adicionar(nova, user_id)
+        if "name" in campos:
+            self._prefixo_nome.remover(normalizar_nome(usuario["name"]), user_id)
+            self._prefixo_nome.adicionar(normalizar_nome(campos["name"]), user_id)
+        for campo, valor in campos.items():
+            if campo in CAMPOS_USUARIO:
+                usuario[campo] = valor
+        if usuario["active"]:
+            if user_id in self._inativos:
+                del self._inativos[user_id]
+                self._inativos_ordenados = None
+        elif user_id not in self._inativos:
+            self._inativos[user_id] = None
+            self._inativos_ordenados = None
+        return usuario
+
+    def remover(self, user_id: int) -> Optional[Dict[str, Any]]:
+        usuario = self._usuarios.pop(user_id, None)
+        if usuario is None:
+            return None
+
+        del self._por_email[normalizar_email(usuario["email"])]
+        if user_id in self._inativos:
+            del self._inativos[user_id]
+            self._inativos_ordenados = None
+        self._prefixo_email.remover(normalizar_email(usuario["email"]), user_id)
+        self._prefixo_nome.remover(normalizar_nome(usuario["name"]), user_id)
+        self._lapides += 1
+        if self._lapides >= MIN_LAPIDES_COMPACTACAO and self._lapides * 2 > len(self._ids):
+            self._compactar_ids()
+        return usuario
+
+    def _candidatos(
+        self,
+        limit: int,
+        after: Optional[int],
+        active: Optional[bool],
+        email_prefix: Optional[str],
+        name_prefix: Optional[str]
+    ) -> Iterable[int]:
+        """IDs em ordem crescente vindos do índice mais seletivo disponível"""
+        if email_prefix or name_prefix:
+            if email_prefix:
+                indice, prefixo = self._prefixo_email, normalizar_email(email_prefix)
+                if not indice.construido:
+                    indice.construir((normalizar_email(u["email"]), user_id) for user_id, u in self._usuarios.items())
+            else:
+                indice, prefixo = self._prefixo_nome, normalizar_nome(name_prefix)
+                if not indice.construido:
+                    indice.construir((normalizar_nome(u["name"]), user_id) for user_id, u in self._usuarios.items())
+            casados = indice.contar(prefixo)
+            if casados * casados > limit * len(self._ids):
+                # Muitos usuários no prefixo: a lista de IDs acha `limit` deles
+                # em ~limit * len / casados passos (listar confere o prefixo)
+                ids = self._ids
+            else:
+                ids = indice.ids_com_prefixo(prefixo)
+        elif active is False:
+            if self._inativos_ordenados is None:
+                self._inativos_ordenados = sorted(self._inativos)
+            ids = self._inativos_ordenados
+        else:
+            ids = self._ids
+        inicio = bisect_right(ids, after) if after is not None else 0
+        return (ids[posicao] for posicao in range(inicio, len(ids)))
+
+    def listar(
+        self,
+        limit: int = 100,
+        after: Optional[int] = None,
+        active: Optional[bool] = None,
+        email_prefix: Optional[str] = None,
+        name_prefix: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        if limit <= 0:
+            return []
+
+        prefixo_email = normalizar_email(email_prefix) if email_prefix else None
+        prefixo_nome = normalizar_nome(name_prefix) if name_prefix else None
+        resultado: List[Dict[str, Any]] = []
+        for user_id in self._candidatos(limit, after, active, email_prefix, name_prefix):
+            usuario = self._usuarios.get(user_id)
+            if usuario is None:
+                continue
+            if active is not None and usuario["active"] != active:
+                continue
+            if prefixo_email and not normalizar_email(usuario["email"]).startswith(prefixo_email):
+                continue
+            if prefixo_nome and not normalizar_nome(usuario["name"]).startswith(prefixo_nome):
+                continue
+            resultado.append(usuario)
+            if len(resultado) >= limit:
+                break
+        return resultado
+
+    def descricao(self) -> Dict[str, Any]:
+        return {"backend": "memory", "usuarios": len(self._usuarios), "proximo_id": self._proximo_id}
+
+
+def criar_repositorio_usuarios(url: Optional[str]) -> RepositorioUsuarios:
+    """
+    Cria o repositório de usuários a partir de uma URL no formato de DATABASE_URL
+
+    - vazio ou "memory://": em memória
+    - "sqlite:///caminho.db": tabela usuarios em um arquivo SQLite (WAL)
+    """
+    if not url or url == "memory://":
+        return ArmazenamentoUsuarios()
+    if url.startswith("sqlite://"):
+        from .usuarios_sqlite import ArmazenamentoUsuariosSQLite
+        caminho = url[len("sqlite://"):]
+        caminho = caminho[1:] if caminho.startswith("/") else caminho
+        return ArmazenamentoUsuariosSQLite(caminho or ":memory:")
+    raise ValueError(f"USUARIOS_DATABASE_URL não suportada: {url}")
+
+
+def _semear(repositorio: RepositorioUsuarios) -> RepositorioUsuarios:
+    if len(repositorio) == 0:
+        for dados in USUARIOS_INICIAIS:
+            repositorio.inserir(dict(dados))
+    return repositorio
+
+
+# Repositório de usuários: em memória até o lifespan aplicar USUARIOS_DATABASE_URL
+usuarios_db: RepositorioUsuarios = _semear(ArmazenamentoUsuarios())
+
+
+def iniciar_repositorio_usuarios() -> None:
+    """
+    Abre o repositório indicado por USUARIOS_DATABASE_URL (ou DATABASE_URL;
+    memória se ambas vazias) e cria os usuários de exemplo se estiver vazio
+    """
+    global usuarios_db
+    url = os.getenv("USUARIOS_DATABASE_URL", os.getenv("DATABASE_URL"))
+    repositorio = _semear(criar_repositorio_usuarios(url))
+    usuarios_db = repositorio
+    print(f"👥 Repositório de usuários: {repositorio.descricao()['backend']} ({len(repositorio)} usuários)")
+
+
+def fechar_repositorio_usuarios() -> None:
+    usuarios_db.fechar()
+
+
+class GerenciadorUsuarios:
+    """Operações sobre os usuários do sistema"""
+
+    @staticmethod
+    def buscar_usuario(user_id: int) -> Optional[Dict[str, Any]]:
+        return usuarios_db.buscar(user_id)
+
+    @staticmethod
+    def buscar_por_email(email: str) -> Optional[Dict[str, Any]]:
+        return usuarios_db.buscar_por_email(email)
+
+    @staticmethod
+    def listar_usuarios(
+        limit: int = 100,
+        cursor: Optional[int] = None,
+        active: Optional[bool] = None,
+        email_prefix: Optional[str] = None,
+        name_prefix: Optional[str] = None,
+        campos: Optional[List[str]] = None
+    ) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Página de usuários em ordem de ID e o cursor da próxima (None na última)
+
+        Busca um usuário a mais para saber se há próxima página. Com
+        `campos`, cada usuário é reduzido a esses campos (projeção).
+        """
+        usuarios = usuarios_db.listar(
+            limit=limit + 1,
+            after=cursor,
+            active=active,
+            email_prefix=email_prefix,
+            name_prefix=name_prefix
+        )
+        proximo = None
+        if len(usuarios) > limit:
+            usuarios = usuarios[:limit]
+            proximo = usuarios[-1]["id"]
+        if campos:
+            usuarios = [{campo: usuario[campo] for campo in campos} for usuario in usuarios]
+        return usuarios, proximo
+
+    @staticmethod
+    def criar_usuario(name: str, email: str, active: bool = True) -> Dict[str, Any]:
+        """
+        Raises:
+            EmailDuplicado: E-mail já cadastrado
+        """
+        return usuarios_db.inserir({"name": name, "email": email, "active": active})
+
+    @staticmethod
+    def criar_usuarios_em_lote(lote: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """Usuário criado para cada item do lote, ou None se o e-mail já estava cadastrado"""
+        return usuarios_db.inserir_lote(lote)
+
+    @staticmethod
+    def atualizar_usuario(user_id: int, **campos: Any) -> Optional[Dict[str, Any]]:
+        """
+        Raises:
+            EmailDuplicado: E-mail já cadastrado para outro usuário
+        """
+        return usuarios_db.atualizar(user_id, **campos)
+
+    @staticmethod
+    def remover_usuario(user_id: int) -> Optional[Dict[str, Any]]:
+        return usuarios_db.remover(user_id)
+
+    @staticmethod
+    def total_usuarios() -> int:
+        return len(usuarios_db)
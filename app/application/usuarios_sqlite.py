@@ -0,0 +1,237 @@
+"""
+Módulo de Usuários SQLite - Mock ERP Application
+Repositório de usuários persistido em SQLite (WAL)
+"""
+import os
+import sqlite3
+from typing import Any, Dict, Iterator, List, Optional
+
+from .usuarios import (
+    CAMPOS_USUARIO,
+    FIM_PREFIXO,
+    EmailDuplicado,
+    RepositorioUsuarios,
+    normalizar_email,
+    normalizar_nome
+)
+
+
+ESQUEMA = (
+    """
+    CREATE TABLE IF NOT EXISTS usuarios (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        name TEXT NOT NULL,
+        email TEXT NOT NULL,
+        email_normalizado TEXT NOT NULL UNIQUE,
+        active INTEGER NOT NULL DEFAULT 1,
+        name_normalizado TEXT
+    )
+    """,
+)
+
+# Criados depois da migração de name_normalizado (tabelas de versões anteriores não têm a coluna)
+INDICES = (
+    "CREATE INDEX IF NOT EXISTS idx_usuarios_name ON usuarios (name_normalizado)",
+    "CREATE INDEX IF NOT EXISTS idx_usuarios_active ON usuarios (active, id)",
+)
+
+SQL_INSERIR = "INSERT INTO usuarios (name, email, email_normalizado, active, name_normalizado) VALUES (?, ?, ?, ?, ?)"
+# Importação em lote: e-mail já cadastrado não interrompe o lote (rowcount 0)
+SQL_INSERIR_SE_NOVO = (
+    "INSERT OR IGNORE INTO usuarios (name, email, email_normalizado, active, name_normalizado) VALUES (?, ?, ?, ?, ?)"
+)
+SQL_BUSCAR = "SELECT id, name, email, active FROM usuarios WHERE id = ?"
+SQL_BUSCAR_EMAIL = "SELECT id, name, email, active FROM usuarios WHERE email_normalizado = ?"
+SQL_ATUALIZAR = (
+    "UPDATE usuarios SET name = ?, email = ?, email_normalizado = ?, active = ?, name_normalizado = ? WHERE id = ?"
+)
+SQL_REMOVER = "DELETE FROM usuarios WHERE id = ?"
+
+
+def _usuario(linha: tuple) -> Dict[str, Any]:
+    return {"id": linha[0], "name": linha[1], "email": linha[2], "active": bool(linha[3])}
+
+
+class ArmazenamentoUsuariosSQLite(RepositorioUsuarios):
+    """
+    Usuários em uma tabela SQLite
+
+    id INTEGER PRIMARY KEY AUTOINCREMENT dá a sequência crescente sem
+    reutilizar IDs de removidos; a busca por ID usa a própria chave
+    primária e o e-mail normalizado tem índice UNIQUE, usado também nas
+    buscas por prefixo (intervalo de chaves); nome normalizado e
+    (active, id) têm índices próprios para os filtros da listagem. Mesmos
+    PRAGMAs do repositório de solicitações (WAL, synchronous=NORMAL); cada
+    escrita é efetivada na hora, já que cadastros são raros perto das
+    leituras.
+    """
+
+    def __init__(self, caminho: str):
+        self.caminho = caminho
+        if caminho != ":memory:":
+            diretorio = os.path.dirname(caminho)
+            if diretorio:
+                os.makedirs(diretorio, exist_ok=True)
+        self._conexao = sqlite3.connect(
+            caminho,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=256
+        )
+        self._conexao.execute("PRAGMA journal_mode=WAL")
+        self._conexao.execute("PRAGMA synchronous=NORMAL")
+        for comando in ESQUEMA:
+            self._conexao.execute(comando)
+        self._migrar()
+        for comando in INDICES:
+            self._conexao.execute(comando)
+        self._total = self._conexao.execute("SELECT COUNT(*) FROM usuarios").fetchone()[0]
+
+    def _migrar(self) -> None:
+        """Preenche name_normalizado em tabelas criadas antes da coluna existir"""
+        colunas = {linha[1] for linha in self._conexao.execute("PRAGMA table_info(usuarios)")}
+        if "name_normalizado" not in colunas:
+            self._conexao.execute("ALTER TABLE usuarios ADD COLUMN name_normalizado TEXT")
+        pendentes = self._conexao.execute("SELECT id, name FROM usuarios WHERE name_normalizado IS NULL").fetchall()
+        if pendentes:
+            self._conexao.execute("BEGIN")
+            self._conexao.executemany(
+                "UPDATE usuarios SET name_normalizado = ? WHERE id = ?",
+                [(normalizar_nome(nome), user_id) for user_id, nome in pendentes]
+            )
+            self._conexao.execute("COMMIT")
+
+    def __len__(self) -> int:
+        return self._total
+
+    def __iter__(self) -> Iterator[Dict[str, Any]]:
+        # Páginas por ID, sem manter um cursor aberto entre escritas
+        ultimo = 0
+        while True:
+            linhas = self._conexao.execute(
+                "SELECT id, name, email, active FROM usuarios WHERE id > ? ORDER BY id LIMIT 500", (ultimo,)
+            ).fetchall()
+            if not linhas:
+                return
+            for linha in linhas:
+                ultimo = linha[0]
+                yield _usuario(linha)
+
+    def buscar(self, user_id: int) -> Optional[Dict[str, Any]]:
+        linha = self._conexao.execute(SQL_BUSCAR, (user_id,)).fetchone()
+        return _usuario(linha) if linha is not None else None
+
+    def buscar_por_email(self, email: str) -> Optional[Dict[str, Any]]:
+        linha = self._conexao.execute(SQL_BUSCAR_EMAIL, (normalizar_email(email),)).fetchone()
+        return _usuario(linha) if linha is not None else None
+
+    def inserir(self, dados: Dict[str, Any]) -> Dict[str, Any]:
+        active = dados.get("active", True)
+        try:
+            cursor = self._conexao.execute(
+                SQL_INSERIR,
+                (dados["name"], dados["email"], normalizar_email(dados["email"]), int(active), normalizar_nome(dados["name"]))
+            )
+        except sqlite3.IntegrityError:
+            raise EmailDuplicado(f"E-mail {dados['email']} já cadastrado")
+        self._total += 1
+        return {"id": cursor.lastrowid, "name": dados["name"], "email": dados["email"], "active": active}
+
+    def inserir_lote(self, lote: List[Dict[str, Any]]) -> List[Optional[Dict[str, Any]]]:
+        """Lote inteiro em uma transação (um commit/fsync em vez de um por usuário)"""
+        criados: List[Optional[Dict[str, Any]]] = []
+        if not lote:
+            return criados
+
+        self._conexao.execute("BEGIN")
+        try:
+            for dados in lote:
+                active = dados.get("active", True)
+                cursor = self._conexao.execute(
+                    SQL_INSERIR_SE_NOVO,
+                    (dados["name"], dados["email"], normalizar_email(dados["email"]), int(active), normalizar_nome(dados["name"]))
+                )
+                if cursor.rowcount:
+                    criados.append({"id": cursor.lastrowid, "name": dados["name"], "email": dados["email"], "active": active})
+                else:
+                    criados.append(None)
+            self._conexao.execute("COMMIT")
+        except BaseException:
+            self._conexao.execute("ROLLBACK")
+            raise
+        self._total += sum(1 for usuario in criados if usuario is not None)
+        return criados
+
+    def atualizar(self, user_id: int, **campos: Any) -> Optional[Dict[str, Any]]:
+        usuario = self.buscar(user_id)
+        if usuario is None:
+            return None
+
+        for campo, valor in campos.items():
+            if campo in CAMPOS_USUARIO:
+                usuario[campo] = valor
+        try:
+            self._conexao.execute(
+                SQL_ATUALIZAR,
+                (
+                    usuario["name"],
+                    usuario["email"],
+                    normalizar_email(usuario["email"]),
+                    int(usuario["active"]),
+                    normalizar_nome(usuario["name"]),
+                    user_id
+                )
+            )
+        except sqlite3.IntegrityError:
+            raise EmailDuplicado(f"E-mail {usuario['email']} já cadastrado")
+        return usuario
+
+    def remover(self, user_id: int) -> Optional[Dict[str, Any]]:
+        usuario = self.buscar(user_id)
+        if usuario is None:
+            return None
+
+        self._conexao.execute(SQL_REMOVER, (user_id,))
+        self._total -= 1
+        return usuario
+
+    def listar(
+        self,
+        limit: int = 100,
+        after: Optional[int] = None,
+        active: Optional[bool] = None,
+        email_prefix: Optional[str] = None,
+        name_prefix: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        if limit <= 0:
+            return []
+
+        condicoes = []
+        parametros: List[Any] = []
+        if after is not None:
+            condicoes.append("id > ?")
+            parametros.append(after)
+        if active is not None:
+            condicoes.append("active = ?")
+            parametros.append(int(active))
+        for coluna, prefixo in (
+            ("email_normalizado", normalizar_email(email_prefix) if email_prefix else None),
+            ("name_normalizado", normalizar_nome(name_prefix) if name_prefix else None)
+        ):
+            if prefixo:
+                # Intervalo de chaves em vez de LIKE: usa o índice da coluna
+                condicoes.append(f"{coluna} >= ? AND {coluna} < ?")
+                parametros.extend((prefixo, prefixo + FIM_PREFIXO))
+
+        where = f"WHERE {' AND '.join(condicoes)} " if condicoes else ""
+        linhas = self._conexao.execute(
+            f"SELECT id, name, email, active FROM usuarios {where}ORDER BY id LIMIT ?",
+            (*parametros, limit)
+        ).fetchall()
+        return [_usuario(linha) for linha in linhas]
+
+    def fechar(self) -> None:
+        self._conexao.close()
+
+    def descricao(self) -> Dict[str, Any]:
+        return {"backend": "sqlite", "caminho": self.caminho, "usuarios": self._total}
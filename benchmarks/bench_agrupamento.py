@@ -0,0 +1,65 @@
+"""
+Benchmark - rajada de perguntas idênticas ao assistente de IA
+
+Dispara N chamadas concorrentes de enviar_para_assistente_ia contra um stub
+local do assistente (porta 8001, com atraso) e conta quantas requisições
+chegam ao stub: perguntas distintas (sem agrupamento possível) vs a mesma
+pergunta de usuários diferentes (agrupadas em uma única chamada: o payload
+enviado ao assistente não leva dados do usuário). O cache de respostas é
+desativado para isolar o agrupamento.
+
+Uso:
+    python benchmarks/bench_agrupamento.py
+"""
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.cache_respostas import cache_respostas  # noqa: E402
+from app.application.cliente_http import fechar_cliente_assistente, iniciar_cliente_assistente  # noqa: E402
+from app.application.solicitacoes import enviar_para_assistente_ia  # noqa: E402
+from benchmarks.stub_servidor import StubServidor  # noqa: E402
+
+
+RAJADA = 50
+ATRASO = 0.2
+MODULO = {"type": "Clientes", "data": {"nome": "ACME Ltda"}}
+
+
+async def rajada(nome: str, stub: StubServidor, perguntas) -> None:
+    antes = stub.requisicoes
+    inicio = time.perf_counter()
+    # enviar_para_assistente_ia registra cada payload com print; silenciado aqui
+    with contextlib.redirect_stdout(io.StringIO()):
+        resultados = await asyncio.gather(*(
+            enviar_para_assistente_ia({"id": indice, "name": f"Usuário {indice}"}, MODULO, pergunta)
+            for indice, pergunta in enumerate(perguntas)
+        ))
+    duracao = (time.perf_counter() - inicio) * 1000
+    assert all(resultado["success"] for resultado in resultados)
+    assert len({resultado["request_id"] for resultado in resultados}) == len(resultados)
+    print(f"{nome:<20} | {len(perguntas):>8} | {stub.requisicoes - antes:>18} | {duracao:>10.0f}")
+
+
+async def main() -> None:
+    cache_respostas.cache.ttl = 0
+    stub = StubServidor(atraso=ATRASO)
+    await stub.iniciar(porta=8001)
+    await iniciar_cliente_assistente()
+
+    print(f"{'rajada':<20} | {'chamadas':>8} | {'requisições ao stub':>18} | {'tempo (ms)':>10}")
+    print("-" * 66)
+    await rajada("perguntas distintas", stub, [f"como cadastrar o cliente {i}?" for i in range(RAJADA)])
+    await rajada("mesma pergunta", stub, ["onde fica o campo CNPJ?"] * RAJADA)
+
+    await fechar_cliente_assistente()
+    await stub.parar()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
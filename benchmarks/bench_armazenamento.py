@@ -0,0 +1,93 @@
+"""
+Benchmark - vazão de inserção e consulta dos repositórios de solicitações
+
+Compara o repositório em memória com o SQLite (WAL) com commit a cada
+escrita e com commits em lote: inserções por segundo, atualizações de
+status, buscas por ID e listagens filtradas por status (primeira página).
+
+Uso:
+    python benchmarks/bench_armazenamento.py [quantidade]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.armazenamento import ArmazenamentoSolicitacoes  # noqa: E402
+from app.application.armazenamento_sqlite import ArmazenamentoSolicitacoesSQLite  # noqa: E402
+
+
+def gerar(quantidade: int):
+    agora = datetime.now()
+    for indice in range(quantidade):
+        yield {
+            "id": f"SOL_{indice:08d}",
+            "user_id": indice % 500,
+            "user_name": f"Usuário {indice % 500}",
+            "user_email": None,
+            "tipo": "assistente_virtual",
+            "status": "pendente",
+            "prioridade": "normal",
+            "pergunta": "Onde fica o campo CNPJ no cadastro de clientes?",
+            "contexto_produto": {"modulo": {"type": "Clientes", "data": {"nome": "ACME Ltda"}}},
+            "resposta": None,
+            "tokens_utilizados": None,
+            "tempo_resposta": None,
+            "created_at": agora,
+            "updated_at": agora
+        }
+
+
+def medir(nome: str, repositorio, quantidade: int) -> None:
+    inicio = time.perf_counter()
+    for solicitacao in gerar(quantidade):
+        repositorio.inserir(solicitacao)
+    repositorio.confirmar()
+    insercao = quantidade / (time.perf_counter() - inicio)
+
+    ids = [f"SOL_{indice:08d}" for indice in random.sample(range(quantidade), min(quantidade, 10000))]
+
+    inicio = time.perf_counter()
+    for solicitacao_id in ids:
+        repositorio.atualizar(solicitacao_id, status="concluida", updated_at=datetime.now())
+    repositorio.confirmar()
+    atualizacao = len(ids) / (time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    for solicitacao_id in ids:
+        repositorio.buscar(solicitacao_id)
+    busca = len(ids) / (time.perf_counter() - inicio)
+
+    inicio = time.perf_counter()
+    for _ in range(1000):
+        repositorio.listar(status="concluida", limit=50)
+    listagem = 1000 / (time.perf_counter() - inicio)
+
+    print(f"{nome:<28} | {insercao:>12,.0f} | {atualizacao:>12,.0f} | {busca:>12,.0f} | {listagem:>12,.0f}")
+
+
+def main() -> None:
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    random.seed(42)
+    print(f"{quantidade:,} solicitações (operações por segundo)\n")
+    print(f"{'repositório':<28} | {'inserção':>12} | {'atualização':>12} | {'busca por ID':>12} | {'listagem':>12}")
+    print("-" * 92)
+
+    medir("memória", ArmazenamentoSolicitacoes(), quantidade)
+    with tempfile.TemporaryDirectory() as diretorio:
+        # Commit por escrita fica caro rápido; mede só uma fração do volume
+        por_escrita = ArmazenamentoSolicitacoesSQLite(os.path.join(diretorio, "por_escrita.db"), lote_commit=1)
+        medir("sqlite (commit por escrita)", por_escrita, min(quantidade, 10_000))
+        por_escrita.fechar()
+
+        em_lote = ArmazenamentoSolicitacoesSQLite(os.path.join(diretorio, "em_lote.db"), lote_commit=1000)
+        medir("sqlite (commit em lote)", em_lote, quantidade)
+        em_lote.fechar()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""
+Benchmark - classificação de categoria das perguntas
+
+Compara a detecção anterior (dict recriado a cada chamada + varreduras
+`any(palavra in pergunta)`) com o classificador compilado em uma única regex,
+em perguntas de tamanhos realistas. Também confere que ambos retornam a
+mesma categoria. A coluna "fria" mede o classificador com a memória de
+tokens vazia (primeira vez que o vocabulário da pergunta é visto).
+
+Uso:
+    python benchmarks/bench_classificador.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.analise_pergunta import CATEGORIAS_SOLICITACAO, _classificador  # noqa: E402
+from app.application.solicitacoes import detectar_categoria_solicitacao  # noqa: E402
+
+
+PERGUNTAS = {
+    "curta (~5 palavras)": "onde fica o campo CNPJ?",
+    "média (~15 palavras)": "Preciso saber como faço para emitir a nota fiscal eletrônica do pedido de venda de hoje",
+    "longa (~40 palavras)": (
+        "Bom dia, estou tentando cadastrar um novo cliente pessoa jurídica mas o sistema mostra um aviso "
+        "quando informo o documento e não consigo salvar o formulário; já conferi o endereço e o telefone, "
+        "mas continua igual. O que pode estar acontecendo e qual é o procedimento correto?"
+    ),
+    "sem categoria": "bom dia, tudo certo por aí? obrigado pela resposta de ontem"
+}
+
+
+def detectar_categoria_anterior(pergunta: str) -> str:
+    """Implementação anterior (dict recriado a cada chamada e varreduras aninhadas)"""
+    pergunta_lower = pergunta.lower()
+    categorias = {categoria: list(palavras) for categoria, palavras in CATEGORIAS_SOLICITACAO.items()}
+    for categoria, palavras in categorias.items():
+        if any(palavra in pergunta_lower for palavra in palavras):
+            return categoria
+    if "?" in pergunta:
+        if any(word in pergunta_lower for word in ["onde", "qual campo", "que campo"]):
+            return "user_interface"
+        elif any(word in pergunta_lower for word in ["como fazer", "como"]):
+            return "tutorial_help"
+        else:
+            return "general_inquiry"
+    return "general_inquiry"
+
+
+def main() -> None:
+    repeticoes = 20_000
+    print(f"{'pergunta':<22} | {'anterior (us)':>13} | {'compilado (us)':>14} | {'fria (us)':>9} | {'ganho':>6}")
+    print("-" * 78)
+    for nome, pergunta in PERGUNTAS.items():
+        assert detectar_categoria_anterior(pergunta) == detectar_categoria_solicitacao(pergunta)
+        anterior = timeit.timeit(lambda: detectar_categoria_anterior(pergunta), number=repeticoes)
+        compilado = timeit.timeit(lambda: detectar_categoria_solicitacao(pergunta), number=repeticoes)
+        fria = timeit.timeit(
+            lambda: (_classificador._memoria.clear(), detectar_categoria_solicitacao(pergunta)),
+            number=repeticoes // 10
+        )
+        anterior_us = anterior / repeticoes * 1_000_000
+        compilado_us = compilado / repeticoes * 1_000_000
+        fria_us = fria / (repeticoes // 10) * 1_000_000
+        print(
+            f"{nome:<22} | {anterior_us:>13.2f} | {compilado_us:>14.2f} | {fria_us:>9.2f} | "
+            f"{anterior_us / compilado_us:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+"""
+Benchmark - cliente HTTP por requisição vs cliente compartilhado com pool
+
+Envia POSTs ao stub local do assistente de IA e compara p50/p99 de latência
+entre abrir um httpx.AsyncClient por requisição (comportamento anterior) e
+reutilizar o cliente compartilhado de app.application.cliente_http.
+
+Uso:
+    python benchmarks/bench_cliente_http.py
+"""
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+
+from app.application.cliente_http import fechar_cliente_assistente, iniciar_cliente_assistente  # noqa: E402
+from benchmarks.stub_servidor import StubServidor  # noqa: E402
+
+
+REQUISICOES = 2000
+CONCORRENCIA = 20
+PAYLOAD = {"solicitacao_usuario": "Onde fica o campo CNPJ?", "resposta_assistente": ""}
+
+
+async def por_requisicao(url: str) -> None:
+    async with httpx.AsyncClient(timeout=60.0) as client:
+        response = await client.post(url, json=PAYLOAD)
+        response.json()
+
+
+async def executar(nome: str, url: str, enviar) -> None:
+    latencias = []
+    fila = asyncio.Queue()
+    for _ in range(REQUISICOES):
+        fila.put_nowait(None)
+
+    async def trabalhador():
+        while not fila.empty():
+            fila.get_nowait()
+            inicio = time.perf_counter()
+            await enviar(url)
+            latencias.append((time.perf_counter() - inicio) * 1000)
+
+    inicio = time.perf_counter()
+    await asyncio.gather(*(trabalhador() for _ in range(CONCORRENCIA)))
+    duracao = time.perf_counter() - inicio
+
+    latencias.sort()
+    p50 = statistics.median(latencias)
+    p99 = latencias[int(len(latencias) * 0.99) - 1]
+    print(f"{nome:<26} | p50 {p50:7.2f} ms | p99 {p99:7.2f} ms | {REQUISICOES / duracao:8.0f} req/s")
+
+
+async def main() -> None:
+    stub = StubServidor()
+    host, porta = await stub.iniciar()
+    url = f"http://{host}:{porta}/solicitacoes/executar"
+
+    await executar("cliente por requisição", url, por_requisicao)
+    conexoes_antes = stub.conexoes
+
+    client = await iniciar_cliente_assistente()
+
+    async def compartilhado(url: str) -> None:
+        response = await client.post(url, json=PAYLOAD)
+        response.json()
+
+    await executar("cliente compartilhado", url, compartilhado)
+    await fechar_cliente_assistente()
+    print(f"\nconexões TCP abertas: por requisição={conexoes_antes}, compartilhado={stub.conexoes - conexoes_antes}")
+
+    await stub.parar()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
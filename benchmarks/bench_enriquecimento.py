@@ -0,0 +1,85 @@
+"""
+Benchmark - enriquecimento completo de uma pergunta
+
+Compara o enriquecimento chamando cada função separadamente (cada uma
+normaliza e varre a pergunta de novo, como enviar_para_assistente_ia fazia)
+com uma única análise compartilhada via analisar_pergunta() e com o
+enriquecimento memorizado (enriquecer_pergunta, pergunta repetida). Também
+confere que os três caminhos produzem os mesmos campos.
+
+Uso:
+    python benchmarks/bench_enriquecimento.py
+"""
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.analise_pergunta import analisar_pergunta, determinar_tela_atual, enriquecer_pergunta  # noqa: E402
+from app.application.solicitacoes import (  # noqa: E402
+    detectar_categoria_solicitacao,
+    detectar_complexidade,
+    detectar_sentimento,
+    detectar_subcategoria_solicitacao,
+    extrair_palavras_chave,
+    extrair_topicos_abordados,
+    gerar_tags
+)
+
+
+PRODUTO = {"type": "Clientes", "data": {"nome": "ACME Ltda", "cnpj": ""}}
+
+PERGUNTAS = {
+    "curta (~5 palavras)": "onde fica o campo CNPJ?",
+    "média (~15 palavras)": "Preciso saber como faço para emitir a nota fiscal eletrônica do pedido de venda de hoje",
+    "longa (~40 palavras)": (
+        "Bom dia, estou tentando cadastrar um novo cliente pessoa jurídica mas o sistema mostra um aviso "
+        "quando informo o documento e não consigo salvar o formulário; já conferi o endereço e o telefone, "
+        "mas continua igual. O que pode estar acontecendo e qual é o procedimento correto?"
+    )
+}
+
+
+def enriquecer_separado(pergunta: str) -> dict:
+    """Uma chamada por campo, cada uma analisando a pergunta do zero"""
+    categoria = detectar_categoria_solicitacao(pergunta)
+    return {
+        "tela_atual": determinar_tela_atual(PRODUTO),
+        "categoria": categoria,
+        "subcategoria": detectar_subcategoria_solicitacao(pergunta, PRODUTO),
+        "palavras_chave": extrair_palavras_chave(pergunta),
+        "topicos_abordados": extrair_topicos_abordados(pergunta, PRODUTO),
+        "tags": gerar_tags(pergunta, PRODUTO),
+        "complexidade": detectar_complexidade(pergunta),
+        "sentimento": detectar_sentimento(pergunta)
+    }
+
+
+def enriquecer_unico(pergunta: str) -> dict:
+    return analisar_pergunta(pergunta, PRODUTO).enriquecimento()
+
+
+def main() -> None:
+    repeticoes = 10_000
+    print(
+        f"{'pergunta':<22} | {'separado (us)':>13} | {'passada única (us)':>18} | "
+        f"{'memorizado (us)':>15} | {'ganho':>6}"
+    )
+    print("-" * 88)
+    for nome, pergunta in PERGUNTAS.items():
+        assert enriquecer_separado(pergunta) == enriquecer_unico(pergunta) == enriquecer_pergunta(pergunta, PRODUTO)
+        separado = timeit.timeit(lambda: enriquecer_separado(pergunta), number=repeticoes)
+        unico = timeit.timeit(lambda: enriquecer_unico(pergunta), number=repeticoes)
+        memorizado = timeit.timeit(lambda: enriquecer_pergunta(pergunta, PRODUTO), number=repeticoes)
+        separado_us = separado / repeticoes * 1_000_000
+        unico_us = unico / repeticoes * 1_000_000
+        memorizado_us = memorizado / repeticoes * 1_000_000
+        print(
+            f"{nome:<22} | {separado_us:>13.2f} | {unico_us:>18.2f} | "
+            f"{memorizado_us:>15.2f} | {separado_us / memorizado_us:>5.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
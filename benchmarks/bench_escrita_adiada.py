@@ -0,0 +1,110 @@
+"""
+Benchmark - escritas do caminho da requisição com SQLite
+
+Cada chamada a /api/assistant cria o registro, marca "processando" e grava
+a resposta: três escritas. Mede a latência dessas três escritas por
+requisição (p50/p99) e a vazão com:
+
+- SQLite com commit a cada escrita (durável a cada passo)
+- SQLite com commits em lote (lote_commit=100)
+- escrita adiada sobre o SQLite (write-behind: memória + gravação em lote
+  numa thread, uma transação por descarga)
+
+No fim, confere que a escrita adiada gravou no arquivo o mesmo número de
+registros concluídos depois de fechar o repositório.
+
+Uso:
+    python benchmarks/bench_escrita_adiada.py [requisicoes]
+"""
+import asyncio
+import contextlib
+import io
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application import solicitacoes  # noqa: E402
+from app.application.armazenamento_sqlite import ArmazenamentoSolicitacoesSQLite  # noqa: E402
+from app.application.escrita_adiada import RepositorioEscritaAdiada  # noqa: E402
+from app.application.solicitacoes import GerenciadorSolicitacoes, criar_solicitacao_assistente_virtual  # noqa: E402
+
+
+MODULO = {"type": "Clientes", "data": {"nome": "ACME Ltda", "cnpj": "00.000.000/0001-00"}}
+RESPOSTA = "O campo CNPJ fica na aba Dados Gerais do cadastro de clientes. " * 8
+
+
+async def simular(repositorio, requisicoes: int):
+    solicitacoes.solicitacoes_db = repositorio
+    latencias = []
+    inicio_total = time.perf_counter()
+    for indice in range(requisicoes):
+        inicio = time.perf_counter()
+        solicitacao = criar_solicitacao_assistente_virtual(
+            user_data={"id": indice % 100, "name": f"Usuário {indice % 100}"},
+            pergunta="Onde fica o campo CNPJ no cadastro de clientes?",
+            contexto_produto={"modulo": MODULO}
+        )
+        GerenciadorSolicitacoes.atualizar_status(solicitacao["id"], "processando")
+        GerenciadorSolicitacoes.atualizar_resposta_assistente(solicitacao["id"], RESPOSTA, 120, 0.8)
+        latencias.append((time.perf_counter() - inicio) * 1_000_000)
+        # Cede o event loop como um servidor entre requisições (o descarregador roda aqui)
+        await asyncio.sleep(0)
+    total = time.perf_counter() - inicio_total
+    latencias.sort()
+    return (
+        statistics.median(latencias),
+        latencias[int(len(latencias) * 0.99) - 1],
+        requisicoes / total
+    )
+
+
+def imprimir(nome: str, medidas) -> None:
+    p50, p99, vazao = medidas
+    print(f"{nome:<32} | {p50:>10.1f} | {p99:>10.1f} | {vazao:>12,.0f}")
+
+
+async def main() -> None:
+    requisicoes = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    print(f"{requisicoes:,} requisições (3 escritas cada)\n")
+    print(f"{'repositório':<32} | {'p50 (µs)':>10} | {'p99 (µs)':>10} | {'req/s':>12}")
+    print("-" * 74)
+
+    with tempfile.TemporaryDirectory() as diretorio, contextlib.redirect_stdout(io.StringIO()) as saida:
+        por_escrita = ArmazenamentoSolicitacoesSQLite(os.path.join(diretorio, "por_escrita.db"), lote_commit=1)
+        medidas_por_escrita = await simular(por_escrita, min(requisicoes, 2_000))
+        por_escrita.fechar()
+
+        em_lote = ArmazenamentoSolicitacoesSQLite(os.path.join(diretorio, "em_lote.db"), lote_commit=100)
+        medidas_em_lote = await simular(em_lote, requisicoes)
+        em_lote.fechar()
+
+        caminho = os.path.join(diretorio, "escrita_adiada.db")
+        adiada = RepositorioEscritaAdiada(ArmazenamentoSolicitacoesSQLite(caminho), intervalo=0.05, limite=500)
+        adiada.iniciar()
+        medidas_adiada = await simular(adiada, requisicoes)
+        estatisticas = adiada.descricao()["escrita_adiada"]
+        await adiada.parar()
+        adiada.fechar()
+
+        reaberto = ArmazenamentoSolicitacoesSQLite(caminho)
+        concluidas = reaberto.contagens("status").get("concluida", 0)
+        reaberto.fechar()
+    del saida
+
+    imprimir("sqlite (commit por escrita)", medidas_por_escrita)
+    imprimir("sqlite (commit em lote)", medidas_em_lote)
+    imprimir("escrita adiada (write-behind)", medidas_adiada)
+    print(
+        f"\nescrita adiada: {estatisticas['mutacoes']:,} mutações -> "
+        f"{estatisticas['registros_gravados']:,} registros gravados em {estatisticas['descargas']} descargas "
+        f"({estatisticas['tempo_gravacao_ms']:.0f} ms de gravação fora do event loop)"
+    )
+    print(f"concluídas no arquivo após fechar: {concluidas:,}/{requisicoes:,}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
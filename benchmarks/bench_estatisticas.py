@@ -0,0 +1,86 @@
+"""
+Benchmark - latência de leitura das estatísticas de solicitações
+
+Compara a contagem antiga (três varreduras completas do histórico) com os
+contadores incrementais de ArmazenamentoSolicitacoes para 10k, 100k e 1M
+solicitações armazenadas.
+
+Uso:
+    python benchmarks/bench_estatisticas.py
+"""
+import os
+import sys
+import time
+from datetime import datetime
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.armazenamento import ArmazenamentoSolicitacoes  # noqa: E402
+
+
+TAMANHOS = (10_000, 100_000, 1_000_000)
+STATUS = ("pendente", "processando", "concluida", "erro")
+TIPOS = ("assistente_virtual", "produto", "suporte")
+PRIORIDADES = ("baixa", "normal", "alta", "urgente")
+
+
+def popular(armazenamento: ArmazenamentoSolicitacoes, total: int) -> None:
+    agora = datetime.now()
+    for i in range(total):
+        armazenamento.inserir({
+            "id": f"SOL_{i}",
+            "user_id": i % 500,
+            "tipo": TIPOS[i % len(TIPOS)],
+            "status": STATUS[i % len(STATUS)],
+            "prioridade": PRIORIDADES[i % len(PRIORIDADES)],
+            "created_at": agora,
+            "updated_at": agora
+        })
+
+
+def estatisticas_varredura(armazenamento: ArmazenamentoSolicitacoes) -> dict:
+    """Implementação anterior: três passadas sobre todo o histórico"""
+    status_count, tipo_count, prioridade_count = {}, {}, {}
+    for sol in armazenamento:
+        status = sol.get("status", "pendente")
+        status_count[status] = status_count.get(status, 0) + 1
+    for sol in armazenamento:
+        tipo = sol.get("tipo", "indefinido")
+        tipo_count[tipo] = tipo_count.get(tipo, 0) + 1
+    for sol in armazenamento:
+        prioridade = sol.get("prioridade", "normal")
+        prioridade_count[prioridade] = prioridade_count.get(prioridade, 0) + 1
+    return {"por_status": status_count, "por_tipo": tipo_count, "por_prioridade": prioridade_count}
+
+
+def estatisticas_incrementais(armazenamento: ArmazenamentoSolicitacoes) -> dict:
+    return {
+        "por_status": armazenamento.contagens("status"),
+        "por_tipo": armazenamento.contagens("tipo"),
+        "por_prioridade": armazenamento.contagens("prioridade")
+    }
+
+
+def medir(funcao, armazenamento, repeticoes: int) -> float:
+    """Retorna a latência média em microssegundos"""
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        funcao(armazenamento)
+    return (time.perf_counter() - inicio) / repeticoes * 1_000_000
+
+
+def main() -> None:
+    print(f"{'registros':>10} | {'varredura (us)':>15} | {'incremental (us)':>17} | {'ganho':>8}")
+    print("-" * 60)
+    for total in TAMANHOS:
+        armazenamento = ArmazenamentoSolicitacoes()
+        popular(armazenamento, total)
+        assert estatisticas_varredura(armazenamento) == estatisticas_incrementais(armazenamento)
+
+        varredura = medir(estatisticas_varredura, armazenamento, max(1, 100_000 // total))
+        incremental = medir(estatisticas_incrementais, armazenamento, 10_000)
+        print(f"{total:>10} | {varredura:>15.1f} | {incremental:>17.2f} | {varredura / incremental:>7.0f}x")
+
+
+if __name__ == "__main__":
+    main()
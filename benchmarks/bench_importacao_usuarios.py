@@ -0,0 +1,102 @@
+"""
+Benchmark - importação e exportação de usuários em massa
+
+Cria N usuários pelo router de usuários (TestClient, sem rede) de três
+formas, em memória e no SQLite:
+
+- um POST /api/users/ por usuário (medido em uma amostra e extrapolado)
+- POST /api/users/bulk com o corpo NDJSON enviado em pedaços de 64 KB
+- POST /api/users/bulk com o corpo em CSV
+
+e depois exporta todos com GET /api/users/export (NDJSON e CSV), em
+usuários por segundo.
+
+Uso:
+    python benchmarks/bench_importacao_usuarios.py [quantidade]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fastapi import FastAPI  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.api.users import router  # noqa: E402
+from app.application import usuarios  # noqa: E402
+from app.application.usuarios import ArmazenamentoUsuarios  # noqa: E402
+from app.application.usuarios_sqlite import ArmazenamentoUsuariosSQLite  # noqa: E402
+
+TAMANHO_PEDACO = 64 * 1024
+AMOSTRA_UM_A_UM = 5000
+
+
+def em_pedacos(corpo: bytes):
+    for inicio in range(0, len(corpo), TAMANHO_PEDACO):
+        yield corpo[inicio:inicio + TAMANHO_PEDACO]
+
+
+def dados(quantidade: int, prefixo: str):
+    return [{"name": f"Usuário {indice}", "email": f"{prefixo}{indice}@example.com"} for indice in range(quantidade)]
+
+
+def medir(nome: str, criar_repositorio, quantidade: int) -> None:
+    cliente = TestClient(_app())
+    resultados = []
+
+    usuarios.usuarios_db = criar_repositorio("um_a_um")
+    amostra = dados(min(quantidade, AMOSTRA_UM_A_UM), "post")
+    inicio = time.perf_counter()
+    for usuario in amostra:
+        cliente.post("/api/users/", json=usuario)
+    resultados.append(len(amostra) / (time.perf_counter() - inicio))
+    usuarios.usuarios_db.fechar()
+
+    ndjson = "".join(json.dumps(usuario) + "\n" for usuario in dados(quantidade, "ndjson")).encode()
+    usuarios.usuarios_db = criar_repositorio("ndjson")
+    inicio = time.perf_counter()
+    resposta = cliente.post("/api/users/bulk", content=em_pedacos(ndjson), headers={"Content-Type": "application/x-ndjson"})
+    resultados.append(quantidade / (time.perf_counter() - inicio))
+    assert resposta.json()["created"] == quantidade, resposta.text
+
+    csv = ("name,email\r\n" + "".join(f"{u['name']},{u['email']}\r\n" for u in dados(quantidade, "csv"))).encode()
+    usuarios.usuarios_db = criar_repositorio("csv")
+    inicio = time.perf_counter()
+    resposta = cliente.post("/api/users/bulk", content=em_pedacos(csv), headers={"Content-Type": "text/csv"})
+    resultados.append(quantidade / (time.perf_counter() - inicio))
+    assert resposta.json()["created"] == quantidade, resposta.text
+
+    for formato in ("ndjson", "csv"):
+        inicio = time.perf_counter()
+        with cliente.stream("GET", f"/api/users/export?format={formato}") as resposta:
+            linhas = sum(pedaco.count(b"\n") for pedaco in resposta.iter_bytes())
+        resultados.append(quantidade / (time.perf_counter() - inicio))
+        assert linhas == quantidade + (formato == "csv"), linhas
+    usuarios.usuarios_db.fechar()
+
+    print(f"{nome:<10} | " + " | ".join(f"{valor:>11,.0f}" for valor in resultados))
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(router)
+    return app
+
+
+def main() -> None:
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    print(f"{quantidade:,} usuários, usuários por segundo (POST um a um: amostra de {min(quantidade, AMOSTRA_UM_A_UM):,})\n")
+    print(f"{'repositório':<10} | {'POST um a um':>11} | {'bulk NDJSON':>11} | {'bulk CSV':>11} | {'export NDJSON':>11} | {'export CSV':>11}")
+    print("-" * 86)
+
+    medir("memória", lambda _: ArmazenamentoUsuarios(), quantidade)
+    with tempfile.TemporaryDirectory() as diretorio:
+        medir("sqlite", lambda nome: ArmazenamentoUsuariosSQLite(os.path.join(diretorio, f"{nome}.db")), quantidade)
+    print("\n(tempos de ponta a ponta no router; a exportação lê o repositório preenchido pela importação CSV)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+"""
+Benchmark - lote de perguntas ao assistente de IA
+
+Simula a ferramenta de onboarding: 200 perguntas de FAQ (40 distintas,
+repetidas para usuários diferentes) contra um stub local do assistente
+(porta 8001, com atraso). Compara:
+
+- enriquecimento: uma chamada de analisar_pergunta por item vs
+  enriquecer_perguntas no lote (cache de enriquecimento desativado)
+- envio: uma chamada de enviar_para_assistente_ia por vez (como um cliente
+  chamando /api/assistant em sequência) vs processar_lote_ordenado com
+  paralelismo limitado
+
+O cache de respostas é desativado para que todo item chegue ao assistente.
+
+Uso:
+    python benchmarks/bench_lote.py
+"""
+import asyncio
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.analise_pergunta import analisar_pergunta, cache_enriquecimento, enriquecer_perguntas  # noqa: E402
+from app.application.cache_respostas import cache_respostas  # noqa: E402
+from app.application.cliente_http import fechar_cliente_assistente, iniciar_cliente_assistente  # noqa: E402
+from app.application.lote_assistente import processar_lote_ordenado  # noqa: E402
+from app.application.solicitacoes import enviar_para_assistente_ia  # noqa: E402
+from benchmarks.stub_servidor import StubServidor  # noqa: E402
+
+
+ITENS = 200
+DISTINTAS = 40
+ATRASO = 0.05
+PARALELISMO = 8
+MODULO = {"type": "Clientes", "data": {"nome": "ACME Ltda", "cnpj": "00.000.000/0001-00"}}
+
+
+def montar_itens():
+    return [
+        {
+            "user_data": {"id": indice, "name": f"Usuário {indice}"},
+            "product_data": MODULO,
+            "user_question": f"como cadastrar o cliente com cnpj {indice % DISTINTAS} na tela de vendas?"
+        }
+        for indice in range(ITENS)
+    ]
+
+
+def bench_enriquecimento(itens) -> None:
+    cache_enriquecimento.max_itens = 0
+    pares = [(item["user_question"], item["product_data"]) for item in itens]
+
+    inicio = time.perf_counter()
+    for pergunta, modulo in pares:
+        analisar_pergunta(pergunta, modulo).enriquecimento()
+    por_item = (time.perf_counter() - inicio) * 1000
+
+    inicio = time.perf_counter()
+    enriquecer_perguntas(pares)
+    lote = (time.perf_counter() - inicio) * 1000
+
+    print(f"{'enriquecimento por item':<32} | {por_item:>10.2f}")
+    print(f"{'enriquecimento em lote':<32} | {lote:>10.2f}")
+
+
+async def bench_envio(itens) -> None:
+    # enviar_para_assistente_ia registra cada payload com print; silenciado aqui
+    with contextlib.redirect_stdout(io.StringIO()):
+        inicio = time.perf_counter()
+        for item in itens:
+            resultado = await enviar_para_assistente_ia(item["user_data"], item["product_data"], item["user_question"])
+            assert resultado["success"]
+        sequencial = (time.perf_counter() - inicio) * 1000
+
+        inicio = time.perf_counter()
+        resultados = await processar_lote_ordenado(itens, paralelismo=PARALELISMO)
+        lote = (time.perf_counter() - inicio) * 1000
+    assert all(resultado["success"] for resultado in resultados)
+
+    print(f"{'envio sequencial':<32} | {sequencial:>10.0f}")
+    print(f"{f'envio em lote (paralelismo {PARALELISMO})':<32} | {lote:>10.0f}")
+
+
+async def main() -> None:
+    cache_respostas.cache.ttl = 0
+    stub = StubServidor(atraso=ATRASO)
+    await stub.iniciar(porta=8001)
+    await iniciar_cliente_assistente()
+
+    itens = montar_itens()
+    print(f"{ITENS} itens ({DISTINTAS} perguntas distintas), stub com {ATRASO * 1000:.0f} ms\n")
+    print(f"{'etapa':<32} | {'tempo (ms)':>10}")
+    print("-" * 45)
+    bench_enriquecimento(itens)
+    await bench_envio(itens)
+
+    await fechar_cliente_assistente()
+    await stub.parar()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,128 @@
+"""
+Benchmark - bytes por solicitação guardada em memória
+
+Mede com tracemalloc a memória de N solicitações do assistente concluídas
+(ID, pergunta e resposta próprias, contexto do módulo pequeno), todas
+carregadas do mesmo JSON, em dois formatos:
+
+- dict (como hoje: 14 chaves, duas datetime e, vindo de JSON/SQLite,
+  cópias próprias de "assistente_virtual", "concluida" e "normal")
+- RegistroSolicitacao (slots, valores internados, datas em epoch)
+
+e o repositório em memória inteiro (registros + índices) com registros
+comuns vs compactos, além do custo de leitura de registro["status"] e
+registro["created_at"].
+
+Uso:
+    python benchmarks/bench_registros.py [quantidade]
+"""
+import gc
+import json
+import os
+import sys
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application.armazenamento import ArmazenamentoSolicitacoes  # noqa: E402
+from app.application.registro import RegistroSolicitacao  # noqa: E402
+
+
+def gerar(quantidade: int):
+    inicio = datetime(2024, 1, 1, 8, 0, 0)
+    for indice in range(quantidade):
+        criado = inicio + timedelta(seconds=indice)
+        yield {
+            "id": f"SOL_20240101_{indice:08d}",
+            "user_id": indice % 500,
+            "user_name": f"Usuário {indice % 500}",
+            "user_email": None,
+            "tipo": "assistente_virtual",
+            "status": "concluida",
+            "prioridade": "normal",
+            "pergunta": f"Onde fica o campo CNPJ no cadastro de clientes? ({indice})",
+            "contexto_produto": {"modulo": {"type": "Clientes"}},
+            "resposta": f"Resposta {indice}: o campo CNPJ fica na aba Dados Gerais.",
+            "tokens_utilizados": 120,
+            "tempo_resposta": 0.8,
+            "created_at": criado,
+            "updated_at": criado + timedelta(seconds=1)
+        }
+
+
+def medir(construir) -> float:
+    """Bytes alocados e mantidos por construir(), via tracemalloc"""
+    gc.collect()
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    objeto = construir()
+    depois = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del objeto
+    return depois - antes
+
+
+def tempo_leitura(registros) -> float:
+    inicio = time.perf_counter()
+    for registro in registros:
+        registro["status"]
+        registro["created_at"]
+    return (time.perf_counter() - inicio) / len(registros) * 1e9
+
+
+def main() -> None:
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    # Entradas pré-geradas fora da medição (pergunta/resposta/ID contam em todos os formatos)
+    originais = list(gerar(quantidade))
+    serializados = [json.dumps(solicitacao, default=lambda valor: valor.isoformat()) for solicitacao in originais]
+
+    def carregar_json():
+        registros = []
+        for texto in serializados:
+            dados = json.loads(texto)
+            for campo in ("created_at", "updated_at"):
+                dados[campo] = datetime.fromisoformat(dados[campo])
+            registros.append(dados)
+        return registros
+
+    def carregar_compacto():
+        registros = []
+        for texto in serializados:
+            registros.append(RegistroSolicitacao(json.loads(texto)))
+        return registros
+
+    def repositorio(compacto: bool):
+        def construir():
+            armazenamento = ArmazenamentoSolicitacoes(registros_compactos=compacto)
+            for texto in serializados:
+                dados = json.loads(texto)
+                for campo in ("created_at", "updated_at"):
+                    dados[campo] = datetime.fromisoformat(dados[campo])
+                armazenamento.inserir(dados)
+            return armazenamento
+        return construir
+
+    # Todos os formatos partem do mesmo JSON, então ID, pergunta e resposta pesam igual em cada linha
+    linhas = [
+        ("dict (lido de JSON)", medir(carregar_json)),
+        ("RegistroSolicitacao (lido de JSON)", medir(carregar_compacto)),
+        ("repositório com dicts", medir(repositorio(False))),
+        ("repositório compacto", medir(repositorio(True))),
+    ]
+
+    print(f"{quantidade:,} solicitações\n")
+    print(f"{'formato':<36} | {'bytes/registro':>14} | {'total (MB)':>10}")
+    print("-" * 66)
+    for nome, total in linhas:
+        print(f"{nome:<36} | {total / quantidade:>14,.0f} | {total / (1024 * 1024):>10.1f}")
+
+    amostra = originais[:50_000]
+    compactos = [RegistroSolicitacao(solicitacao) for solicitacao in amostra]
+    print(f"\nleitura de status + created_at: dict {tempo_leitura(amostra):.0f} ns, "
+          f"RegistroSolicitacao {tempo_leitura(compactos):.0f} ns por registro")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+"""
+Benchmark - memória do histórico de solicitações em regime contínuo
+
+Simula tráfego constante no repositório em memória: cada requisição cria
+uma solicitação do assistente com o formulário do módulo (~4 KB), marca
+"processando" e grava uma resposta (~2 KB). A cada 5.000 requisições
+mede o RSS do processo, sem retenção e com RetencaoSolicitacoes
+(compactação imediata dos finalizados e limite de 20.000 registros), cada
+modo em um processo separado. Com retenção o RSS deve se estabilizar; sem
+ela cresce linearmente.
+
+Uso:
+    python benchmarks/bench_retencao.py [requisicoes]
+"""
+import asyncio
+import contextlib
+import gc
+import io
+import os
+import resource
+import subprocess
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application import solicitacoes  # noqa: E402
+from app.application.armazenamento import ArmazenamentoSolicitacoes  # noqa: E402
+from app.application.retencao import RetencaoSolicitacoes  # noqa: E402
+from app.application.solicitacoes import GerenciadorSolicitacoes, criar_solicitacao_assistente_virtual  # noqa: E402
+
+
+PASSO = 5_000
+MAX_REGISTROS = 20_000
+
+
+def rss_mb() -> float:
+    try:
+        with open("/proc/self/status") as status:
+            for linha in status:
+                if linha.startswith("VmRSS:"):
+                    return int(linha.split()[1]) / 1024
+    except OSError:
+        pass
+    # Sem /proc: pico de RSS (KB no Linux, bytes no macOS)
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return pico / (1024 * 1024) if sys.platform == "darwin" else pico / 1024
+
+
+def executar(modo: str, requisicoes: int) -> None:
+    repositorio = ArmazenamentoSolicitacoes()
+    solicitacoes.solicitacoes_db = repositorio
+    retencao = RetencaoSolicitacoes(
+        lambda: repositorio,
+        max_registros=MAX_REGISTROS,
+        ttl=0,
+        max_bytes=0,
+        compactar_apos=0
+    )
+
+    for indice in range(requisicoes):
+        # Strings novas a cada requisição, como as vindas do corpo JSON
+        modulo = {
+            "type": "Clientes",
+            "data": {f"campo_{campo}": f"valor {indice} {campo} " * 10 for campo in range(20)}
+        }
+        solicitacao = criar_solicitacao_assistente_virtual(
+            user_data={"id": indice % 100, "name": f"Usuário {indice % 100}"},
+            pergunta=f"Onde fica o campo CNPJ no cadastro de clientes? ({indice})",
+            contexto_produto={"modulo": modulo}
+        )
+        GerenciadorSolicitacoes.atualizar_status(solicitacao["id"], "processando")
+        resposta = f"Resposta {indice}: o campo CNPJ fica na aba Dados Gerais. " * 35
+        GerenciadorSolicitacoes.atualizar_resposta_assistente(solicitacao["id"], resposta, 120, 0.8)
+
+        if (indice + 1) % PASSO == 0:
+            if modo == "retencao":
+                asyncio.run(retencao.varrer())
+            gc.collect()
+            print(f"{modo},{indice + 1},{len(repositorio)},{rss_mb():.1f}", flush=True)
+
+
+def main() -> None:
+    if len(sys.argv) > 2 and sys.argv[1] == "--modo":
+        with contextlib.redirect_stdout(io.StringIO()) as saida:
+            executar(sys.argv[2], int(sys.argv[3]))
+        # Só as linhas de medição (os prints da aplicação ficam de fora)
+        print("".join(linha for linha in saida.getvalue().splitlines(True) if linha.count(",") == 3), end="")
+        return
+
+    requisicoes = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    medidas = {}
+    for modo in ("sem_retencao", "retencao"):
+        saida = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), "--modo", modo, str(requisicoes)],
+            capture_output=True, text=True, check=True
+        ).stdout
+        for linha in saida.splitlines():
+            _, feitas, registros, rss = linha.split(",")
+            medidas.setdefault(int(feitas), {})[modo] = (int(registros), float(rss))
+
+    print(f"{requisicoes:,} requisições, retenção com até {MAX_REGISTROS:,} registros e compactação imediata\n")
+    print(f"{'requisições':>12} | {'registros':>10} | {'RSS sem (MB)':>12} | {'registros':>10} | {'RSS com (MB)':>12}")
+    print("-" * 68)
+    for feitas in sorted(medidas):
+        sem_registros, sem_rss = medidas[feitas]["sem_retencao"]
+        com_registros, com_rss = medidas[feitas]["retencao"]
+        print(f"{feitas:>12,} | {sem_registros:>10,} | {sem_rss:>12.1f} | {com_registros:>10,} | {com_rss:>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
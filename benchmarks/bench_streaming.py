@@ -0,0 +1,175 @@
+"""
+Benchmark - tempo até o primeiro token: resposta completa vs streaming
+
+Um stub local do assistente (porta 8001) gera a resposta token a token, com
+atraso fixo por token. No modo completo ele só responde quando termina de
+gerar (JSON, como hoje); no modo streaming envia cada token como evento SSE
+assim que é gerado. Mede, para enviar_para_assistente_ia e para
+transmitir_para_assistente_ia, o tempo até o primeiro texto disponível e o
+tempo total. Em seguida repete a medição de ponta a ponta, lendo
+POST /api/assistant e POST /api/assistant/stream de um servidor uvicorn
+local, como o navegador faria. O cache de respostas é desativado.
+
+Uso:
+    python benchmarks/bench_streaming.py
+"""
+import asyncio
+import contextlib
+import io
+import json
+import os
+import socket
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import httpx  # noqa: E402
+import uvicorn  # noqa: E402
+
+import main as aplicacao  # noqa: E402
+from app.application.cache_respostas import cache_respostas  # noqa: E402
+from app.application.cliente_http import fechar_cliente_assistente, iniciar_cliente_assistente  # noqa: E402
+from app.application.solicitacoes import enviar_para_assistente_ia  # noqa: E402
+from app.application.transmissao_assistente import transmitir_para_assistente_ia  # noqa: E402
+from benchmarks.stub_servidor import StubServidor  # noqa: E402
+
+
+TOKENS = 40
+ATRASO_TOKEN = 0.02
+REPETICOES = 5
+MODULO = {"type": "Clientes", "data": {"nome": "ACME Ltda"}}
+USUARIO = {"id": 1, "name": "Usuário Benchmark"}
+PERGUNTA = "como cadastrar um cliente?"
+
+
+class StubStreaming(StubServidor):
+    """Stub que gera TOKENS tokens com ATRASO_TOKEN entre eles"""
+
+    def __init__(self):
+        super().__init__()
+        self.streaming = False
+        self.tokens = [f"palavra{indice} " for indice in range(TOKENS)]
+
+    async def responder(self, writer: asyncio.StreamWriter, metodo: str, caminho: str) -> None:
+        if not self.streaming:
+            # Gera tudo antes de responder, como um serviço sem streaming
+            await asyncio.sleep(ATRASO_TOKEN * len(self.tokens))
+            self.corpo = json.dumps({
+                "execucao": {"resposta": "".join(self.tokens), "tokens_utilizados": len(self.tokens)},
+                "processamento": {"tempo_processamento": ATRASO_TOKEN * len(self.tokens)},
+                "solicitacao_salva": {"id": "stub-1"}
+            }).encode()
+            await super().responder(writer, metodo, caminho)
+            return
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n"
+            b"Connection: keep-alive\r\n\r\n"
+        )
+        eventos = [json.dumps({"delta": token}) for token in self.tokens]
+        eventos.append(json.dumps({
+            "execucao": {"tokens_utilizados": len(self.tokens)},
+            "solicitacao_salva": {"id": "stub-1"}
+        }))
+        eventos.append("[DONE]")
+        for indice, evento in enumerate(eventos):
+            if indice < len(self.tokens):
+                await asyncio.sleep(ATRASO_TOKEN)
+            pedaco = f"data: {evento}\n\n".encode()
+            writer.write(f"{len(pedaco):x}\r\n".encode() + pedaco + b"\r\n")
+            await writer.drain()
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+async def medir_completo():
+    inicio = time.perf_counter()
+    resultado = await enviar_para_assistente_ia(USUARIO, MODULO, PERGUNTA)
+    total = time.perf_counter() - inicio
+    assert resultado["success"], resultado
+    # Sem streaming, o primeiro texto só existe quando a resposta inteira chega
+    return total, total
+
+
+async def medir_streaming():
+    inicio = time.perf_counter()
+    primeiro = None
+    async for evento, dados in transmitir_para_assistente_ia(USUARIO, MODULO, PERGUNTA):
+        if evento == "token" and primeiro is None:
+            primeiro = time.perf_counter() - inicio
+        elif evento == "fim":
+            assert dados["tokens_used"] == TOKENS, dados
+        elif evento == "erro":
+            raise AssertionError(dados)
+    return primeiro, time.perf_counter() - inicio
+
+
+async def medir_http(cliente: httpx.AsyncClient, caminho: str):
+    corpo = {"user": USUARIO, "module": MODULO, "userQuestion": PERGUNTA}
+    inicio = time.perf_counter()
+    primeiro = None
+    async with cliente.stream("POST", caminho, json=corpo) as response:
+        async for linha in response.aiter_lines():
+            if primeiro is None and (linha.startswith("event: token") or caminho == "/api/assistant"):
+                primeiro = time.perf_counter() - inicio
+    return primeiro, time.perf_counter() - inicio
+
+
+async def repetir(nome: str, medir) -> None:
+    primeiros, totais = [], []
+    for _ in range(REPETICOES):
+        # As funções do assistente registram cada payload com print; silenciado aqui
+        with contextlib.redirect_stdout(io.StringIO()):
+            primeiro, total = await medir()
+        primeiros.append(primeiro * 1000)
+        totais.append(total * 1000)
+    print(f"{nome:<36} | {statistics.median(primeiros):>18.1f} | {statistics.median(totais):>12.1f}")
+
+
+def porta_livre() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+async def main() -> None:
+    # Também vale para o lifespan do uvicorn, que reconfigura o cache
+    os.environ["RESPOSTA_CACHE_TTL"] = "0"
+    cache_respostas.configurar()
+    stub = StubStreaming()
+    await stub.iniciar(porta=8001)
+    await iniciar_cliente_assistente()
+
+    print(f"{TOKENS} tokens, {ATRASO_TOKEN * 1000:.0f} ms por token, mediana de {REPETICOES} execuções\n")
+    print(f"{'caminho':<36} | {'primeiro token (ms)':>18} | {'total (ms)':>12}")
+    print("-" * 74)
+
+    stub.streaming = False
+    await repetir("enviar_para_assistente_ia", medir_completo)
+    stub.streaming = True
+    await repetir("transmitir_para_assistente_ia", medir_streaming)
+
+    porta = porta_livre()
+    servidor = uvicorn.Server(uvicorn.Config(aplicacao.app, host="127.0.0.1", port=porta, log_level="warning"))
+    tarefa = asyncio.create_task(servidor.serve())
+    while not servidor.started:
+        await asyncio.sleep(0.01)
+
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{porta}", timeout=30) as cliente:
+        stub.streaming = False
+        await repetir("POST /api/assistant", lambda: medir_http(cliente, "/api/assistant"))
+        stub.streaming = True
+        await repetir("POST /api/assistant/stream", lambda: medir_http(cliente, "/api/assistant/stream"))
+
+    servidor.should_exit = True
+    await tarefa
+    await fechar_cliente_assistente()
+    await stub.parar()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
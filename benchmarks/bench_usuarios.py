@@ -0,0 +1,121 @@
+"""
+Benchmark - repositório de usuários
+
+Compara a lista antiga (fake_users_db: novo ID com max() sobre a tabela a
+cada cadastro e busca/remoção por varredura linear) com o repositório
+indexado em memória e com o SQLite: cadastros, buscas por ID e por
+e-mail e remoções por segundo. A lista antiga mede só uma fração do
+volume, já que cadastrar em sequência nela é O(n²).
+
+Depois compara o custo (listagem + JSON) de preencher o seletor de
+usuários do dashboard: a tabela inteira, como antes, vs uma página de 50
+com fields=id,name,email,active, e uma busca por prefixo de nome (typeahead).
+
+Uso:
+    python benchmarks/bench_usuarios.py [quantidade]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.application import usuarios  # noqa: E402
+from app.application.usuarios import ArmazenamentoUsuarios, GerenciadorUsuarios  # noqa: E402
+from app.application.usuarios_sqlite import ArmazenamentoUsuariosSQLite  # noqa: E402
+
+
+class ListaUsuarios:
+    """Comportamento anterior de app/api/users.py, para comparação"""
+
+    def __init__(self):
+        self.usuarios = []
+
+    def inserir(self, dados):
+        novo_id = max([u["id"] for u in self.usuarios]) + 1 if self.usuarios else 1
+        usuario = {"id": novo_id, "name": dados["name"], "email": dados["email"], "active": True}
+        self.usuarios.append(usuario)
+        return usuario
+
+    def buscar(self, user_id):
+        return next((u for u in self.usuarios if u["id"] == user_id), None)
+
+    def buscar_por_email(self, email):
+        return next((u for u in self.usuarios if u["email"] == email), None)
+
+    def remover(self, user_id):
+        indice = next((i for i, u in enumerate(self.usuarios) if u["id"] == user_id), None)
+        return self.usuarios.pop(indice) if indice is not None else None
+
+
+def por_segundo(operacao, itens) -> float:
+    inicio = time.perf_counter()
+    for item in itens:
+        operacao(item)
+    return len(itens) / (time.perf_counter() - inicio)
+
+
+def medir(nome: str, repositorio, quantidade: int) -> None:
+    dados = [{"name": f"Usuário {indice}", "email": f"usuario{indice}@example.com"} for indice in range(quantidade)]
+    cadastro = por_segundo(repositorio.inserir, dados)
+
+    amostra = random.sample(range(1, quantidade + 1), min(quantidade, 2000))
+    busca = por_segundo(repositorio.buscar, amostra)
+    busca_email = por_segundo(repositorio.buscar_por_email, [f"usuario{user_id - 1}@example.com" for user_id in amostra])
+    remocao = por_segundo(repositorio.remover, amostra)
+
+    print(f"{nome:<22} | {quantidade:>9,} | {cadastro:>10,.0f} | {busca:>10,.0f} | {busca_email:>10,.0f} | {remocao:>10,.0f}")
+
+
+def tempo_ms(operacao, repeticoes: int) -> float:
+    inicio = time.perf_counter()
+    for _ in range(repeticoes):
+        operacao()
+    return (time.perf_counter() - inicio) / repeticoes * 1000
+
+
+def medir_listagem(nome: str, repositorio) -> None:
+    usuarios.usuarios_db = repositorio
+
+    def tabela_inteira():
+        json.dumps(list(repositorio))
+
+    def pagina():
+        pagina, _ = GerenciadorUsuarios.listar_usuarios(limit=50, campos=["id", "name", "email", "active"])
+        json.dumps(pagina)
+
+    def prefixo():
+        pagina, _ = GerenciadorUsuarios.listar_usuarios(limit=20, name_prefix="usuário 4242", campos=["id", "name"])
+        json.dumps(pagina)
+
+    prefixo()  # índice de prefixo construído fora da medição
+    print(f"{nome:<22} | {tempo_ms(tabela_inteira, 3):>14.2f} | {tempo_ms(pagina, 200):>14.3f} | {tempo_ms(prefixo, 200):>14.3f}")
+
+
+def main() -> None:
+    quantidade = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    random.seed(42)
+    print("operações por segundo\n")
+    print(f"{'repositório':<22} | {'usuários':>9} | {'cadastro':>10} | {'busca ID':>10} | {'busca email':>10} | {'remoção':>10}")
+    print("-" * 86)
+
+    medir("lista (anterior)", ListaUsuarios(), min(quantidade, 10_000))
+    memoria = ArmazenamentoUsuarios()
+    medir("memória indexada", memoria, quantidade)
+    with tempfile.TemporaryDirectory() as diretorio:
+        sqlite = ArmazenamentoUsuariosSQLite(os.path.join(diretorio, "usuarios.db"))
+        medir("sqlite", sqlite, quantidade)
+
+        print(f"\nlistagem com {len(memoria):,} usuários (ms por chamada, incluindo JSON)\n")
+        print(f"{'repositório':<22} | {'tabela inteira':>14} | {'página de 50':>14} | {'prefixo nome':>14}")
+        print("-" * 74)
+        medir_listagem("memória indexada", memoria)
+        medir_listagem("sqlite", sqlite)
+        sqlite.fechar()
+
+
+if __name__ == "__main__":
+    main()
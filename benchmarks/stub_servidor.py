@@ -0,0 +1,81 @@
+"""
+Servidor HTTP/1.1 mínimo (asyncio puro) usado como stub do assistente de IA
+nos benchmarks. Suporta keep-alive e um atraso configurável por resposta.
+"""
+import asyncio
+import json
+from typing import Optional, Tuple
+
+
+RESPOSTA_PADRAO = {
+    "execucao": {"resposta": "Resposta do stub", "tokens_utilizados": 42},
+    "processamento": {"tempo_processamento": 0.01},
+    "solicitacao_salva": {"id": "stub-1"}
+}
+
+
+class StubServidor:
+    """Stub HTTP que responde JSON a qualquer rota"""
+
+    def __init__(self, atraso: float = 0.0, corpo: Optional[dict] = None):
+        self.atraso = atraso
+        self.corpo = json.dumps(corpo or RESPOSTA_PADRAO).encode()
+        self.conexoes = 0
+        self.requisicoes = 0
+        self._servidor: Optional[asyncio.AbstractServer] = None
+
+    async def iniciar(self, host: str = "127.0.0.1", porta: int = 0) -> Tuple[str, int]:
+        self._servidor = await asyncio.start_server(self._atender, host, porta)
+        return self._servidor.sockets[0].getsockname()[:2]
+
+    async def parar(self) -> None:
+        if self._servidor is not None:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+
+    async def _ler_requisicao(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, dict]]:
+        linha = await reader.readline()
+        if not linha:
+            return None
+        metodo, caminho, _ = linha.decode().split(" ", 2)
+        cabecalhos = {}
+        while True:
+            linha = await reader.readline()
+            if linha in (b"\r\n", b"\n", b""):
+                break
+            nome, valor = linha.decode().split(":", 1)
+            cabecalhos[nome.strip().lower()] = valor.strip()
+        tamanho = int(cabecalhos.get("content-length", 0))
+        if tamanho:
+            await reader.readexactly(tamanho)
+        return metodo, caminho, cabecalhos
+
+    async def responder(self, writer: asyncio.StreamWriter, metodo: str, caminho: str) -> None:
+        """Envia a resposta; subclasses podem sobrescrever (ex.: streaming)"""
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: application/json\r\n"
+            + f"Content-Length: {len(self.corpo)}\r\n".encode()
+            + b"Connection: keep-alive\r\n\r\n"
+            + self.corpo
+        )
+        await writer.drain()
+
+    async def _atender(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self.conexoes += 1
+        try:
+            while True:
+                requisicao = await self._ler_requisicao(reader)
+                if requisicao is None:
+                    break
+                metodo, caminho, cabecalhos = requisicao
+                self.requisicoes += 1
+                if self.atraso:
+                    await asyncio.sleep(self.atraso)
+                await self.responder(writer, metodo, caminho)
+                if cabecalhos.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
@@ -10,6 +10,23 @@ from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 from app.api.rotas import router
 from app.api.users import router as users_router
+from app.api.cache_templates import dashboard_template
+from app.application.cliente_http import iniciar_cliente_assistente, fechar_cliente_assistente
+from app.application.saude_assistente import monitor_saude_assistente
+from app.application.integracoes_externas import cliente_externo
+from app.application.analise_pergunta import configurar_cache_enriquecimento
+from app.application.cache_respostas import cache_respostas
+from app.application.solicitacoes import (
+    antepara_assistente,
+    antepara_feedback,
+    fechar_armazenamento,
+    fila_feedback,
+    iniciar_armazenamento,
+    retencao_solicitacoes
+)
+from app.application.disjuntor import disjuntor_assistente
+from app.application.usuarios import fechar_repositorio_usuarios, iniciar_repositorio_usuarios
+from app.application.tarefas_assistente import executor_tarefas_assistente
 
 # Load environment variables
 load_dotenv()
@@ -20,9 +37,37 @@ async def lifespan(app: FastAPI):
     print("Starting Mock ERP Application with FastAPI...")
     print(f"Environment: {os.getenv('FASTAPI_ENV', 'production')}")
     print(f"Debug mode: {os.getenv('FASTAPI_DEBUG', 'False')}")
+    iniciar_armazenamento()
+    iniciar_repositorio_usuarios()
+    await iniciar_cliente_assistente()
+    await cliente_externo.iniciar()
+    monitor_saude_assistente.iniciar()
+    configurar_cache_enriquecimento()
+    cache_respostas.configurar()
+    antepara_assistente.configurar()
+    antepara_feedback.configurar()
+    disjuntor_assistente.configurar()
+    executor_tarefas_assistente.iniciar()
+    fila_feedback.iniciar()
+    retencao_solicitacoes.iniciar()
+    # Dashboard template kept in memory (reloaded on change in debug mode)
+    dashboard_template.recarregar = os.getenv('FASTAPI_DEBUG', 'False').lower() == 'true'
+    try:
+        dashboard_template.carregar()
+    except FileNotFoundError:
+        print(f"Dashboard template not found: {dashboard_template.caminho}")
     yield
     # Shutdown
     print("Shutting down Mock ERP Application...")
+    await executor_tarefas_assistente.parar()
+    await fila_feedback.parar()
+    await retencao_solicitacoes.parar()
+    await fechar_armazenamento()
+    fechar_repositorio_usuarios()
+    await monitor_saude_assistente.parar()
+    await disjuntor_assistente.parar()
+    await fechar_cliente_assistente()
+    await cliente_externo.fechar()
 
 # Create FastAPI app
 app = FastAPI(
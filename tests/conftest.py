@@ -0,0 +1,103 @@
+"""
+Fixtures dos testes: stub local do assistente de IA (porta 8001) e estado limpo
+"""
+import asyncio
+import json
+from typing import List, Optional
+
+import pytest
+import pytest_asyncio
+
+from app.application import solicitacoes
+from app.application.armazenamento import ArmazenamentoSolicitacoes
+from app.application.cache_respostas import cache_respostas
+from app.application.cliente_http import fechar_cliente_assistente, iniciar_cliente_assistente
+from benchmarks.stub_servidor import StubServidor
+
+
+class StubAssistente(StubServidor):
+    """
+    Stub do assistente que responde em streaming (SSE), JSON completo ou erro
+
+    - modo "sse": envia o primeiro token e só manda os demais (e o evento
+      final) depois de `liberar` ser acionado, para o teste observar o
+      primeiro token enquanto o stream ainda está aberto;
+    - modo "json": resposta completa de uma vez, como um serviço sem streaming;
+    - modo "status": responde `status` com um texto de erro.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.modo = "sse"
+        self.status = 503
+        self.tokens: List[str] = ["Olá", ", ", "mundo"]
+        self.liberar = asyncio.Event()
+        self.enviados = 0
+
+    async def responder(self, writer: asyncio.StreamWriter, metodo: str, caminho: str) -> None:
+        if self.modo == "json":
+            self.corpo = json.dumps({
+                "execucao": {"resposta": "".join(self.tokens), "tokens_utilizados": 7},
+                "processamento": {"tempo_processamento": 0.01},
+                "solicitacao_salva": {"id": "stub-json"}
+            }).encode()
+            await super().responder(writer, metodo, caminho)
+            return
+        if self.modo == "status":
+            corpo = b"falha simulada"
+            writer.write(
+                f"HTTP/1.1 {self.status} Erro\r\nContent-Type: text/plain\r\n"
+                f"Content-Length: {len(corpo)}\r\n\r\n".encode() + corpo
+            )
+            await writer.drain()
+            return
+
+        writer.write(
+            b"HTTP/1.1 200 OK\r\n"
+            b"Content-Type: text/event-stream\r\n"
+            b"Transfer-Encoding: chunked\r\n\r\n"
+        )
+        eventos = [json.dumps({"delta": token}) for token in self.tokens]
+        eventos.append(json.dumps({"solicitacao_salva": {"id": "stub-sse"}}))
+        eventos.append("[DONE]")
+        for indice, evento in enumerate(eventos):
+            if indice == 1:
+                await self.liberar.wait()
+            pedaco = f"data: {evento}\n\n".encode()
+            writer.write(f"{len(pedaco):x}\r\n".encode() + pedaco + b"\r\n")
+            await writer.drain()
+            self.enviados += 1
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+@pytest.fixture
+def repositorio_limpo():
+    """Solicitações em um repositório em memória novo e cache de respostas vazio"""
+    anterior = solicitacoes.solicitacoes_db
+    solicitacoes.solicitacoes_db = ArmazenamentoSolicitacoes()
+    cache_respostas.limpar()
+    yield solicitacoes.solicitacoes_db
+    cache_respostas.limpar()
+    solicitacoes.solicitacoes_db = anterior
+
+
+@pytest_asyncio.fixture
+async def stub_assistente(repositorio_limpo):
+    stub = StubAssistente()
+    try:
+        await stub.iniciar(porta=8001)
+    except OSError as e:
+        pytest.skip(f"porta 8001 indisponível para o stub do assistente: {e}")
+    await iniciar_cliente_assistente()
+    try:
+        yield stub
+    finally:
+        # Solta respostas ainda presas no stub antes de fechar
+        stub.liberar.set()
+        await fechar_cliente_assistente()
+        await stub.parar()
+
+
+def registro(local_id: str) -> Optional[dict]:
+    return solicitacoes.GerenciadorSolicitacoes.buscar_solicitacao(local_id)
@@ -0,0 +1,58 @@
+"""
+ClienteHttpCompartilhado: um cliente aberto pertence ao event loop que o criou
+"""
+import asyncio
+import threading
+
+import pytest
+
+from app.application.cliente_http import ClienteHttpCompartilhado
+
+
+def test_obter_em_outro_loop_vivo_levanta_erro():
+    compartilhado = ClienteHttpCompartilhado("TESTE")
+    loop_dono = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop_dono.run_forever, daemon=True)
+    thread.start()
+    try:
+        cliente = asyncio.run_coroutine_threadsafe(compartilhado.iniciar(), loop_dono).result(timeout=5)
+
+        async def obter_aqui():
+            return compartilhado.obter()
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(obter_aqui())
+        assert not cliente.is_closed
+
+        asyncio.run_coroutine_threadsafe(compartilhado.fechar(), loop_dono).result(timeout=5)
+        assert cliente.is_closed
+    finally:
+        loop_dono.call_soon_threadsafe(loop_dono.stop)
+        thread.join(timeout=5)
+        loop_dono.close()
+
+
+def test_cliente_fechado_no_loop_dono_e_recriado_no_seguinte():
+    compartilhado = ClienteHttpCompartilhado("TESTE")
+
+    async def usar_e_fechar():
+        cliente = compartilhado.obter()
+        assert compartilhado.obter() is cliente
+        await compartilhado.fechar()
+        return cliente
+
+    primeiro = asyncio.run(usar_e_fechar())
+    segundo = asyncio.run(usar_e_fechar())
+    assert primeiro is not segundo
+    assert primeiro.is_closed and segundo.is_closed
+
+
+def test_cliente_de_loop_encerrado_e_descartado():
+    compartilhado = ClienteHttpCompartilhado("TESTE")
+
+    async def obter():
+        return compartilhado.obter()
+
+    abandonado = asyncio.run(obter())
+    novo = asyncio.run(obter())
+    assert novo is not abandonado
@@ -0,0 +1,184 @@
+"""
+Primitivas de concorrência: single-flight, limite por chave e antepara (bulkhead)
+"""
+import asyncio
+
+import pytest
+
+from app.application.concorrencia import Antepara, ColapsadorRequisicoes, FilaCheia, LimitadorPorChave
+
+
+async def _vagas_livres(antepara: Antepara) -> int:
+    """Quantas chamadas entram na antepara agora, sem esperar"""
+    entradas = []
+    while not antepara._semaforo.locked():
+        await antepara.__aenter__()
+        entradas.append(antepara)
+    for entrada in entradas:
+        await entrada.__aexit__(None, None, None)
+    return len(entradas)
+
+
+# ColapsadorRequisicoes
+
+@pytest.mark.asyncio
+async def test_chamadas_concorrentes_compartilham_o_resultado_e_liberam_a_chave():
+    colapsador = ColapsadorRequisicoes()
+    chamadas = 0
+    liberar = asyncio.Event()
+
+    async def fabrica():
+        nonlocal chamadas
+        chamadas += 1
+        await liberar.wait()
+        return {"resposta": 42}
+
+    pendentes = [asyncio.ensure_future(colapsador.executar("chave", fabrica)) for _ in range(5)]
+    await asyncio.sleep(0)
+    assert len(colapsador) == 1
+    liberar.set()
+
+    resultados = await asyncio.gather(*pendentes)
+    assert chamadas == 1
+    assert colapsador.compartilhadas == 4
+    assert all(resultado is resultados[0] for resultado in resultados)
+    assert len(colapsador) == 0
+
+
+@pytest.mark.asyncio
+async def test_excecao_do_lider_chega_a_todos_e_libera_a_chave():
+    colapsador = ColapsadorRequisicoes()
+    liberar = asyncio.Event()
+
+    async def fabrica():
+        await liberar.wait()
+        raise ValueError("serviço indisponível")
+
+    pendentes = [asyncio.ensure_future(colapsador.executar("chave", fabrica)) for _ in range(3)]
+    await asyncio.sleep(0)
+    liberar.set()
+
+    resultados = await asyncio.gather(*pendentes, return_exceptions=True)
+    assert all(isinstance(resultado, ValueError) for resultado in resultados)
+    assert len(colapsador) == 0
+
+    # Chave livre: a próxima chamada dispara uma nova execução
+    async def sucesso():
+        return "ok"
+
+    assert await colapsador.executar("chave", sucesso) == "ok"
+
+
+@pytest.mark.asyncio
+async def test_cancelar_um_chamador_nao_cancela_os_demais():
+    colapsador = ColapsadorRequisicoes()
+    liberar = asyncio.Event()
+
+    async def fabrica():
+        await liberar.wait()
+        return "ok"
+
+    lider = asyncio.ensure_future(colapsador.executar("chave", fabrica))
+    seguidor = asyncio.ensure_future(colapsador.executar("chave", fabrica))
+    await asyncio.sleep(0)
+    lider.cancel()
+    await asyncio.sleep(0)
+    liberar.set()
+
+    assert await seguidor == "ok"
+    assert lider.cancelled()
+    assert len(colapsador) == 0
+
+
+# LimitadorPorChave
+
+@pytest.mark.asyncio
+async def test_limite_por_chave_e_espera_cancelada_nao_consome_vaga():
+    limitador = LimitadorPorChave(1)
+    assert limitador("a.example") is limitador("a.example")
+    assert limitador("a.example") is not limitador("b.example")
+
+    async with limitador("a.example"):
+        assert not limitador("b.example").locked()
+        espera = asyncio.ensure_future(limitador("a.example").acquire())
+        await asyncio.sleep(0)
+        espera.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await espera
+
+    assert not limitador("a.example").locked()
+
+
+# Antepara
+
+@pytest.mark.asyncio
+async def test_fila_cheia_rejeita_sem_esperar():
+    antepara = Antepara("TESTE", max_concorrentes=1, max_fila=1, timeout_fila=None)
+    liberar = asyncio.Event()
+
+    async def chamada():
+        async with antepara:
+            await liberar.wait()
+
+    em_execucao = asyncio.ensure_future(chamada())
+    na_fila = asyncio.ensure_future(chamada())
+    await asyncio.sleep(0)
+    assert (antepara.em_execucao, antepara.em_espera) == (1, 1)
+
+    with pytest.raises(FilaCheia):
+        async with antepara:
+            pass
+    assert antepara.rejeitadas == 1
+
+    liberar.set()
+    await asyncio.gather(em_execucao, na_fila)
+    assert antepara.admitidas == 2
+    assert await _vagas_livres(antepara) == 1
+
+
+@pytest.mark.asyncio
+async def test_espera_esgotada_na_fila_nao_perde_vaga():
+    antepara = Antepara("TESTE", max_concorrentes=2, max_fila=10, timeout_fila=0.01)
+    await antepara.__aenter__()
+    await antepara.__aenter__()
+
+    for _ in range(3):
+        with pytest.raises(FilaCheia):
+            async with antepara:
+                pass
+    assert antepara.esperas_esgotadas == 3
+    assert antepara.em_espera == 0
+
+    await antepara.__aexit__(None, None, None)
+    await antepara.__aexit__(None, None, None)
+    assert await _vagas_livres(antepara) == 2
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("timeout_fila", [None, 5.0])
+async def test_espera_cancelada_na_fila_nao_perde_vaga(timeout_fila):
+    antepara = Antepara("TESTE", max_concorrentes=1, max_fila=10, timeout_fila=timeout_fila)
+    await antepara.__aenter__()
+
+    async def chamada():
+        async with antepara:
+            pass
+
+    # Cancelada enquanto espera
+    cancelada = asyncio.ensure_future(chamada())
+    await asyncio.sleep(0)
+    cancelada.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await cancelada
+
+    # Cancelada depois de acordada pela liberação, antes de retomar
+    acordada = asyncio.ensure_future(chamada())
+    await asyncio.sleep(0)
+    await antepara.__aexit__(None, None, None)
+    acordada.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await acordada
+
+    assert antepara.em_espera == 0
+    assert antepara.em_execucao == 0
+    assert await _vagas_livres(antepara) == 1
@@ -0,0 +1,53 @@
+"""
+RepositorioEscritaAdiada sobre SQLite: leituras não esperam a gravação em lote
+"""
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+
+from app.application.armazenamento_sqlite import ArmazenamentoSolicitacoesSQLite
+from app.application.escrita_adiada import RepositorioEscritaAdiada
+
+
+def _solicitacao(numero: int) -> dict:
+    return {
+        "id": f"s{numero}",
+        "user_id": 1,
+        "tipo": "assistente_virtual",
+        "status": "concluida",
+        "created_at": datetime.now()
+    }
+
+
+def test_leituras_nao_esperam_a_trava_da_gravacao(tmp_path):
+    repositorio = RepositorioEscritaAdiada(ArmazenamentoSolicitacoesSQLite(str(tmp_path / "s.db")), max_recentes=1)
+    for numero in range(3):
+        repositorio.inserir(_solicitacao(numero))
+    repositorio.descarregar()
+
+    def ler():
+        return (
+            repositorio.buscar("s0")["id"],
+            [solicitacao["id"] for solicitacao in repositorio.listar(limit=10)],
+            list(repositorio.ids_por("status", "concluida")),
+            len(list(repositorio))
+        )
+
+    # Trava segura como pelo descarregador durante gravar_lote
+    with repositorio._trava, ThreadPoolExecutor(max_workers=1) as executor:
+        resultado = executor.submit(ler).result(timeout=5)
+
+    assert resultado == ("s0", ["s2", "s1", "s0"], ["s0", "s1", "s2"], 3)
+    repositorio.fechar()
+
+
+def test_leitor_ve_o_lote_gravado(tmp_path):
+    base = ArmazenamentoSolicitacoesSQLite(str(tmp_path / "s.db"))
+    leitor = base.abrir_leitor()
+    assert leitor.buscar("s1") is None
+
+    base.gravar_lote([_solicitacao(1)])
+
+    assert leitor.buscar("s1")["status"] == "concluida"
+    assert ArmazenamentoSolicitacoesSQLite(":memory:").abrir_leitor() is None
+    leitor.fechar()
+    base.fechar()
@@ -0,0 +1,34 @@
+"""
+Stream SSE de status de uma solicitação (GET /api/assistant/status/{id}/eventos)
+"""
+import pytest
+
+from app.api.rotas import stream_assistant_status
+from app.application.solicitacoes import criar_solicitacao_assistente_virtual
+
+
+async def _corpo(resposta) -> str:
+    return "".join([pedaco async for pedaco in resposta.body_iterator])
+
+
+@pytest.mark.asyncio
+async def test_status_atual_e_fim_no_status_final(repositorio_limpo):
+    solicitacao = criar_solicitacao_assistente_virtual({"id": 1}, "pergunta", {"modulo": {}})
+    repositorio_limpo.atualizar(solicitacao["id"], status="concluida")
+
+    corpo = await _corpo(await stream_assistant_status(solicitacao["id"], request=None))
+
+    assert corpo.startswith("event: status\n")
+    assert '"status": "concluida"' in corpo
+
+
+@pytest.mark.asyncio
+async def test_solicitacao_removida_antes_do_stream_termina_com_evento_removida(repositorio_limpo):
+    solicitacao = criar_solicitacao_assistente_virtual({"id": 1}, "pergunta", {"modulo": {}})
+    resposta = await stream_assistant_status(solicitacao["id"], request=None)
+
+    # Retenção ou DELETE entre a verificação 404 e o início do gerador
+    repositorio_limpo.remover(solicitacao["id"])
+
+    corpo = await _corpo(resposta)
+    assert corpo == f'event: removida\ndata: {{"id": "{solicitacao["id"]}"}}\n\n'
@@ -0,0 +1,69 @@
+"""
+Fila local de feedback: gravação em grupo fora do loop de eventos e recuperação
+"""
+import asyncio
+import os
+
+import pytest
+
+from app.application import fila_feedback as modulo_fila
+from app.application.fila_feedback import FilaFeedbackDuravel
+
+
+async def _entregar(solicitacao_id, payload, feedback_id):
+    return 200
+
+
+def _fila(tmp_path) -> FilaFeedbackDuravel:
+    return FilaFeedbackDuravel("TESTE", _entregar, arquivo=str(tmp_path / "fila.jsonl"))
+
+
+@pytest.mark.asyncio
+async def test_feedbacks_concorrentes_compartilham_fsync(tmp_path, monkeypatch):
+    chamadas = []
+    fsync_original = os.fsync
+    monkeypatch.setattr(modulo_fila.os, "fsync", lambda fd: (chamadas.append(fd), fsync_original(fd)))
+    fila = _fila(tmp_path)
+    fila._recuperar()
+    chamadas.clear()
+
+    registros = await asyncio.gather(*(
+        fila.enfileirar(f"s{i}", {"avaliacao_usuario": 5}) for i in range(20)
+    ))
+
+    assert len({r["feedback_id"] for r in registros}) == 20
+    assert not any(r["duplicado"] for r in registros)
+    # O primeiro feedback abre um grupo; os 19 que chegam durante o fsync vão juntos no seguinte
+    assert 1 <= len(chamadas) <= 2
+    with open(fila.arquivo, encoding="utf-8") as entrada:
+        assert len(entrada.readlines()) == 20
+    await fila.parar()
+
+
+@pytest.mark.asyncio
+async def test_feedback_confirmado_sobrevive_a_reinicio(tmp_path):
+    fila = _fila(tmp_path)
+    registro = await fila.enfileirar("s1", {"avaliacao_usuario": 4, "feedback_texto": "ok"})
+    await fila.parar()
+
+    nova = _fila(tmp_path)
+    nova._recuperar()
+    assert len(nova) == 1
+    assert nova._pendentes["s1"]["id"] == registro["feedback_id"]
+    assert (await nova.enfileirar("s1", {"avaliacao_usuario": 4, "feedback_texto": "ok"}))["duplicado"]
+    await nova.parar()
+
+
+@pytest.mark.asyncio
+async def test_falha_na_gravacao_chega_ao_chamador_sem_deixar_pendente(tmp_path, monkeypatch):
+    fila = _fila(tmp_path)
+    fila._recuperar()
+
+    def falhar(fd):
+        raise OSError("disco cheio")
+
+    monkeypatch.setattr(modulo_fila.os, "fsync", falhar)
+    with pytest.raises(OSError):
+        await fila.enfileirar("s1", {"avaliacao_usuario": 1})
+    assert len(fila) == 0
+    await fila.parar()
@@ -0,0 +1,93 @@
+"""
+transmitir_para_assistente_ia contra o stub local do assistente em streaming
+"""
+import pytest
+
+from app.application.transmissao_assistente import transmitir_para_assistente_ia
+from tests.conftest import registro
+
+
+USUARIO = {"id": 1, "name": "Usuário Teste"}
+MODULO = {"type": "Clientes", "data": {"nome": "ACME Ltda"}}
+
+
+async def _coletar(gerador):
+    return [evento async for evento in gerador]
+
+
+@pytest.mark.asyncio
+async def test_tokens_chegam_antes_do_fim_do_stream(stub_assistente):
+    gerador = transmitir_para_assistente_ia(USUARIO, MODULO, "onde fica o campo CNPJ?")
+    evento, inicio = await gerador.__anext__()
+    assert evento == "inicio"
+
+    evento, dados = await gerador.__anext__()
+    # O stub segura o resto da resposta até `liberar`: o primeiro token chegou sozinho
+    assert (evento, dados) == ("token", {"texto": "Olá"})
+    assert stub_assistente.enviados == 1
+    assert registro(inicio["local_id"])["status"] == "processando"
+
+    stub_assistente.liberar.set()
+    restantes = await _coletar(gerador)
+    assert [dados["texto"] for evento, dados in restantes if evento == "token"] == [", ", "mundo"]
+    assert restantes[-1][0] == "fim"
+
+
+@pytest.mark.asyncio
+async def test_registro_local_termina_com_texto_e_tokens(stub_assistente):
+    stub_assistente.liberar.set()
+    eventos = await _coletar(transmitir_para_assistente_ia(USUARIO, MODULO, "como cadastrar um cliente?"))
+
+    local_id = eventos[0][1]["local_id"]
+    evento, resultado = eventos[-1]
+    assert evento == "fim"
+    assert resultado["success"] is True
+    assert resultado["response"] == "Olá, mundo"
+    # Sem contagem do serviço, cada trecho conta como um token
+    assert resultado["tokens_used"] == 3
+    assert resultado["local_id"] == "stub-sse"
+
+    salvo = registro(local_id)
+    assert salvo["status"] == "concluida"
+    assert salvo["resposta"] == "Olá, mundo"
+    assert salvo["tokens_utilizados"] == 3
+
+
+@pytest.mark.asyncio
+async def test_consumidor_desiste_no_meio_deixa_registro_em_erro(stub_assistente):
+    gerador = transmitir_para_assistente_ia(USUARIO, MODULO, "como emitir uma nota fiscal?")
+    _, inicio = await gerador.__anext__()
+    evento, _ = await gerador.__anext__()
+    assert evento == "token"
+
+    # Navegador fechou a conexão: o StreamingResponse fecha o gerador
+    await gerador.aclose()
+
+    assert registro(inicio["local_id"])["status"] == "erro"
+
+
+@pytest.mark.asyncio
+async def test_status_diferente_de_200_usa_resposta_simulada(stub_assistente):
+    stub_assistente.modo = "status"
+    stub_assistente.status = 422
+    eventos = await _coletar(transmitir_para_assistente_ia(USUARIO, MODULO, "onde fica o campo CNPJ?"))
+
+    assert [evento for evento, _ in eventos] == ["inicio", "erro"]
+    resultado = eventos[-1][1]
+    assert resultado["success"] is False
+    assert "422" in resultado["error"]
+    assert resultado["fallback_response"]
+    assert registro(eventos[0][1]["local_id"])["status"] == "erro"
+
+
+@pytest.mark.asyncio
+async def test_resposta_json_completa_vira_um_unico_trecho(stub_assistente):
+    stub_assistente.modo = "json"
+    eventos = await _coletar(transmitir_para_assistente_ia(USUARIO, MODULO, "como cadastrar um cliente?"))
+
+    assert [evento for evento, _ in eventos] == ["inicio", "token", "fim"]
+    assert eventos[1][1] == {"texto": "Olá, mundo"}
+    resultado = eventos[-1][1]
+    assert resultado["response"] == "Olá, mundo"
+    assert resultado["tokens_used"] == 7
+    assert registro(eventos[0][1]["local_id"])["tokens_utilizados"] == 7